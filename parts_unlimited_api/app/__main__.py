@@ -0,0 +1,61 @@
+"""
+Serve the API with uvicorn, in one or several worker processes.
+
+The settings class is selected by the APP_ENV environment variable, and the
+command line options default to its `server_*` settings.
+
+Usage:
+    python -m app
+    APP_ENV=prod python -m app --workers 4 --port 8000
+"""
+
+import argparse
+import os
+from typing import List, Optional
+
+import uvicorn
+from app.core.config import get_app_settings
+from loguru import logger
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    settings = get_app_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument("--workers", type=int, default=settings.server_workers)
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=settings.server_graceful_timeout,
+        help="Seconds given to the requests in flight to finish on shutdown.",
+    )
+    args = parser.parse_args(argv)
+    settings.configure_logging()
+
+    # Each worker has its own caches, which never see the writes served by the other
+    # workers, so they are only kept when their TTL is set to bound that staleness.
+    # Workers inherit the environment.
+    for cache in ("part_cache", "word_count_cache"):
+        ttl = f"{cache}_ttl"
+        ttl_set = ttl in settings.model_fields_set and getattr(settings, ttl) is not None
+        if args.workers > 1 and getattr(settings, f"{cache}_enabled") and not ttl_set:
+            logger.warning(
+                f"{cache} disabled: it is per worker, set {ttl.upper()} to bound staleness."
+            )
+            os.environ[f"{cache}_enabled".upper()] = "false"
+
+    # With a factory, the app and its database engines are built in every worker
+    # process after it started, nothing is shared with the parent process.
+    uvicorn.run(
+        "app.main:create_application",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
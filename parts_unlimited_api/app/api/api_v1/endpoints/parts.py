@@ -1,48 +1,221 @@
-from typing import List
+from datetime import timedelta
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from app.api import deps, utils
-from app.schemas.parts import Part, PartBase
+import anyio
+from app.api import conditional, deps, utils
+from app.core.cache import CacheBackend
+from app.core.settings.app import AppSettings
+from app.db.write_queue import WriteQueue, WriteQueueFullError
+from app.models.base_class import utcnow
+from app.models.parts import Part as ModelPart
+from app.schemas.parts import (
+    Part,
+    PartBase,
+    PartBulkResult,
+    PartBulkUpdate,
+    PartChanges,
+    PartFilter,
+    PartId,
+    PartPatch,
+    PartSort,
+    PartStats,
+)
 from app.schemas.utils import WordCount
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
 router = APIRouter()
 
+BulkRow = TypeVar("BulkRow", bound=BaseModel)
+T = TypeVar("T")
 
-@router.get(
-    "/{part_id}",
-    summary="Read a part by ID",
-    response_description="Retrieve detailed information about a part by its ID",
-    response_model=Part,
-)
-def read_part(part_id: int, db_session: Session = Depends(deps.get_db)) -> Part:
+word_count_list = TypeAdapter(List[WordCount])
+
+
+def get_part_filter(
+    is_active: Optional[bool] = None,
+    min_weight: Optional[int] = Query(None, ge=0),
+    max_weight: Optional[int] = Query(None, ge=0),
+    name_prefix: Optional[str] = Query(None, min_length=1),
+    sku_prefix: Optional[str] = Query(None, min_length=1),
+    sort: PartSort = "id",
+    settings: AppSettings = Depends(deps.get_settings),
+) -> PartFilter:
     """
-    Retrieve a specific part by its ID.
+    Collect the filters and sort order of a parts list request.
 
-    Args:
-        part_id (int): The ID of the part to retrieve.
-        db_session (Session, optional): SQLAlchemy database session.
-        Defaults to Depends(deps.get_db).
+    In soft-delete mode the list leaves inactive parts out unless `is_active` is given.
+    """
+    if is_active is None and settings.soft_delete:
+        is_active = True
+    return PartFilter(
+        is_active=is_active,
+        min_weight=min_weight,
+        max_weight=max_weight,
+        name_prefix=name_prefix,
+        sku_prefix=sku_prefix,
+        sort=sort,
+    )
 
-    Returns:
-        Part: Details of the retrieved part.
+
+def get_after(skip: int, cursor: Optional[str], sort: str = "id") -> Tuple[Optional[int], Any]:
+    """
+    Get the ID and sort key of the part a list page starts after, from the request cursor.
+
+    Raises:
+        HTTPException: If the cursor is invalid, built for another sort order or
+        combined with skip (400 Bad Request).
+    """
+    if cursor is None:
+        return None, None
+    if skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both.")
+    try:
+        return utils.decode_cursor(cursor, sort)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+
+async def submit_write(write_queue: WriteQueue, write: Callable[..., T], **kwargs: Any) -> T:
+    """
+    Queue a write for the writer task of the write-behind mode, and wait for the
+    commit of its batch.
+
+    Raises:
+        HTTPException: If the write queue is full (429 Too Many Requests).
+    """
+    try:
+        return await write_queue.submit(write, **kwargs)
+    except WriteQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+
+def run_write(
+    db_session: Session,
+    write_queue: Optional[WriteQueue],
+    write: Callable[..., T],
+    **kwargs: Any,
+) -> T:
+    """
+    Run `write(db, **kwargs)`, a write helper of `app.api.utils`, on the request
+    session, or in write-behind mode, through `submit_write` from the threadpool.
+    """
+    if write_queue is None:
+        return write(db_session, **kwargs)
+    return anyio.from_thread.run(partial(submit_write, write_queue, write, **kwargs))
+
+
+def part_response(db_part: Any, fast: bool) -> Union[Part, Response]:
+    """
+    Serialize a written part, straight from the row with the `fast_serialization`
+    setting, skipping the validation against the response model.
+    """
+    if fast:
+        return Response(content=utils.dump_part_json(db_part), media_type="application/json")
+    return Part.model_validate(db_part)
+
+
+def part_update_response(
+    db_part: Any, response: Response, fast: bool = False
+) -> Union[Part, Response]:
+    """
+    Serialize an updated part, with the validators a following `If-Match` needs.
 
     Raises:
         HTTPException: If the part with the specified ID does not exist (404 Not Found).
     """
-    db_part = utils.get_part(db=db_session, part_id=part_id)
-    if not db_part:
-        raise HTTPException(status_code=404, detail=f"Part with ID={part_id} not found.")
+    if db_part is None:
+        raise HTTPException(status_code=404, detail="Part not found")
+    headers = conditional.validator_headers(
+        conditional.version_etag(db_part.version, db_part.updated_at), db_part.updated_at
+    )
+    if fast:
+        return Response(
+            content=utils.dump_part_json(db_part), media_type="application/json", headers=headers
+        )
+    response.headers.update(headers)
     return Part.model_validate(db_part)
 
 
+def apply_part_update(
+    db_session: Session,
+    write_queue: Optional[WriteQueue],
+    part_id: int,
+    values: Dict[str, Any],
+    request: Request,
+    response: Response,
+    part_cache: Optional[CacheBackend],
+    settings: AppSettings,
+) -> Union[Part, Response]:
+    """
+    Update a part under the request `If-Match` precondition.
+
+    Raises:
+        HTTPException: If the part with the specified ID does not exist (404 Not Found),
+        an updated value is invalid (400 Bad Request), the new SKU is taken by another
+        part (409 Conflict), the part was modified since the `If-Match` version
+        (412 Precondition Failed) or the write queue of the write-behind mode is
+        full (429 Too Many Requests).
+    """
+    try:
+        db_part = run_write(
+            db_session,
+            write_queue,
+            utils.update_part,
+            part_id=part_id,
+            values=values,
+            cache=part_cache,
+            versions=conditional.if_match_versions(request),
+            active_only=settings.soft_delete,
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except utils.VersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
+    except utils.DuplicateSkuError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return part_update_response(db_part, response, settings.fast_serialization)
+
+
 @router.post(
     "/create/",
     summary="Create a new part",
     response_description="Create a new part object",
     response_model=Part,
 )
-def create_part(part: PartBase, db_session: Session = Depends(deps.get_db)) -> Part:
+def create_part(
+    part: PartBase,
+    db_session: Session = Depends(deps.get_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[Part, Response]:
     """
     Create a new part.
 
@@ -56,13 +229,17 @@ def create_part(part: PartBase, db_session: Session = Depends(deps.get_db)) -> P
 
     Raises:
         HTTPException: If there is an issue creating the part,
-        such as validation errors (400 Bad Request).
+        such as validation errors (400 Bad Request), the SKU is taken by another
+        part, a soft-deleted one included (409 Conflict), or the write queue of the
+        write-behind mode is full (429 Too Many Requests).
     """
     try:
-        db_part = utils.create_part(db=db_session, part=part)
-        return Part.model_validate(db_part)
+        db_part = run_write(db_session, write_queue, utils.create_part, part=part)
+        return part_response(db_part, settings.fast_serialization)
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
+    except utils.DuplicateSkuError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
 @router.put(
@@ -71,10 +248,22 @@ def create_part(part: PartBase, db_session: Session = Depends(deps.get_db)) -> P
     response_description="Update an existing part object",
     response_model=Part,
 )
-def update_part(part_id: int, part: PartBase, db_session: Session = Depends(deps.get_db)) -> Part:
+def update_part(
+    part_id: int,
+    part: PartBase,
+    request: Request,
+    response: Response,
+    db_session: Session = Depends(deps.get_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[Part, Response]:
     """
     Update an existing part by its ID.
 
+    With an `If-Match` header holding the part `ETag`, the update only applies if
+    the part was not modified since. The response carries the new `ETag`.
+
     Args:
         part_id (int): The ID of the part to update.
         part (PartUpdate): Updated data for the part.
@@ -85,12 +274,63 @@ def update_part(part_id: int, part: PartBase, db_session: Session = Depends(deps
         Part: Updated details of the part.
 
     Raises:
-        HTTPException: If the part with the specified ID does not exist (404 Not Found).
+        HTTPException: If the part with the specified ID does not exist (404 Not Found),
+        an updated value is invalid (400 Bad Request), the new SKU is taken by another
+        part (409 Conflict), the part was modified since the `If-Match` version
+        (412 Precondition Failed) or the write queue of the write-behind mode is
+        full (429 Too Many Requests).
     """
-    db_part = utils.update_part(db=db_session, part_id=part_id, part=part)
-    if db_part is None:
-        raise HTTPException(status_code=404, detail="Part not found")
-    return Part.model_validate(db_part)
+    values = {field: value for field, value in part.model_dump().items() if value is not None}
+    return apply_part_update(
+        db_session, write_queue, part_id, values, request, response, part_cache, settings
+    )
+
+
+@router.patch(
+    "/update/{part_id}",
+    summary="Partially update an existing part",
+    response_description="Update the given fields of an existing part object",
+    response_model=Part,
+)
+def patch_part(
+    part_id: int,
+    part: PartPatch,
+    request: Request,
+    response: Response,
+    db_session: Session = Depends(deps.get_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[Part, Response]:
+    """
+    Update only the fields sent in the request body.
+
+    Changing fields other than the name, description or SKU is a single UPDATE
+    statement, without reading the part first. `If-Match` is handled as in
+    `update_part`.
+
+    Args:
+        part_id (int): The ID of the part to update.
+        part (PartPatch): Fields to change, the description can be set to null.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        Part: Updated details of the part.
+
+    Raises:
+        HTTPException: If the part with the specified ID does not exist (404 Not Found),
+        an updated value is invalid (400 Bad Request), the new SKU is taken by another
+        part (409 Conflict), the part was modified since the `If-Match` version
+        (412 Precondition Failed) or the write queue of the write-behind mode is
+        full (429 Too Many Requests).
+    """
+    values = part.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No fields to update.")
+    return apply_part_update(
+        db_session, write_queue, part_id, values, request, response, part_cache, settings
+    )
 
 
 @router.delete(
@@ -98,22 +338,42 @@ def update_part(part_id: int, part: PartBase, db_session: Session = Depends(deps
     summary="Delete a part",
     description="Delete a part by its ID",
 )
-def delete_part(part_id: int, db_session: Session = Depends(deps.get_db)) -> None:
+def delete_part(
+    part_id: int,
+    db_session: Session = Depends(deps.get_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> None:
     """
     Delete a part by its ID.
 
+    With the `soft_delete` setting, the part is only marked inactive, and removed
+    later by the purge of deleted parts.
+
     Args:
         part_id (int): The ID of the part to delete.
         db_session (Session, optional): SQLAlchemy database session.
         Defaults to Depends(deps.get_db).
 
     Raises:
-        HTTPException: If there is an issue deleting the part (500 Internal Server Error).
+        HTTPException: If the part with the specified ID does not exist (404 Not Found),
+        the write queue of the write-behind mode is full (429 Too Many Requests) or
+        there is an issue deleting the part (500 Internal Server Error).
     """
     try:
-        utils.delete_part(db=db_session, part_id=part_id)
+        run_write(
+            db_session,
+            write_queue,
+            utils.delete_part,
+            part_id=part_id,
+            cache=part_cache,
+            soft=settings.soft_delete,
+        )
     except ValueError:
         raise HTTPException(status_code=404, detail="Part not found")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -121,44 +381,585 @@ def delete_part(part_id: int, db_session: Session = Depends(deps.get_db)) -> Non
         )
 
 
+def _parse_bulk_rows(
+    rows: List[Any], model: Type[BulkRow]
+) -> Tuple[List[Tuple[int, BulkRow]], List[PartBulkResult]]:
+    """
+    Validate each bulk row on its own, turning failures into error results.
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        if isinstance(row, Exception):
+            errors.append(PartBulkResult(index=index, status="error", detail=str(row)))
+            continue
+        try:
+            valid.append((index, model.model_validate(row)))
+        except ValidationError as ve:
+            detail = "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc']) or 'row'}: {error['msg']}"
+                for error in ve.errors()
+            )
+            errors.append(PartBulkResult(index=index, status="error", detail=detail))
+    return valid, errors
+
+
+@router.post(
+    "/bulk/",
+    summary="Create parts in bulk",
+    response_description="One result per submitted part, in request order",
+    response_model=List[PartBulkResult],
+)
+def bulk_create_parts(
+    rows: List[Any] = Depends(deps.get_bulk_rows),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> List[PartBulkResult]:
+    """
+    Create many parts from a JSON array or an NDJSON body.
+
+    Rows are written in chunks of `bulk_chunk_size`, one transaction per chunk. A row
+    that fails validation or conflicts on SKU gets an error result and does not
+    abort the rest of the batch.
+
+    Args:
+        rows (List[Any]): Parts to create, parsed from the request body.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        List[PartBulkResult]: One result per row with the new part ID or the error.
+    """
+    parts, results = _parse_bulk_rows(rows, PartBase)
+    results += utils.bulk_create_parts(
+        db=db_session, parts=parts, chunk_size=settings.bulk_chunk_size
+    )
+    return sorted(results, key=lambda result: result.index)
+
+
+@router.put(
+    "/bulk/",
+    summary="Update parts in bulk",
+    response_description="One result per submitted part, in request order",
+    response_model=List[PartBulkResult],
+)
+def bulk_update_parts(
+    rows: List[Any] = Depends(deps.get_bulk_rows),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+) -> List[PartBulkResult]:
+    """
+    Update many parts from a JSON array or an NDJSON body.
+
+    Each row holds the part `id` and its new data. Failing rows get an error
+    result and do not abort the rest of the batch.
+
+    Args:
+        rows (List[Any]): Parts to update, parsed from the request body.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        List[PartBulkResult]: One result per row.
+    """
+    parts, results = _parse_bulk_rows(rows, PartBulkUpdate)
+    results += utils.bulk_update_parts(
+        db=db_session,
+        parts=parts,
+        chunk_size=settings.bulk_chunk_size,
+        cache=part_cache,
+        active_only=settings.soft_delete,
+    )
+    return sorted(results, key=lambda result: result.index)
+
+
+@router.delete(
+    "/bulk/",
+    summary="Delete parts in bulk",
+    response_description="One result per submitted ID, in request order",
+    response_model=List[PartBulkResult],
+)
+def bulk_delete_parts(
+    rows: List[Any] = Depends(deps.get_bulk_rows),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+) -> List[PartBulkResult]:
+    """
+    Delete many parts given a JSON array or an NDJSON body of IDs.
+
+    Args:
+        rows (List[Any]): IDs of the parts to delete, parsed from the request body.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        List[PartBulkResult]: One result per ID, unknown IDs are reported as errors.
+    """
+    part_ids, results = _parse_bulk_rows(rows, PartId)
+    results += utils.bulk_delete_parts(
+        db=db_session,
+        part_ids=[(index, part_id.root) for index, part_id in part_ids],
+        chunk_size=settings.bulk_chunk_size,
+        cache=part_cache,
+        soft=settings.soft_delete,
+    )
+    return sorted(results, key=lambda result: result.index)
+
+
+def part_rows_response(request: Request, rows: List[Any], limit: int, sort: str = "id") -> Response:
+    """
+    `read_parts` with the `fast_serialization` setting: the `get_part_rows` page is
+    serialized into the JSON body in one pass, without ORM objects or validation.
+    """
+    etag = conditional.rows_etag((row.id, row.version, row.updated_at) for row in rows)
+    if conditional.is_not_modified(request, etag):
+        return conditional.not_modified(etag)
+    headers = {"ETag": etag}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = utils.next_page_cursor(rows[-1], sort)
+    return Response(
+        content=utils.dump_parts_json(rows), media_type="application/json", headers=headers
+    )
+
+
 @router.get(
     "/list/",
     summary="List parts",
-    description="List all parts with optional pagination",
+    description="List parts with optional filters, sort order and offset or cursor pagination",
     response_model=List[Part],
 )
 def read_parts(
-    skip: int = 0, limit: int = 10, db_session: Session = Depends(deps.get_db)
-) -> List[Part]:
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = None,
+    filters: PartFilter = Depends(get_part_filter),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[List[ModelPart], Response]:
     """
-    List parts with optional pagination.
+    List parts with optional filters, sort order and pagination.
+
+    The filters on `is_active`, the weight range and the name and SKU prefixes
+    combine into a single query, served by the indexes of the parts table. Parts are
+    ordered by `sort`, then by ID, descending when `sort` starts with "-".
+
+    When a page is full, the `X-Next-Cursor` response header holds a cursor for the
+    next page. Passing it back as `cursor`, with the same sort order, seeks on the
+    sort index, so deep pages cost the same as the first one.
+
+    The `ETag` is derived from the IDs and versions of the listed parts. A matching
+    `If-None-Match` is answered with 304 Not Modified from those columns alone,
+    without loading the parts.
 
     Args:
         skip (int, optional): Number of records to skip, Defaults to 0.
         limit (int, optional): Maximum number of records to retrieve, Defaults to 10.
+        Capped by the `max_page_size` setting.
+        cursor (str, optional): Cursor returned in `X-Next-Cursor` by the previous page.
+        filters (PartFilter, optional): The `is_active`, `min_weight`, `max_weight`,
+        `name_prefix`, `sku_prefix` and `sort` query parameters.
         db_session (Session, optional): SQLAlchemy database session.
         Defaults to Depends(deps.get_db).
 
     Returns:
         List[Part]: List of parts within the specified range.
 
+    Raises:
+        HTTPException: If the cursor is invalid, built for another sort order or
+        combined with skip (400 Bad Request).
     """
-    db_parts = utils.get_parts(db=db_session, skip=skip, limit=limit)
+    after_id, after_key = get_after(skip=skip, cursor=cursor, sort=filters.sort)
+    limit = min(limit, settings.max_page_size)
+    if settings.fast_serialization:
+        rows = utils.get_part_rows(
+            db=db_session,
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            filters=filters,
+            after_key=after_key,
+        )
+        return part_rows_response(request, rows, limit, filters.sort)
+    if conditional.is_conditional(request):
+        versions = utils.get_part_versions(
+            db=db_session,
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            filters=filters,
+            after_key=after_key,
+        )
+        etag = conditional.rows_etag(versions)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified(etag)
+    db_parts = utils.get_parts(
+        db=db_session,
+        skip=skip,
+        limit=limit,
+        after_id=after_id,
+        filters=filters,
+        after_key=after_key,
+    )
+    response.headers["ETag"] = conditional.rows_etag(
+        (db_part.id, db_part.version, db_part.updated_at)  # type: ignore[misc]
+        for db_part in db_parts
+    )
+    if len(db_parts) == limit:
+        response.headers["X-Next-Cursor"] = utils.next_page_cursor(db_parts[-1], filters.sort)
     return db_parts
 
 
+@router.get(
+    "/export",
+    summary="Export all parts",
+    response_description="Every part as NDJSON lines or CSV rows",
+    response_class=StreamingResponse,
+)
+def export_parts(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> StreamingResponse:
+    """
+    Stream the whole parts catalog ordered by ID, without the deleted parts in
+    soft-delete mode.
+
+    Args:
+        export_format (str, optional): "ndjson" or "csv", Defaults to "ndjson".
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        StreamingResponse: The parts, serialized as they are read from the database.
+    """
+    media_type = "text/csv" if export_format == "csv" else deps.NDJSON_MEDIA_TYPE
+    return StreamingResponse(
+        utils.iter_parts_export(
+            db=db_session,
+            export_format=export_format,
+            batch_size=settings.export_batch_size,
+            active_only=settings.soft_delete,
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="parts.{export_format}"'},
+    )
+
+
+@router.get(
+    "/by-sku/{sku}",
+    summary="Read a part by SKU",
+    response_description="Retrieve detailed information about a part by its SKU",
+    response_model=Part,
+)
+def read_part_by_sku(
+    sku: str,
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+) -> Response:
+    """
+    Retrieve a specific part by its SKU, through the part cache.
+
+    Args:
+        sku (str): The SKU of the part to retrieve.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        Response: Details of the retrieved part.
+
+    Raises:
+        HTTPException: If no part has the specified SKU (404 Not Found).
+    """
+    payloads = utils.get_part_payloads_by_sku(
+        db=db_session, skus=[sku], cache=part_cache, active_only=settings.soft_delete
+    )
+    if sku not in payloads:
+        raise HTTPException(status_code=404, detail=f"Part with SKU={sku} not found.")
+    return Response(content=payloads[sku], media_type="application/json")
+
+
+@router.post(
+    "/by-sku",
+    summary="Read parts by SKU",
+    response_description="The parts matching the requested SKUs, in request order",
+    response_model=List[Part],
+)
+def read_parts_by_sku(
+    skus: List[str] = Body(..., min_length=1),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+) -> Response:
+    """
+    Resolve many SKUs at once with a single indexed query for the uncached ones.
+
+    Args:
+        skus (List[str]): SKUs to resolve, at most `max_sku_batch_size`.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        Response: The parts found, in request order. Unknown SKUs are left out.
+
+    Raises:
+        HTTPException: If too many SKUs are requested (400 Bad Request).
+    """
+    if len(skus) > settings.max_sku_batch_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_sku_batch_size} SKUs can be requested at once.",
+        )
+    payloads = utils.get_part_payloads_by_sku(
+        db=db_session, skus=skus, cache=part_cache, active_only=settings.soft_delete
+    )
+    found = [payloads[sku] for sku in dict.fromkeys(skus) if sku in payloads]
+    return Response(content=b"[" + b",".join(found) + b"]", media_type="application/json")
+
+
+@router.get(
+    "/search",
+    summary="Search parts",
+    description="Full-text search over part names and descriptions, best match first",
+    response_model=List[Part],
+)
+def search_parts(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> List[ModelPart]:
+    """
+    Search parts containing every word of `q` in their name or description.
+
+    Args:
+        q (str): Words to search for.
+        skip (int, optional): Number of records to skip, Defaults to 0.
+        limit (int, optional): Maximum number of records to retrieve, Defaults to 10.
+        Capped by the `max_page_size` setting.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        List[Part]: Matching parts ranked by BM25.
+    """
+    limit = min(limit, settings.max_page_size)
+    return utils.search_parts(
+        db=db_session, q=q, skip=skip, limit=limit, active_only=settings.soft_delete
+    )
+
+
 @router.get(
     "/most_common_words/",
-    summary="Get 5 most common words in part descriptions",
-    response_description="List of the 5 most common words in part descriptions",
+    summary="Get the most common words in part descriptions",
+    response_description="List of the k most common words in part descriptions",
     response_model=List[WordCount],
 )
-def get_most_common_words(db_session: Session = Depends(deps.get_db)) -> List[WordCount]:
+def get_most_common_words(
+    request: Request,
+    k: int = Query(5, ge=1, le=100),
+    is_active: Optional[bool] = None,
+    sku_prefix: Optional[str] = Query(None, min_length=1),
+    stop_words: List[str] = Query([]),
+    min_length: int = Query(1, ge=1),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Response:
+    """
+    Endpoint to retrieve the most common words in part descriptions.
+
+    The `ETag` is a digest of the response body, a matching `If-None-Match` is
+    answered with 304 Not Modified. In soft-delete mode the inactive parts are left
+    out unless `is_active` is given.
+
+    Args:
+        k (int, optional): Number of words to return, Defaults to 5.
+        is_active (bool, optional): Only count parts with this active flag.
+        sku_prefix (str, optional): Only count parts whose SKU starts with this prefix.
+        stop_words (List[str], optional): Words to leave out of the result.
+        min_length (int, optional): Minimum length of the returned words, Defaults to 1.
+
+    Returns:
+    - List of the k most common words in part descriptions.
+    """
+    if is_active is None and settings.soft_delete:
+        is_active = True
+    most_common_words = utils.get_most_common_words(
+        db=db_session,
+        k=k,
+        is_active=is_active,
+        sku_prefix=sku_prefix,
+        stop_words=stop_words,
+        min_length=min_length,
+        use_index=settings.word_index_enabled,
+        batch_size=settings.word_count_batch_size,
+        workers=settings.word_count_workers,
+    )
+    payload = word_count_list.dump_json(most_common_words)
+    etag = conditional.digest_etag(payload)
+    if conditional.is_not_modified(request, etag):
+        return conditional.not_modified(etag)
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get(
+    "/stats",
+    summary="Get catalog statistics",
+    response_description="Part counts, weight and description length statistics",
+    response_model=PartStats,
+)
+def get_part_stats(
+    request: Request,
+    is_active: Optional[bool] = None,
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Response:
     """
-    Endpoint to retrieve the 5 most common words in part descriptions.
+    Endpoint to retrieve statistics of the catalog: the number of active and
+    inactive parts, the weight distribution and description length statistics.
+
+    The statistics are read from a summary table maintained by every write, so
+    the cost does not grow with the catalog. The `ETag` is a digest of the
+    response body, a matching `If-None-Match` is answered with 304 Not Modified.
+
+    Args:
+        is_active (bool, optional): Only describe parts with this active flag.
 
     Returns:
-    - List of the 5 most common words in part descriptions.
+    - Part counts, weight (with a histogram) and description length statistics.
+    """
+    stats = utils.get_part_stats(
+        db_session, is_active=is_active, histogram_edges=settings.stats_weight_histogram_edges
+    )
+    payload = stats.model_dump_json().encode()
+    etag = conditional.digest_etag(payload)
+    if conditional.is_not_modified(request, etag):
+        return conditional.not_modified(etag)
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get(
+    "/changes",
+    summary="Read the change feed",
+    response_description="The parts changed since the token, in change order, with the next token",
+    response_model=PartChanges,
+)
+def read_part_changes(
+    since: Optional[str] = None,
+    limit: int = Query(100, ge=1),
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> PartChanges:
     """
+    Read the parts created, updated or deleted since the `since` token, to keep a
+    replica of the catalog in sync.
+
+    Without `since`, the feed starts with every part of the catalog. Each changed
+    part is returned once, with its current state, or flagged as deleted. The
+    `next` token is passed as `since` to read the following changes, until
+    `has_more` is false.
+
+    Args:
+        since (str, optional): Token returned by the previous request.
+        limit (int, optional): Maximum number of changes to return, Defaults to 100.
+        Capped by the `max_page_size` setting.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
 
-    return utils.get_most_common_words(db=db_session)
+    Returns:
+        PartChanges: The changes and the token of the next request.
+
+    Raises:
+        HTTPException: If the token is invalid (400 Bad Request), or older than the
+        `change_retention` setting, as deletions since may have been compacted away
+        (410 Gone).
+    """
+    limit = min(limit, settings.max_page_size)
+    requested_at = utcnow()
+    after_seq, synced_at = 0, requested_at
+    if since is not None:
+        expires_before = requested_at - timedelta(seconds=settings.change_retention)
+        try:
+            after_seq, synced_at = utils.decode_change_token(since, expires_before)
+        except utils.ChangeTokenExpiredError as e:
+            raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+
+    changes = utils.get_part_changes(db_session, after_seq, limit, active_only=settings.soft_delete)
+    has_more = len(changes) == limit
+    # The client is only in sync once it read the whole log, until then the token
+    # keeps the time of the start of the sync.
+    next_token = utils.encode_change_token(
+        changes[-1].seq if changes else after_seq, synced_at if has_more else requested_at
+    )
+    return PartChanges(changes=changes, next=next_token, has_more=has_more)
+
+
+# Declared last so that fixed single-segment paths such as /export are matched
+# before this catch-all.
+@router.get(
+    "/{part_id}",
+    summary="Read a part by ID",
+    response_description="Retrieve detailed information about a part by its ID",
+    response_model=Part,
+)
+def read_part(
+    part_id: int,
+    request: Request,
+    db_session: Session = Depends(deps.get_db),
+    settings: AppSettings = Depends(deps.get_settings),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+) -> Response:
+    """
+    Retrieve a specific part by its ID.
+
+    The serialized part is served from the part cache when present, writes to the
+    part invalidate it.
+
+    The `ETag` and `Last-Modified` headers come from the part version, cached in the
+    same entry as the body so they always describe it. A cached part answers a
+    matching `If-None-Match` or `If-Modified-Since` with 304 Not Modified without a
+    database read, an uncached one after reading its version alone.
+
+    Args:
+        part_id (int): The ID of the part to retrieve.
+        db_session (Session, optional): SQLAlchemy database session.
+        Defaults to Depends(deps.get_db).
+
+    Returns:
+        Response: Details of the retrieved part.
+
+    Raises:
+        HTTPException: If the part with the specified ID does not exist (404 Not Found).
+    """
+    part = utils.peek_cached_part(part_id, part_cache)
+    if part is None and conditional.is_conditional(request):
+        # Validate the client copy against the version alone, then load the row to
+        # build the body and its validators from the same read
+        validators = utils.get_part_version(
+            db=db_session, part_id=part_id, active_only=settings.soft_delete
+        )
+        if validators is None:
+            raise HTTPException(status_code=404, detail=f"Part with ID={part_id} not found.")
+        etag, last_modified = conditional.version_etag(*validators), validators[1]
+        if conditional.is_not_modified(request, etag, last_modified):
+            return conditional.not_modified(etag, last_modified)
+    if part is None:
+        part = utils.load_cached_part(
+            db=db_session, part_id=part_id, cache=part_cache, active_only=settings.soft_delete
+        )
+    if part is None:
+        raise HTTPException(status_code=404, detail=f"Part with ID={part_id} not found.")
+    etag, last_modified = conditional.version_etag(part.version, part.updated_at), part.updated_at
+    if conditional.is_not_modified(request, etag, last_modified):
+        return conditional.not_modified(etag, last_modified)
+    return Response(
+        content=part.payload,
+        media_type="application/json",
+        headers=conditional.validator_headers(etag, last_modified),
+    )
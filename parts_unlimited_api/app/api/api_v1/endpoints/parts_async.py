@@ -0,0 +1,354 @@
+from typing import Any, Dict, List, Optional, Union
+
+from app.api import async_utils, conditional, deps, utils
+from app.api.api_v1.endpoints.parts import (
+    get_after,
+    get_part_filter,
+    part_response,
+    part_rows_response,
+    part_update_response,
+    submit_write,
+)
+from app.core.cache import CacheBackend
+from app.core.settings.app import AppSettings
+from app.db.write_queue import WriteQueue
+from app.models.parts import Part as ModelPart
+from app.schemas.parts import Part, PartBase, PartFilter, PartPatch
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Async counterparts of the CRUD endpoints in `parts.py`, served instead of them
+# when the app runs with `async_db` enabled. See `app.routers.parts`.
+router = APIRouter()
+
+
+@router.post(
+    "/create/",
+    summary="Create a new part",
+    response_description="Create a new part object",
+    response_model=Part,
+)
+async def create_part(
+    part: PartBase,
+    db_session: AsyncSession = Depends(deps.get_async_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[Part, Response]:
+    """
+    Create a new part.
+
+    Args:
+        part (PartCreate): Data required to create the new part.
+        db_session (AsyncSession, optional): SQLAlchemy async database session.
+        Defaults to Depends(deps.get_async_db).
+
+    Returns:
+        Part: Newly created part details.
+
+    Raises:
+        HTTPException: If there is an issue creating the part,
+        such as validation errors (400 Bad Request), the SKU is taken by another
+        part, a soft-deleted one included (409 Conflict), or the write queue of the
+        write-behind mode is full (429 Too Many Requests).
+    """
+    try:
+        if write_queue is not None:
+            db_part = await submit_write(write_queue, utils.create_part, part=part)
+        else:
+            db_part = await async_utils.create_part(db=db_session, part=part)
+        return part_response(db_part, settings.fast_serialization)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except utils.DuplicateSkuError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+async def apply_part_update(
+    db_session: AsyncSession,
+    write_queue: Optional[WriteQueue],
+    part_id: int,
+    values: Dict[str, Any],
+    request: Request,
+    response: Response,
+    part_cache: Optional[CacheBackend],
+    settings: AppSettings,
+) -> Union[Part, Response]:
+    kwargs: Dict[str, Any] = dict(
+        part_id=part_id,
+        values=values,
+        cache=part_cache,
+        versions=conditional.if_match_versions(request),
+        active_only=settings.soft_delete,
+    )
+    try:
+        if write_queue is not None:
+            db_part = await submit_write(write_queue, utils.update_part, **kwargs)
+        else:
+            db_part = await async_utils.update_part(db=db_session, **kwargs)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except utils.VersionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
+    except utils.DuplicateSkuError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return part_update_response(db_part, response, settings.fast_serialization)
+
+
+@router.put(
+    "/update/{part_id}",
+    summary="Update an existing part",
+    response_description="Update an existing part object",
+    response_model=Part,
+)
+async def update_part(
+    part_id: int,
+    part: PartBase,
+    request: Request,
+    response: Response,
+    db_session: AsyncSession = Depends(deps.get_async_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[Part, Response]:
+    """
+    Update an existing part by its ID.
+
+    See the sync `update_part` endpoint for the `If-Match` rules.
+
+    Args:
+        part_id (int): The ID of the part to update.
+        part (PartUpdate): Updated data for the part.
+        db_session (AsyncSession, optional): SQLAlchemy async database session.
+        Defaults to Depends(deps.get_async_db).
+
+    Returns:
+        Part: Updated details of the part.
+
+    Raises:
+        HTTPException: If the part with the specified ID does not exist (404 Not Found),
+        an updated value is invalid (400 Bad Request), the new SKU is taken by another
+        part (409 Conflict), the part was modified since the `If-Match` version
+        (412 Precondition Failed) or the write queue of the write-behind mode is
+        full (429 Too Many Requests).
+    """
+    values = {field: value for field, value in part.model_dump().items() if value is not None}
+    return await apply_part_update(
+        db_session, write_queue, part_id, values, request, response, part_cache, settings
+    )
+
+
+@router.patch(
+    "/update/{part_id}",
+    summary="Partially update an existing part",
+    response_description="Update the given fields of an existing part object",
+    response_model=Part,
+)
+async def patch_part(
+    part_id: int,
+    part: PartPatch,
+    request: Request,
+    response: Response,
+    db_session: AsyncSession = Depends(deps.get_async_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[Part, Response]:
+    """
+    Update only the fields sent in the request body.
+
+    See the sync `patch_part` endpoint.
+
+    Args:
+        part_id (int): The ID of the part to update.
+        part (PartPatch): Fields to change, the description can be set to null.
+        db_session (AsyncSession, optional): SQLAlchemy async database session.
+        Defaults to Depends(deps.get_async_db).
+
+    Returns:
+        Part: Updated details of the part.
+
+    Raises:
+        HTTPException: If the part with the specified ID does not exist (404 Not Found),
+        an updated value is invalid (400 Bad Request), the new SKU is taken by another
+        part (409 Conflict), the part was modified since the `If-Match` version
+        (412 Precondition Failed) or the write queue of the write-behind mode is
+        full (429 Too Many Requests).
+    """
+    values = part.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No fields to update.")
+    return await apply_part_update(
+        db_session, write_queue, part_id, values, request, response, part_cache, settings
+    )
+
+
+@router.delete(
+    "/delete/{part_id}",
+    summary="Delete a part",
+    description="Delete a part by its ID",
+)
+async def delete_part(
+    part_id: int,
+    db_session: AsyncSession = Depends(deps.get_async_db),
+    write_queue: Optional[WriteQueue] = Depends(deps.get_write_queue),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> None:
+    """
+    Delete a part by its ID, or mark it inactive with the `soft_delete` setting.
+
+    Args:
+        part_id (int): The ID of the part to delete.
+        db_session (AsyncSession, optional): SQLAlchemy async database session.
+        Defaults to Depends(deps.get_async_db).
+
+    Raises:
+        HTTPException: If the part with the specified ID does not exist (404 Not Found),
+        the write queue of the write-behind mode is full (429 Too Many Requests) or
+        there is an issue deleting the part (500 Internal Server Error).
+    """
+    kwargs: Dict[str, Any] = dict(part_id=part_id, cache=part_cache, soft=settings.soft_delete)
+    try:
+        if write_queue is not None:
+            await submit_write(write_queue, utils.delete_part, **kwargs)
+        else:
+            await async_utils.delete_part(db=db_session, **kwargs)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Part not found")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete part: {str(e)}",
+        )
+
+
+@router.get(
+    "/list/",
+    summary="List parts",
+    description="List parts with optional filters, sort order and offset or cursor pagination",
+    response_model=List[Part],
+)
+async def read_parts(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1),
+    cursor: Optional[str] = None,
+    filters: PartFilter = Depends(get_part_filter),
+    db_session: AsyncSession = Depends(deps.get_async_db),
+    settings: AppSettings = Depends(deps.get_settings),
+) -> Union[List[ModelPart], Response]:
+    """
+    List parts with optional filters, sort order and pagination.
+
+    See the sync `read_parts` endpoint for the filter, pagination and `ETag` rules.
+
+    Args:
+        skip (int, optional): Number of records to skip, Defaults to 0.
+        limit (int, optional): Maximum number of records to retrieve, Defaults to 10.
+        cursor (str, optional): Cursor returned in `X-Next-Cursor` by the previous page.
+        filters (PartFilter, optional): The filter and sort query parameters.
+        db_session (AsyncSession, optional): SQLAlchemy async database session.
+        Defaults to Depends(deps.get_async_db).
+
+    Returns:
+        List[Part]: List of parts within the specified range.
+    """
+    after_id, after_key = get_after(skip=skip, cursor=cursor, sort=filters.sort)
+    limit = min(limit, settings.max_page_size)
+    if settings.fast_serialization:
+        rows = await async_utils.get_part_rows(
+            db=db_session,
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            filters=filters,
+            after_key=after_key,
+        )
+        return part_rows_response(request, rows, limit, filters.sort)
+    if conditional.is_conditional(request):
+        versions = await async_utils.get_part_versions(
+            db=db_session,
+            skip=skip,
+            limit=limit,
+            after_id=after_id,
+            filters=filters,
+            after_key=after_key,
+        )
+        etag = conditional.rows_etag(versions)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified(etag)
+    db_parts = await async_utils.get_parts(
+        db=db_session,
+        skip=skip,
+        limit=limit,
+        after_id=after_id,
+        filters=filters,
+        after_key=after_key,
+    )
+    response.headers["ETag"] = conditional.rows_etag(
+        (db_part.id, db_part.version, db_part.updated_at)  # type: ignore[misc]
+        for db_part in db_parts
+    )
+    if len(db_parts) == limit:
+        response.headers["X-Next-Cursor"] = utils.next_page_cursor(db_parts[-1], filters.sort)
+    return db_parts
+
+
+@router.get(
+    "/{part_id}",
+    summary="Read a part by ID",
+    response_description="Retrieve detailed information about a part by its ID",
+    response_model=Part,
+)
+async def read_part(
+    part_id: int,
+    request: Request,
+    db_session: AsyncSession = Depends(deps.get_async_db),
+    settings: AppSettings = Depends(deps.get_settings),
+    part_cache: Optional[CacheBackend] = Depends(deps.get_part_cache),
+) -> Response:
+    """
+    Retrieve a specific part by its ID, through the part cache.
+
+    See the sync `read_part` endpoint for the `ETag` and `Last-Modified` rules.
+
+    Args:
+        part_id (int): The ID of the part to retrieve.
+        db_session (AsyncSession, optional): SQLAlchemy async database session.
+        Defaults to Depends(deps.get_async_db).
+
+    Returns:
+        Response: Details of the retrieved part.
+
+    Raises:
+        HTTPException: If the part with the specified ID does not exist (404 Not Found).
+    """
+    part = utils.peek_cached_part(part_id, part_cache)
+    if part is None and conditional.is_conditional(request):
+        # Validate the client copy against the version alone, then load the row to
+        # build the body and its validators from the same read
+        validators = await async_utils.get_part_version(
+            db=db_session, part_id=part_id, active_only=settings.soft_delete
+        )
+        if validators is None:
+            raise HTTPException(status_code=404, detail=f"Part with ID={part_id} not found.")
+        etag, last_modified = conditional.version_etag(*validators), validators[1]
+        if conditional.is_not_modified(request, etag, last_modified):
+            return conditional.not_modified(etag, last_modified)
+    if part is None:
+        part = await async_utils.load_cached_part(
+            db=db_session, part_id=part_id, cache=part_cache, active_only=settings.soft_delete
+        )
+    if part is None:
+        raise HTTPException(status_code=404, detail=f"Part with ID={part_id} not found.")
+    etag, last_modified = conditional.version_etag(part.version, part.updated_at), part.updated_at
+    if conditional.is_not_modified(request, etag, last_modified):
+        return conditional.not_modified(etag, last_modified)
+    return Response(
+        content=part.payload,
+        media_type="application/json",
+        headers=conditional.validator_headers(etag, last_modified),
+    )
@@ -0,0 +1,124 @@
+"""
+Async versions of the CRUD helpers in `app.api.utils`, for `AsyncSession`.
+
+Reads are issued directly on the async session. Writes run the sync helpers
+through `AsyncSession.run_sync`, so the word count index and the result caches
+are maintained by exactly the same code on both paths while the database I/O
+itself is awaited.
+"""
+
+from datetime import datetime
+from typing import Any, Collection, List, Mapping, Optional, Tuple
+
+from app.api import utils
+from app.core.cache import CacheBackend
+from app.models.parts import Part as ModelPart
+from app.schemas.parts import PartBase, PartFilter
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def create_part(db: AsyncSession, part: PartBase) -> Row:
+    return await db.run_sync(utils.create_part, part)
+
+
+async def get_part(
+    db: AsyncSession, part_id: int, active_only: bool = False
+) -> Optional[ModelPart]:
+    stmt = select(ModelPart).where(ModelPart.id == part_id)
+    if active_only:
+        stmt = stmt.where(utils.active_criterion())
+    result = await db.execute(stmt)
+    return result.scalars().first()
+
+
+async def get_cached_part(
+    db: AsyncSession, part_id: int, cache: Optional[CacheBackend] = None, active_only: bool = False
+) -> Optional[utils.CachedPart]:
+    part = utils.peek_cached_part(part_id, cache)
+    if part is not None:
+        return part
+    return await load_cached_part(db, part_id, cache, active_only)
+
+
+async def load_cached_part(
+    db: AsyncSession, part_id: int, cache: Optional[CacheBackend] = None, active_only: bool = False
+) -> Optional[utils.CachedPart]:
+    db_part = await get_part(db, part_id, active_only)
+    if db_part is None:
+        return None
+    part = utils.to_cached_part(db_part)
+    if cache is not None:
+        cache.set(
+            utils.part_cache_key(part_id), utils.encode_cached_part(part), version=part.version
+        )
+    return part
+
+
+async def get_part_version(
+    db: AsyncSession, part_id: int, active_only: bool = False
+) -> Optional[Tuple[int, datetime]]:
+    stmt = select(ModelPart.version, ModelPart.updated_at).where(ModelPart.id == part_id)
+    if active_only:
+        stmt = stmt.where(utils.active_criterion())
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return None
+    return row.version, row.updated_at
+
+
+async def get_parts(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    filters: Optional[PartFilter] = None,
+    after_key: Any = None,
+) -> List[ModelPart]:
+    stmt = utils._parts_page(select(ModelPart), skip, limit, after_id, filters, after_key)
+    result = await db.execute(stmt)
+    return list(result.scalars())
+
+
+async def get_part_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    filters: Optional[PartFilter] = None,
+    after_key: Any = None,
+) -> List[Row]:
+    stmt = select(*utils.PART_COLUMNS, ModelPart.version, ModelPart.updated_at)
+    result = await db.execute(utils._parts_page(stmt, skip, limit, after_id, filters, after_key))
+    return list(result)
+
+
+async def get_part_versions(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    filters: Optional[PartFilter] = None,
+    after_key: Any = None,
+) -> List[Tuple[int, int, datetime]]:
+    stmt = select(ModelPart.id, ModelPart.version, ModelPart.updated_at)
+    result = await db.execute(utils._parts_page(stmt, skip, limit, after_id, filters, after_key))
+    return [tuple(row) for row in result]
+
+
+async def update_part(
+    db: AsyncSession,
+    part_id: int,
+    values: Mapping[str, Any],
+    cache: Optional[CacheBackend] = None,
+    versions: Optional[Collection[int]] = None,
+    active_only: bool = False,
+) -> Optional[Row]:
+    return await db.run_sync(utils.update_part, part_id, values, cache, versions, active_only)
+
+
+async def delete_part(
+    db: AsyncSession, part_id: int, cache: Optional[CacheBackend] = None, soft: bool = False
+) -> None:
+    await db.run_sync(utils.delete_part, part_id, cache, soft)
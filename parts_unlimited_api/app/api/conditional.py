@@ -0,0 +1,118 @@
+"""
+Validators and precondition checks for conditional GET requests.
+
+Reads emit an `ETag` (and a `Last-Modified` date when the resource has one) and
+answer a matching `If-None-Match`, or a satisfied `If-Modified-Since` when no
+`If-None-Match` is sent, with 304 Not Modified and no body.
+"""
+
+import hashlib
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import Request, Response, status
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes, which are stored in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+VERSION_ETAG = re.compile(r'"(\d+)-[0-9a-f]+"')
+
+
+def version_etag(version: int, updated_at: datetime) -> str:
+    """
+    Strong ETag of a row, from its version and last update time.
+
+    The update time tells a row apart from a deleted one whose ID was reused.
+    """
+    return f'"{version}-{int(as_utc(updated_at).timestamp() * 1_000_000):x}"'
+
+
+def digest_etag(*chunks: bytes) -> str:
+    """
+    Strong ETag from a digest of the given content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk)
+    return f'"{digest.hexdigest()}"'
+
+
+def rows_etag(rows: Iterable[Tuple[int, int, datetime]]) -> str:
+    """
+    Strong ETag of a list of rows, from their `(id, version, updated_at)`.
+    """
+    return digest_etag(
+        *(
+            f"{row_id}:{version_etag(version, updated_at)},".encode()
+            for row_id, version, updated_at in rows
+        )
+    )
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(as_utc(value).replace(microsecond=0), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an `If-None-Match` header lists `etag`, using the weak comparison.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Whether the client copy, described by the request preconditions, is current.
+
+    `If-Modified-Since` is only considered when no `If-None-Match` is sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def if_match_versions(request: Request) -> Optional[Set[int]]:
+    """
+    The row versions listed, as `version_etag`s, in the `If-Match` header.
+
+    None when there is no precondition or it is `*`. Weak and foreign tags never
+    match under the strong comparison `If-Match` uses, so they are left out.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    matches = (VERSION_ETAG.fullmatch(tag.strip()) for tag in if_match.split(","))
+    return {int(match.group(1)) for match in matches if match}
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified)
+    )
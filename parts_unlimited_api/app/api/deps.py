@@ -1,8 +1,20 @@
+import json
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator, List, Optional
+
+from app.core.cache import CacheBackend
+from app.core.settings.app import AppSettings
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from starlette.requests import Request
 
+if TYPE_CHECKING:
+    from app.db.write_queue import WriteQueue
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-def get_db(request: Request) -> Session:
+
+def get_db(request: Request) -> Iterator[Session]:
     """
     Get DB session.
     """
@@ -12,3 +24,61 @@ def get_db(request: Request) -> Session:
             yield session
         finally:
             session.close()
+
+
+async def get_async_db(request: Request) -> AsyncIterator["AsyncSession"]:
+    """
+    Get async DB session, available when the app runs with `async_db` enabled.
+    """
+    session_local = request.app.state.async_session
+    async with session_local() as session:
+        yield session
+
+
+def get_settings(request: Request) -> AppSettings:
+    """
+    Get the settings the application was created with.
+    """
+    return request.app.state.settings
+
+
+async def get_bulk_rows(request: Request) -> List[Any]:
+    """
+    Parse a bulk request body given as a JSON array or as NDJSON.
+
+    A NDJSON line that is not valid JSON is returned as a ValueError in its
+    position, so it fails on its own instead of rejecting the whole batch.
+    """
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        rows: List[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(ValueError("Invalid JSON line."))
+        return rows
+
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON.")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON.")
+    return rows
+
+
+def get_part_cache(request: Request) -> Optional[CacheBackend]:
+    """
+    Get the cache of serialized parts, None when it is disabled.
+    """
+    return request.app.state.part_cache
+
+
+def get_write_queue(request: Request) -> Optional["WriteQueue"]:
+    """
+    Get the queue of the writer task, None unless the app runs with `write_behind`.
+    """
+    return request.app.state.write_queue
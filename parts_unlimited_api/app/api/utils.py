@@ -1,70 +1,1759 @@
-from collections import Counter
-from typing import List
+import base64
+import bisect
+import csv
+import heapq
+import io
+import json
+import math
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import (
+    Any,
+    Collection,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
+import pydantic_core
+from app.core.cache import CacheBackend, LRUCache
+from app.models.part_changes import PartChange as ModelPartChange
+from app.models.part_stats import PartStat as ModelPartStat
 from app.models.parts import Part as ModelPart
-from app.schemas.parts import Part, PartBase
+from app.models.parts import check_weight_ounces, create_part_fts, part_fts
+from app.models.word_counts import WordCount as ModelWordCount
+from app.schemas.parts import (
+    HistogramBucket,
+    Part,
+    PartBase,
+    PartBulkResult,
+    PartBulkUpdate,
+    PartChange,
+    PartFilter,
+    PartStats,
+    ValueStats,
+)
 from app.schemas.utils import WordCount
+from loguru import logger
+from sqlalchemy import (
+    and_,
+    delete,
+    false,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+# Most common words results keyed by their parameters, cleared on every part write.
+# Endpoints run in a thread pool, so the results go through the thread-safe LRUCache.
+# Replaced from the settings by configure_word_count_cache, None when disabled.
+WORD_COUNT_CACHE_SIZE = 128
+_word_count_cache: Optional[CacheBackend] = LRUCache(max_entries=WORD_COUNT_CACHE_SIZE)
+# Bumped by every invalidation, a result counted across one is not cached
+_word_count_generation = 0
+_word_count_lock = threading.Lock()
 
-def create_part(db: Session, part: PartBase) -> ModelPart:
-    db_part = ModelPart(**part.model_dump())
-    db.add(db_part)
+T = TypeVar("T")
+
+
+def tokenize(description: Optional[str]) -> Counter:
+    """
+    Split a description into lowercase words and count them.
+    """
+    if not description:
+        return Counter()
+    return Counter(description.lower().split())
+
+
+def count_description_batch(descriptions: Iterable[Optional[str]]) -> Counter:
+    """
+    Count the words of a batch of descriptions.
+
+    Kept at module level so it can be shipped to worker processes.
+    """
+    word_counts: Counter = Counter()
+    for description in descriptions:
+        if description:
+            word_counts.update(description.lower().split())
+    return word_counts
+
+
+def iter_description_batches(
+    db: Session, *criteria: Any, batch_size: int = 1000
+) -> Iterator[List[str]]:
+    """
+    Stream part descriptions in batches of at most `batch_size` rows.
+
+    Only the description column is selected and rows are fetched with `yield_per`,
+    so no `Part` instances are built and memory is bounded by the batch size.
+    """
+    stmt = select(ModelPart.description).where(ModelPart.description.is_not(None), *criteria)
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.scalars().partitions():
+        yield list(partition)
+
+
+def count_words(db: Session, *criteria: Any, batch_size: int = 1000, workers: int = 0) -> Counter:
+    """
+    Recompute description word counts from scratch by streaming the parts table.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        *criteria: Optional filters applied to the parts being counted.
+        batch_size (int, optional): Rows fetched and tokenized per batch. Defaults to 1000.
+        workers (int, optional): Size of the process pool used to tokenize batches,
+        0 tokenizes in the current process. Defaults to 0.
+
+    Returns:
+        Counter: Word counts over the matching descriptions.
+    """
+    started = time.perf_counter()
+    rows = 0
+    word_counts: Counter = Counter()
+    batches = iter_description_batches(db, *criteria, batch_size=batch_size)
+
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of batches in flight so memory does not grow
+            # with the table when the database reads faster than workers tokenize.
+            pending: Deque[Future] = deque()
+            for batch in batches:
+                rows += len(batch)
+                pending.append(executor.submit(count_description_batch, batch))
+                if len(pending) >= workers * 2:
+                    word_counts.update(pending.popleft().result())
+            while pending:
+                word_counts.update(pending.popleft().result())
+    else:
+        for batch in batches:
+            rows += len(batch)
+            word_counts.update(count_description_batch(batch))
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Counted words of {rows} descriptions in {elapsed:.3f}s "
+        f"({rows / elapsed if elapsed else 0:.0f} rows/s, workers={workers})."
+    )
+    return word_counts
+
+
+def apply_word_count_delta(
+    db: Session,
+    old_descriptions: Iterable[Optional[str]] = (),
+    new_descriptions: Iterable[Optional[str]] = (),
+) -> None:
+    """
+    Update the word count index with the difference between descriptions.
+
+    Only the words whose count actually changes are written, so an update that
+    leaves the description untouched costs no statements at all. The caller is
+    responsible for committing the transaction.
+    """
+    delta = count_description_batch(new_descriptions)
+    delta.subtract(count_description_batch(old_descriptions))
+    changes = [{"word": word, "count": count} for word, count in delta.items() if count]
+    if not changes:
+        return
+
+    stmt = sqlite_insert(ModelWordCount)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ModelWordCount.word],
+            set_={"count": ModelWordCount.count + stmt.excluded.count},
+        ),
+        changes,
+    )
+
+    removed = [change["word"] for change in changes if change["count"] < 0]
+    if removed:
+        db.execute(
+            delete(ModelWordCount).where(
+                ModelWordCount.word.in_(removed), ModelWordCount.count <= 0
+            )
+        )
+
+
+def apply_search_index_delta(
+    db: Session,
+    old_rows: Iterable[Mapping[Any, Any]] = (),
+    new_rows: Iterable[Mapping[Any, Any]] = (),
+) -> None:
+    """
+    Update the full-text index for parts whose name or description changed.
+
+    Rows are mappings with the part `id`, `name` and `description`. The index has
+    external content, so removing a row requires the exact text it was indexed
+    with. The caller is responsible for committing the transaction.
+    """
+    old_rows = [_search_row(row) for row in old_rows]
+    new_rows = [_search_row(row) for row in new_rows]
+    if old_rows:
+        db.execute(
+            text(
+                "INSERT INTO part_fts(part_fts, rowid, name, description) "
+                "VALUES ('delete', :id, :name, :description)"
+            ),
+            old_rows,
+        )
+    if new_rows:
+        db.execute(
+            text(
+                "INSERT INTO part_fts(rowid, name, description) VALUES (:id, :name, :description)"
+            ),
+            new_rows,
+        )
+
+
+def record_part_changes(db: Session, part_ids: Iterable[int], deleted: bool = False) -> None:
+    """
+    Move the given parts to the end of the change log, in the transaction of their
+    write, with the next values of the change sequence.
+
+    `INSERT OR REPLACE` drops the previous entry of every part, so the log keeps a
+    single entry per part. As for the other indexes, the caller is responsible for
+    committing the transaction.
+    """
+    rows = [{"part_id": part_id, "deleted": deleted} for part_id in part_ids]
+    if rows:
+        db.execute(insert(ModelPartChange).prefix_with("OR REPLACE"), rows)
+
+
+def _search_row(part: Any) -> Dict[str, Any]:
+    if not isinstance(part, Mapping):
+        part = vars(part)
+    return {"id": part["id"], "name": part["name"], "description": part["description"]}
+
+
+def create_part(db: Session, part: PartBase) -> Row:
+    """
+    Insert a part with a single `INSERT ... RETURNING`, no refresh afterwards.
+
+    Raises:
+        ValueError: If the weight is negative.
+        DuplicateSkuError: If another part has the SKU.
+    """
+    values = part.model_dump()
+    check_weight_ounces(values["weight_ounces"])
+    try:
+        new_row = db.execute(
+            insert(ModelPart).values(**values).returning(*ModelPart.__table__.c)
+        ).one()
+    except IntegrityError as e:
+        db.rollback()
+        raise DuplicateSkuError(DUPLICATE_SKU_DETAIL) from e
+    apply_word_count_delta(db, new_descriptions=[new_row.description])
+    apply_search_index_delta(db, new_rows=[new_row._mapping])
+    apply_part_stats_delta(db, new_rows=[new_row._mapping])
+    record_part_changes(db, [new_row.id])
     db.commit()
-    db.refresh(db_part)
-    return db_part
+    invalidate_word_count_cache()
+    return new_row
+
+
+def get_part(db: Session, part_id: int, active_only: bool = False) -> ModelPart:
+    query = db.query(ModelPart).filter(ModelPart.id == part_id)
+    if active_only:
+        query = query.filter(active_criterion())
+    return query.first()
+
+
+SQLITE_MAX_INTEGER = 2**63 - 1
+
+# Columns the parts list can be sorted by, all backed by an index
+PART_SORTS: Dict[str, Any] = {
+    "id": ModelPart.id,
+    "name": ModelPart.name,
+    "sku": ModelPart.sku,
+    "weight_ounces": ModelPart.weight_ounces,
+    "updated_at": ModelPart.updated_at,
+}
+
+
+def active_criterion(is_active: bool = True) -> Any:
+    """
+    Build an `is_active = 1` (or `= 0`) criterion with the flag inlined, not bound,
+    which SQLite requires to answer it from the partial indexes on the flag.
+    """
+    return ModelPart.is_active == (true() if is_active else false())
+
+
+def part_filter_criteria(filters: PartFilter) -> List[Any]:
+    """
+    Build the WHERE criteria of a parts list filter.
+
+    Every criterion is an equality or a range on an indexed column, so SQLite can
+    answer it with a seek instead of a full scan of the table.
+    """
+    criteria = []
+    if filters.is_active is not None:
+        criteria.append(active_criterion(filters.is_active))
+    if filters.min_weight is not None or filters.max_weight is not None:
+        # Always a closed range: without statistics, SQLite takes a range bounded on
+        # one side for an unselective one and scans the table in sort order instead
+        lower = 0 if filters.min_weight is None else filters.min_weight
+        upper = SQLITE_MAX_INTEGER if filters.max_weight is None else filters.max_weight
+        criteria.append(ModelPart.weight_ounces.between(lower, upper))
+    if filters.name_prefix:
+        criteria.append(prefix_filter(ModelPart.name, filters.name_prefix))
+    if filters.sku_prefix:
+        criteria.append(prefix_filter(ModelPart.sku, filters.sku_prefix))
+    return criteria
+
+
+def _after_criterion(sort: str, after_id: int, after_key: Any) -> Any:
+    """
+    Build the keyset criterion of the rows sorted after `(after_key, after_id)`.
+
+    NULL keys come first in both directions, so a page after a non-NULL key is a
+    seek on the sort index, and a page after a NULL key also takes every non-NULL key.
+    """
+    descending = sort.startswith("-")
+    column = PART_SORTS[sort.lstrip("-")]
+    after_id_criterion = ModelPart.id < after_id if descending else ModelPart.id > after_id
+    if column is ModelPart.id:
+        return after_id_criterion
+    if after_key is None:
+        return or_(column.is_not(None), and_(column.is_(None), after_id_criterion))
+    after_key_criterion = column < after_key if descending else column > after_key
+    return or_(after_key_criterion, and_(column == after_key, after_id_criterion))
+
+
+def _parts_page(
+    stmt: Any,
+    skip: int = 0,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    filters: Optional[PartFilter] = None,
+    after_key: Any = None,
+) -> Any:
+    filters = filters or PartFilter()
+    stmt = stmt.where(*part_filter_criteria(filters))
+    if after_id is not None:
+        stmt = stmt.where(_after_criterion(filters.sort, after_id, after_key))
+    column = PART_SORTS[filters.sort.lstrip("-")]
+    order_by = [column]
+    if filters.sort.startswith("-"):
+        # SQLite reads the NULL keys first from the index in both directions
+        order_by = [column.desc().nulls_first()]
+    if column is not ModelPart.id:
+        # The ID breaks ties in the same direction, so one index scan serves the order
+        order_by.append(ModelPart.id.desc() if filters.sort.startswith("-") else ModelPart.id)
+    return stmt.order_by(*order_by).offset(skip).limit(limit)
+
+
+def get_parts(
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    filters: Optional[PartFilter] = None,
+    after_key: Any = None,
+) -> List[ModelPart]:
+    """
+    List the parts matching `filters`, ordered by its sort column then by ID.
+
+    With `after_id` (and `after_key`, the sort column value of that part) the page
+    starts right after that part, a seek on the sort index that costs the same for
+    every page, instead of skipping `skip` rows.
+    """
+    stmt = _parts_page(select(ModelPart), skip, limit, after_id, filters, after_key)
+    return list(db.execute(stmt).scalars())
+
+
+# Columns of the `Part` response schema, in its field order
+PART_FIELDS = tuple(Part.model_fields)
+PART_COLUMNS = tuple(getattr(ModelPart, field) for field in PART_FIELDS)
+
+
+def get_part_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    filters: Optional[PartFilter] = None,
+    after_key: Any = None,
+) -> List[Row]:
+    """
+    The parts `get_parts` would return, as `PART_COLUMNS` rows followed by the
+    version and update time, without hydrating ORM objects.
+    """
+    stmt = select(*PART_COLUMNS, ModelPart.version, ModelPart.updated_at)
+    return list(db.execute(_parts_page(stmt, skip, limit, after_id, filters, after_key)))
+
+
+def dump_part_json(row: Any) -> bytes:
+    """
+    Serialize a part row as the JSON of the `Part` schema, without validating it.
+    """
+    mapping = row._mapping
+    return pydantic_core.to_json({field: mapping[field] for field in PART_FIELDS})
+
+
+def dump_parts_json(rows: Iterable[Any]) -> bytes:
+    """
+    Serialize `get_part_rows` rows as the JSON of `List[Part]` in one pass.
+    """
+    # The rows start with `PART_COLUMNS`, zip drops the trailing version columns
+    return pydantic_core.to_json([dict(zip(PART_FIELDS, row)) for row in rows])
+
+
+def get_part_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    filters: Optional[PartFilter] = None,
+    after_key: Any = None,
+) -> List[Tuple[int, int, datetime]]:
+    """
+    The `(id, version, updated_at)` of the parts `get_parts` would return.
+    """
+    stmt = select(ModelPart.id, ModelPart.version, ModelPart.updated_at)
+    stmt = _parts_page(stmt, skip, limit, after_id, filters, after_key)
+    return [tuple(row) for row in db.execute(stmt)]
+
 
+def encode_cursor(last_id: int, sort: str = "id", key: Any = None) -> str:
+    """
+    Build the opaque cursor pointing right after the part with ID `last_id`.
 
-def get_part(db: Session, part_id: int) -> ModelPart:
-    return db.query(ModelPart).filter(ModelPart.id == part_id).first()
+    For other sort orders than by ID, the cursor also holds the sort order and the
+    `key` of that part in the sort column.
+    """
+    cursor: Dict[str, Any] = {"id": last_id}
+    if sort != "id":
+        cursor.update(sort=sort, key=key.isoformat() if isinstance(key, datetime) else key)
+    payload = json.dumps(cursor, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
 
 
-def get_parts(db: Session, skip: int = 0, limit: int = 10) -> List[Part]:
-    return db.query(ModelPart).offset(skip).limit(limit).all()
+def decode_cursor(cursor: str, sort: str = "id") -> Tuple[int, Any]:
+    """
+    Get the last seen part ID and sort key out of a cursor built by `encode_cursor`.
+
+    The key is checked against the type of the sort column, so a tampered cursor
+    fails here instead of in the query.
+
+    Raises:
+        ValueError: If the cursor is malformed or was built for another sort order.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id, cursor_sort, key = payload["id"], payload.get("sort", "id"), payload.get("key")
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor.") from e
+    if cursor_sort != sort:
+        raise ValueError("The cursor was built for another sort order.")
+    if not _is_sqlite_integer(last_id):
+        raise ValueError("Invalid cursor.")
+    column = PART_SORTS[sort.lstrip("-")]
+    if column is ModelPart.id or (key is None and column.nullable):
+        return last_id, None
+    if column is ModelPart.updated_at:
+        try:
+            key = datetime.fromisoformat(key)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid cursor.") from e
+    elif column is ModelPart.weight_ounces:
+        if not (_is_sqlite_integer(key) or (isinstance(key, float) and math.isfinite(key))):
+            raise ValueError("Invalid cursor.")
+    elif not isinstance(key, str):
+        raise ValueError("Invalid cursor.")
+    return last_id, key
+
+
+def _is_sqlite_integer(value: Any) -> bool:
+    # JSON booleans load as bool, an int subclass, and SQLite refuses larger integers
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and -SQLITE_MAX_INTEGER - 1 <= value <= SQLITE_MAX_INTEGER
+    )
+
+
+def next_page_cursor(last: Any, sort: str = "id") -> str:
+    """
+    Build the cursor of the page following a list page ending with the part `last`.
+    """
+    return encode_cursor(last.id, sort, getattr(last, sort.lstrip("-")))
+
+
+def part_cache_key(part_id: int) -> str:
+    return f"part:{part_id}"
+
+
+def part_sku_cache_key(sku: str) -> str:
+    return f"part-sku:{sku}"
+
+
+def part_cache_keys(part_id: int, *skus: Optional[str]) -> List[str]:
+    """
+    Every part cache key of a part, for invalidation.
+    """
+    return [part_cache_key(part_id)] + [part_sku_cache_key(sku) for sku in skus if sku]
+
+
+def serialize_part(db_part: ModelPart) -> bytes:
+    """
+    Serialize a part into the JSON payload returned by the read endpoints.
+    """
+    return Part.model_validate(db_part).model_dump_json().encode()
+
+
+class CachedPart(NamedTuple):
+    """
+    A serialized part with the version and update time its validators come from.
+    """
+
+    version: int
+    updated_at: datetime
+    payload: bytes
+
+
+def to_cached_part(db_part: Any) -> CachedPart:
+    return CachedPart(db_part.version, db_part.updated_at, serialize_part(db_part))
+
+
+def encode_cached_part(part: CachedPart) -> bytes:
+    # The JSON payload holds no newline, the first line is the version header
+    return f"{part.version} {part.updated_at.isoformat()}\n".encode() + part.payload
+
+
+def decode_cached_part(value: bytes) -> CachedPart:
+    header, payload = value.split(b"\n", 1)
+    version, updated_at = header.decode().split(" ", 1)
+    return CachedPart(int(version), datetime.fromisoformat(updated_at), payload)
+
+
+def get_cached_part(
+    db: Session, part_id: int, cache: Optional[CacheBackend] = None, active_only: bool = False
+) -> Optional[CachedPart]:
+    """
+    Get the serialized part with its version, reading through the part cache when
+    one is given. Both are cached in a single entry, so the validators of a read
+    always describe its body.
+
+    Returns None if the part does not exist, or with `active_only`, is inactive.
+    """
+    part = peek_cached_part(part_id, cache)
+    if part is not None:
+        return part
+    return load_cached_part(db, part_id, cache, active_only)
+
+
+def peek_cached_part(part_id: int, cache: Optional[CacheBackend] = None) -> Optional[CachedPart]:
+    """
+    Get the serialized part with its version from the part cache alone, None on a miss.
+    """
+    if cache is None:
+        return None
+    value = cache.get(part_cache_key(part_id))
+    return decode_cached_part(value) if value is not None else None
+
+
+def load_cached_part(
+    db: Session, part_id: int, cache: Optional[CacheBackend] = None, active_only: bool = False
+) -> Optional[CachedPart]:
+    """
+    Read and serialize a part, then fill the part cache with it when one is given.
+
+    Returns None if the part does not exist, or with `active_only`, is inactive.
+    """
+    db_part = get_part(db, part_id, active_only)
+    if db_part is None:
+        return None
+    part = to_cached_part(db_part)
+    if cache is not None:
+        cache.set(part_cache_key(part_id), encode_cached_part(part), version=part.version)
+    return part
+
+
+def get_part_version(
+    db: Session, part_id: int, active_only: bool = False
+) -> Optional[Tuple[int, datetime]]:
+    """
+    Get the `(version, updated_at)` of a part without loading the whole row.
+
+    Returns None if the part does not exist, or with `active_only`, is inactive.
+    """
+    stmt = select(ModelPart.version, ModelPart.updated_at).where(ModelPart.id == part_id)
+    if active_only:
+        stmt = stmt.where(active_criterion())
+    row = db.execute(stmt).first()
+    if row is None:
+        return None
+    return row.version, row.updated_at
+
+
+def get_part_payloads_by_sku(
+    db: Session,
+    skus: Iterable[str],
+    cache: Optional[CacheBackend] = None,
+    active_only: bool = False,
+) -> Dict[str, bytes]:
+    """
+    Get serialized parts by SKU, reading through the part cache when one is given.
+
+    SKUs missing from the cache are resolved with a single `IN (...)` query on the
+    unique SKU index. Unknown SKUs, and with `active_only` inactive parts, are left
+    out of the result.
+    """
+    payloads: Dict[str, bytes] = {}
+    missing = []
+    for sku in dict.fromkeys(skus):
+        value = cache.get(part_sku_cache_key(sku)) if cache is not None else None
+        if value is None:
+            missing.append(sku)
+        else:
+            payloads[sku] = decode_cached_part(value).payload
+
+    if missing:
+        stmt = select(ModelPart).where(ModelPart.sku.in_(missing))
+        if active_only:
+            stmt = stmt.where(active_criterion())
+        # The mapped columns of a loaded part are not typed as their values
+        db_part: Any
+        for db_part in db.execute(stmt).scalars():
+            part = to_cached_part(db_part)
+            payloads[db_part.sku] = part.payload
+            if cache is not None:
+                value = encode_cached_part(part)
+                cache.set(part_sku_cache_key(db_part.sku), value, version=part.version)
+                cache.set(part_cache_key(db_part.id), value, version=part.version)
+    return payloads
+
+
+class VersionConflictError(Exception):
+    """
+    Raised when a part is written with a version that is no longer current.
+    """
+
+
+class DuplicateSkuError(Exception):
+    """
+    Raised when a part is written with the SKU of another part, inactive ones included.
+    """
+
+
+# Soft-deleted parts keep their SKU until they are purged
+DUPLICATE_SKU_DETAIL = "SKU already exists (possibly soft-deleted)"
+
+
+# Fields whose old value an update has to know to maintain the word count and
+# search indexes and the catalog statistics. The SKU is added when the by-SKU
+# cache entry must be dropped.
+INDEXED_FIELDS = frozenset({"name", "description", "weight_ounces", "is_active"})
+
+# The columns the indexes, the statistics and the part cache need from a deleted
+# or updated part
+PART_INDEX_COLUMNS = (
+    ModelPart.id,
+    ModelPart.name,
+    ModelPart.description,
+    ModelPart.sku,
+    ModelPart.weight_ounces,
+    ModelPart.is_active,
+    ModelPart.version,
+)
+
+
+def update_part(
+    db: Session,
+    part_id: int,
+    values: Mapping[str, Any],
+    cache: Optional[CacheBackend] = None,
+    versions: Optional[Collection[int]] = None,
+    active_only: bool = False,
+) -> Optional[Row]:
+    """
+    Update the given fields of a part with a single `UPDATE ... RETURNING`.
+
+    The statement matches on the version too, so a concurrent write in between is
+    detected instead of overwritten. With `versions`, from an `If-Match`
+    precondition, the part must currently have one of them. Without, the update
+    applies to the current version: when a changed field needs its old value
+    (see `INDEXED_FIELDS`) the row is read first, and a concurrent write makes the
+    update retry against the new version. Otherwise no prior read is needed.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        part_id (int): The ID of the part to update.
+        values (Mapping[str, Any]): New values of the fields to change.
+        cache (CacheBackend, optional): Part cache to invalidate.
+        versions (Collection[int], optional): Versions the part must have.
+        active_only (bool, optional): Leave inactive parts alone, as if they did not exist.
+
+    Returns:
+        Optional[Row]: The updated part, None if it does not exist.
+
+    Raises:
+        ValueError: If a value is invalid.
+        VersionConflictError: If the part does not have one of `versions`.
+        DuplicateSkuError: If another part has the new SKU.
+    """
+    if values.get("weight_ounces") is not None:
+        check_weight_ounces(values["weight_ounces"])
+    read_fields = INDEXED_FIELDS | {"sku"} if cache is not None else INDEXED_FIELDS
+    read_old_row = not read_fields.isdisjoint(values)
+    criteria = [ModelPart.id == part_id]
+    if active_only:
+        criteria.append(active_criterion())
+    while True:
+        old_row = None
+        stmt = (
+            update(ModelPart)
+            .where(*criteria)
+            .values(**values)
+            .returning(*ModelPart.__table__.c)
+            .execution_options(synchronize_session=False)
+        )
+        if read_old_row:
+            old_row = db.execute(select(*PART_INDEX_COLUMNS).where(*criteria)).first()
+            if old_row is None:
+                return None
+            if versions is not None and old_row.version not in versions:
+                raise VersionConflictError(f"Part with ID={part_id} was modified.")
+            stmt = stmt.where(ModelPart.version == old_row.version)
+        elif versions is not None:
+            stmt = stmt.where(ModelPart.version.in_(versions))
+
+        try:
+            new_row = db.execute(stmt).first()
+        except IntegrityError as e:
+            # The SKU is the only unique column an update can change
+            db.rollback()
+            raise DuplicateSkuError(DUPLICATE_SKU_DETAIL) from e
+        if new_row is not None:
+            break
+        db.rollback()
+        if old_row is not None:
+            # Written since it was read, try again against its new version.
+            continue
+        if (
+            versions is not None
+            and get_part_version(db, part_id, active_only=active_only) is not None
+        ):
+            raise VersionConflictError(f"Part with ID={part_id} was modified.")
+        return None
+
+    if old_row is not None:
+        old_search_row = _search_row(old_row._asdict())
+        new_search_row = _search_row(new_row._mapping)
+        if old_row.description != new_row.description:
+            apply_word_count_delta(db, [old_row.description], [new_row.description])
+        if new_search_row != old_search_row:
+            apply_search_index_delta(db, [old_search_row], [new_search_row])
+        apply_part_stats_delta(db, [old_row._mapping], [new_row._mapping])
+    record_part_changes(db, [part_id])
+    db.commit()
+    invalidate_word_count_cache()
+    if cache is not None:
+        old_sku = old_row.sku if old_row is not None else None
+        cache.delete(*part_cache_keys(part_id, old_sku, new_row.sku), version=new_row.version)
+    return new_row
+
+
+def _delete_rows(
+    db: Session, criterion: Any, soft: bool = False, record_changes: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Delete the parts matching `criterion`, updating their indexes, statistics and,
+    unless `record_changes` is False, the change log, and return the deleted rows.
+    The caller commits the transaction.
+
+    A soft delete marks the active parts among them inactive with a single
+    `UPDATE ... RETURNING` instead. Their text stays in the word count and search
+    indexes until they are purged, only their statistics move to the inactive side.
+    """
+    if soft:
+        new_rows = [
+            row._asdict()
+            for row in db.execute(
+                update(ModelPart)
+                .where(criterion, active_criterion())
+                .values(is_active=False)
+                .returning(*PART_INDEX_COLUMNS)
+                .execution_options(synchronize_session=False)
+            )
+        ]
+        old_rows = [{**row, "is_active": True, "version": row["version"] - 1} for row in new_rows]
+        apply_part_stats_delta(db, old_rows, new_rows)
+    else:
+        old_rows = [
+            row._asdict()
+            for row in db.execute(delete(ModelPart).where(criterion).returning(*PART_INDEX_COLUMNS))
+        ]
+        apply_word_count_delta(db, old_descriptions=(row["description"] for row in old_rows))
+        apply_search_index_delta(db, old_rows=old_rows)
+        apply_part_stats_delta(db, old_rows=old_rows)
+    if record_changes:
+        record_part_changes(db, (row["id"] for row in old_rows), deleted=True)
+    return old_rows
 
 
-def update_part(db: Session, part_id: int, part: PartBase) -> ModelPart:
-    db_part = db.query(ModelPart).filter(ModelPart.id == part_id).first()
-    if db_part:
-        for attr, value in vars(part).items():
-            setattr(db_part, attr, value) if value is not None else None
+def delete_part(
+    db: Session, part_id: int, cache: Optional[CacheBackend] = None, soft: bool = False
+) -> None:
+    """
+    Delete a part with a single `DELETE ... RETURNING` the text its indexes need,
+    or with `soft`, mark it inactive with a single `UPDATE ... RETURNING`.
+
+    Raises:
+        ValueError: If the part does not exist, or with `soft`, is already inactive.
+    """
+    old_rows = _delete_rows(db, ModelPart.id == part_id, soft)
+    if not old_rows:
+        db.rollback()
+        raise ValueError(f"ID: {part_id} not found, please try with a valid ID")
+    db.commit()
+    invalidate_word_count_cache()
+    if cache is not None:
+        old_row = old_rows[0]
+        cache.delete(*part_cache_keys(part_id, old_row["sku"]), version=old_row["version"] + 1)
+
+
+def _chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def _bulk_error(index: int, detail: str, part_id: Optional[int] = None) -> PartBulkResult:
+    return PartBulkResult(index=index, id=part_id, status="error", detail=detail)
+
+
+def _validate_bulk_row(
+    part: PartBase, taken_skus: Collection[str], seen_skus: Set[str]
+) -> Optional[str]:
+    """
+    Check a bulk row against the model rules the ORM validators would enforce.
+
+    Returns the error message, or None when the row can be written.
+    """
+    try:
+        check_weight_ounces(part.weight_ounces)
+    except ValueError as ve:
+        return str(ve)
+    if part.sku in taken_skus or part.sku in seen_skus:
+        return f"SKU {part.sku} already exists."
+    seen_skus.add(part.sku)
+    return None
+
+
+def _write_rows_one_by_one(
+    db: Session, stmt: Any, rows: Sequence[Tuple[int, Dict[str, Any]]]
+) -> Tuple[List[Tuple[int, int]], List[PartBulkResult]]:
+    """
+    Retry a chunk row by row inside savepoints after a batched write failed.
+
+    Used when a concurrent writer made a batched statement hit a constraint, so a
+    single conflicting row only fails itself. Returns the (index, part ID) pairs
+    written and the errors of the rest.
+
+    Called after the failed chunk was rolled back. Without an open transaction the
+    driver would send the savepoints alone, and SQLite would commit every released
+    row by itself, apart from the index updates the caller writes next. The rows are
+    written in an explicit transaction instead, which the caller commits.
+    """
+    db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+    written, errors = [], []
+    for index, row in rows:
+        try:
+            with db.begin_nested():
+                result = db.execute(stmt, [row])
+                written.append((index, row["id"] if "id" in row else result.scalar_one()))
+        except IntegrityError:
+            errors.append(_bulk_error(index, "Conflicts with an existing part.", row.get("id")))
+    return written, errors
+
+
+def bulk_create_parts(
+    db: Session, parts: Sequence[Tuple[int, PartBase]], chunk_size: int = 500
+) -> List[PartBulkResult]:
+    """
+    Create many parts with one multi-row INSERT and one commit per chunk.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        parts (Sequence[Tuple[int, PartBase]]): Parts to create with their index in the request.
+        chunk_size (int, optional): Rows written per transaction. Defaults to 500.
+
+    Returns:
+        List[PartBulkResult]: One result per part, errors included.
+    """
+    results = []
+    for chunk in _chunks(parts, chunk_size):
+        skus = {part.sku for _, part in chunk}
+        taken_skus = set(db.execute(select(ModelPart.sku).where(ModelPart.sku.in_(skus))).scalars())
+        seen_skus: Set[str] = set()
+        rows = []
+        for index, part in chunk:
+            error = _validate_bulk_row(part, taken_skus, seen_skus)
+            if error:
+                results.append(_bulk_error(index, error))
+            else:
+                rows.append((index, part.model_dump()))
+        if not rows:
+            continue
+
+        stmt = insert(ModelPart).returning(ModelPart.id, sort_by_parameter_order=True)
+        try:
+            ids = db.execute(stmt, [row for _, row in rows]).scalars().all()
+            created = list(zip((index for index, _ in rows), ids))
+        except IntegrityError:
+            db.rollback()
+            created, errors = _write_rows_one_by_one(db, stmt, rows)
+            results.extend(errors)
+
+        ids_by_index = dict(created)
+        created_rows = [
+            {**row, "id": ids_by_index[index]} for index, row in rows if index in ids_by_index
+        ]
+        apply_word_count_delta(db, new_descriptions=(row["description"] for row in created_rows))
+        apply_search_index_delta(db, new_rows=created_rows)
+        apply_part_stats_delta(db, new_rows=created_rows)
+        record_part_changes(db, (part_id for _, part_id in created))
+        db.commit()
+        results.extend(
+            PartBulkResult(index=index, id=part_id, status="created") for index, part_id in created
+        )
+
+    invalidate_word_count_cache()
+    return results
+
+
+def bulk_update_parts(
+    db: Session,
+    parts: Sequence[Tuple[int, PartBulkUpdate]],
+    chunk_size: int = 500,
+    cache: Optional[CacheBackend] = None,
+    active_only: bool = False,
+) -> List[PartBulkResult]:
+    """
+    Update many parts by ID with one executemany UPDATE and one commit per chunk.
+
+    As in `update_part`, fields set to None keep their current value.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        parts (Sequence[Tuple[int, PartBulkUpdate]]): Parts to update with their index
+        in the request.
+        chunk_size (int, optional): Rows written per transaction. Defaults to 500.
+        active_only (bool, optional): Report inactive parts as not found.
+
+    Returns:
+        List[PartBulkResult]: One result per part, errors included.
+    """
+    results = []
+    for chunk in _chunks(parts, chunk_size):
+        stmt = select(*PART_INDEX_COLUMNS).where(ModelPart.id.in_({part.id for _, part in chunk}))
+        if active_only:
+            stmt = stmt.where(active_criterion())
+        current = {row.id: row for row in db.execute(stmt)}
+        ids_by_sku: Dict[str, int] = {
+            sku: part_id
+            for sku, part_id in db.execute(
+                select(ModelPart.sku, ModelPart.id).where(
+                    ModelPart.sku.in_({part.sku for _, part in chunk})
+                )
+            )
+        }
+        seen_skus: Set[str] = set()
+        rows = []
+        for index, part in chunk:
+            if part.id not in current:
+                results.append(_bulk_error(index, "Part not found", part.id))
+                continue
+            # A part keeping its own SKU is not a conflict.
+            taken_skus = {sku for sku, part_id in ids_by_sku.items() if part_id != part.id}
+            error = _validate_bulk_row(part, taken_skus, seen_skus)
+            if error:
+                results.append(_bulk_error(index, error, part.id))
+            else:
+                rows.append((index, part.model_dump(exclude_none=True)))
+        if not rows:
+            continue
+
+        update_stmt = update(ModelPart)
+        try:
+            db.execute(update_stmt, [row for _, row in rows])
+            updated = rows
+        except IntegrityError:
+            db.rollback()
+            written, errors = _write_rows_one_by_one(db, update_stmt, rows)
+            results.extend(errors)
+            written_indexes = {index for index, _ in written}
+            updated = [(index, row) for index, row in rows if index in written_indexes]
+
+        old_rows = [current[row["id"]]._asdict() for _, row in updated]
+        new_rows = [{**old_row, **row} for old_row, (_, row) in zip(old_rows, updated)]
+        apply_word_count_delta(
+            db,
+            (row["description"] for row in old_rows),
+            (row["description"] for row in new_rows),
+        )
+        apply_search_index_delta(db, old_rows, new_rows)
+        apply_part_stats_delta(db, old_rows, new_rows)
+        record_part_changes(db, (row["id"] for row in new_rows))
+        db.commit()
+        if cache is not None:
+            for old_row, new_row in zip(old_rows, new_rows):
+                cache.delete(
+                    *part_cache_keys(new_row["id"], old_row["sku"], new_row["sku"]),
+                    version=old_row["version"] + 1,
+                )
+        results.extend(
+            PartBulkResult(index=index, id=row["id"], status="updated") for index, row in updated
+        )
+
+    invalidate_word_count_cache()
+    return results
+
+
+def bulk_delete_parts(
+    db: Session,
+    part_ids: Sequence[Tuple[int, int]],
+    chunk_size: int = 500,
+    cache: Optional[CacheBackend] = None,
+    soft: bool = False,
+) -> List[PartBulkResult]:
+    """
+    Delete many parts with one DELETE ... RETURNING and one commit per chunk.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        part_ids (Sequence[Tuple[int, int]]): IDs to delete with their index in the request.
+        chunk_size (int, optional): Rows deleted per transaction. Defaults to 500.
+        soft (bool, optional): Mark the parts inactive with one UPDATE ... RETURNING
+        instead, already inactive parts are reported as not found.
+
+    Returns:
+        List[PartBulkResult]: One result per ID, errors included.
+    """
+    results = []
+    for chunk in _chunks(part_ids, chunk_size):
+        criterion = ModelPart.id.in_({part_id for _, part_id in chunk})
+        deleted = {row["id"]: row for row in _delete_rows(db, criterion, soft)}
+        db.commit()
+        if cache is not None:
+            for part_id, row in deleted.items():
+                cache.delete(*part_cache_keys(part_id, row["sku"]), version=row["version"] + 1)
+        for index, part_id in chunk:
+            if part_id in deleted:
+                results.append(PartBulkResult(index=index, id=part_id, status="deleted"))
+                # A repeated ID in the same request is reported as not found.
+                del deleted[part_id]
+            else:
+                results.append(_bulk_error(index, "Part not found", part_id))
+
+    invalidate_word_count_cache()
+    return results
+
+
+def purge_deleted_parts(
+    db: Session, deleted_before: datetime, batch_size: int = 500, pause: float = 0
+) -> int:
+    """
+    Remove the soft-deleted parts last written before `deleted_before`, with their
+    word counts, search index entries and statistics.
+
+    Parts are removed `batch_size` at a time by one `DELETE ... RETURNING` over the
+    index of inactive parts, each batch in its own short transaction, so the write
+    lock is released in between for the requests.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        deleted_before (datetime): Only purge parts deleted before this time.
+        batch_size (int, optional): Parts removed per transaction. Defaults to 500.
+        pause (float, optional): Seconds to wait between batches. Defaults to 0.
+
+    Returns:
+        int: The number of parts removed.
+    """
+    batch = (
+        select(ModelPart.id)
+        .where(active_criterion(False), ModelPart.updated_at < deleted_before)
+        .order_by(ModelPart.updated_at)
+        .limit(batch_size)
+    )
+    purged = 0
+    while True:
+        # Their deletion was recorded in the change log when they were soft deleted
+        old_rows = _delete_rows(db, ModelPart.id.in_(batch.scalar_subquery()), record_changes=False)
+        db.commit()
+        purged += len(old_rows)
+        if len(old_rows) < batch_size:
+            break
+        time.sleep(pause)
+    if purged:
+        invalidate_word_count_cache()
+    return purged
+
+
+def incremental_vacuum(db: Session, pages: int = 1000) -> int:
+    """
+    Return the free pages of the database file to the file system, `pages` at a
+    time, when it uses `auto_vacuum = INCREMENTAL`.
+
+    Every page is released by its own `PRAGMA incremental_vacuum(1)`, as the
+    driver only steps a statement once, which also keeps every write short.
+
+    Returns:
+        int: The number of pages released, 0 without incremental auto-vacuum.
+    """
+    if db.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+        return 0
+    released = 0
+    while True:
+        free_pages = db.execute(text("PRAGMA freelist_count")).scalar()
+        if not free_pages:
+            break
+        db.connection().exec_driver_sql(
+            "PRAGMA incremental_vacuum(1)", [()] * min(free_pages, pages)
+        )
         db.commit()
-        db.refresh(db_part)
-    return db_part
+        left = db.execute(text("PRAGMA freelist_count")).scalar()
+        if left >= free_pages:
+            break
+        released += free_pages - left
+    return released
+
+
+class ChangeTokenExpiredError(Exception):
+    """
+    Raised when a change feed token is older than the retention of the change log.
+    """
+
+
+def encode_change_token(seq: int, synced_at: datetime) -> str:
+    """
+    Build the opaque change feed token of a client that read the change log up to
+    `seq`, and was in sync with the catalog at `synced_at`.
+    """
+    payload = json.dumps({"seq": seq, "at": synced_at.isoformat()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_change_token(token: str, expires_before: datetime) -> Tuple[int, datetime]:
+    """
+    Get the last read change sequence and the sync time out of a token built by
+    `encode_change_token`.
+
+    A client last in sync before `expires_before` may have missed deletions since
+    removed from the change log, and has to sync again from the start.
+
+    Raises:
+        ValueError: If the token is malformed.
+        ChangeTokenExpiredError: If the token was in sync before `expires_before`.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        seq, synced_at = payload["seq"], datetime.fromisoformat(payload["at"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid token.") from e
+    if not isinstance(seq, int) or synced_at.tzinfo is None:
+        raise ValueError("Invalid token.")
+    if synced_at < expires_before:
+        raise ChangeTokenExpiredError("The token expired, sync again without `since`.")
+    return seq, synced_at
+
+
+def get_part_changes(
+    db: Session, after_seq: int = 0, limit: int = 100, active_only: bool = False
+) -> List[PartChange]:
+    """
+    Get the parts changed after the change sequence `after_seq`, in change order,
+    each with its current state.
+
+    The change log is read from its primary key and the parts by ID, so the cost
+    follows the number of changes read, not the size of the catalog. With
+    `active_only`, inactive parts are reported as deleted.
+    """
+    stmt = (
+        select(ModelPartChange.id, ModelPartChange.part_id, ModelPartChange.deleted, ModelPart)
+        .outerjoin(ModelPart, ModelPart.id == ModelPartChange.part_id)
+        .where(ModelPartChange.id > after_seq)
+        .order_by(ModelPartChange.id)
+        .limit(limit)
+    )
+    changes = []
+    for seq, part_id, deleted, db_part in db.execute(stmt):
+        deleted = deleted or db_part is None or (active_only and not db_part.is_active)
+        changes.append(
+            PartChange(
+                seq=seq,
+                id=part_id,
+                deleted=deleted,
+                part=None if deleted else Part.model_validate(db_part),
+            )
+        )
+    return changes
+
+
+def compact_part_changes(db: Session, deleted_before: datetime, batch_size: int = 500) -> int:
+    """
+    Remove the change log entries of the parts deleted before `deleted_before`,
+    `batch_size` at a time in short transactions.
 
+    The entries of existing parts are kept, so the log stays bounded by the size of
+    the catalog plus the deletions of the retention period.
 
-def delete_part(db: Session, part_id: int) -> None:
-    db_part = db.query(ModelPart).filter(ModelPart.id == part_id).first()
-    if db_part:
-        db.delete(db_part)
+    Returns:
+        int: The number of entries removed.
+    """
+    batch = (
+        select(ModelPartChange.id)
+        .where(ModelPartChange.deleted == true(), ModelPartChange.updated_at < deleted_before)
+        .limit(batch_size)
+    )
+    compacted = 0
+    while True:
+        removed = db.execute(
+            delete(ModelPartChange).where(ModelPartChange.id.in_(batch.scalar_subquery()))
+        ).rowcount
         db.commit()
+        compacted += removed
+        if removed < batch_size:
+            break
+    return compacted
+
+
+EXPORT_COLUMNS = ("id", "name", "sku", "description", "weight_ounces", "is_active")
+
+
+def iter_parts_export(
+    db: Session, export_format: str, batch_size: int = 1000, active_only: bool = False
+) -> Iterator[str]:
+    """
+    Stream the whole parts table, or only its active parts, as NDJSON lines or CSV rows.
+
+    Rows are read as plain column tuples with `yield_per` and serialized a batch
+    at a time, so memory stays flat and the first chunk is sent before the table
+    is read. The query only runs once the response starts streaming, after the
+    request dependencies have exited, so the session is closed here when done.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        export_format (str): Either "ndjson" or "csv".
+        batch_size (int, optional): Rows fetched and serialized per chunk. Defaults to 1000.
+        active_only (bool, optional): Leave the inactive parts out. Defaults to False.
+
+    Yields:
+        str: A chunk of serialized rows.
+    """
+    columns = [getattr(ModelPart, column) for column in EXPORT_COLUMNS]
+    stmt = select(*columns).order_by(ModelPart.id).execution_options(yield_per=batch_size)
+    if active_only:
+        stmt = stmt.where(active_criterion())
+    try:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            for partition in db.execute(stmt).partitions():
+                writer.writerows(partition)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            # An empty table still gets its header.
+            yield buffer.getvalue()
+        else:
+            for partition in db.execute(stmt).partitions():
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":")) + "\n"
+                    for row in partition
+                )
+    finally:
+        db.close()
+
+
+def search_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 query matching parts that contain every word.
+
+    Each word is quoted, so characters that are FTS5 syntax are matched literally.
+    """
+    return " ".join('"' + word.replace('"', '""') + '"' for word in q.split())
+
+
+def search_parts(
+    db: Session, q: str, skip: int = 0, limit: int = 10, active_only: bool = False
+) -> List[ModelPart]:
+    """
+    Full-text search over part names and descriptions, best BM25 match first.
+
+    Inactive parts stay in the search index, `active_only` filters them out of
+    the matches.
+    """
+    match = search_query(q)
+    if not match:
+        return []
+    stmt = (
+        select(ModelPart)
+        .join(part_fts, part_fts.c.rowid == ModelPart.id)
+        .where(text("part_fts MATCH :match").bindparams(match=match))
+        .order_by(func.bm25(literal_column("part_fts")), ModelPart.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    if active_only:
+        stmt = stmt.where(active_criterion())
+    return list(db.execute(stmt).scalars())
+
+
+def rebuild_search_index(db: Session) -> None:
+    """
+    Recreate the full-text index from the parts table, creating it if needed.
+    """
+    db.connection().execute(create_part_fts)
+    db.execute(text("INSERT INTO part_fts(part_fts) VALUES ('rebuild')"))
+    db.commit()
+
+
+def prefix_filter(column: Any, prefix: str) -> Any:
+    """
+    Build a `column >= prefix AND column < next_prefix` range for a prefix match.
+
+    Unlike `LIKE 'prefix%'`, which SQLite evaluates case-insensitively, the range
+    can be answered by a seek on the column index. Trailing U+10FFFF characters have
+    no successor and are left out of `next_prefix`, when only they remain the range
+    has no upper bound.
+    """
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return column >= prefix
+    upper = stem[:-1] + chr(ord(stem[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+def top_k_words(
+    word_counts: Mapping[str, int],
+    k: int,
+    stop_words: Collection[str] = (),
+    min_length: int = 1,
+) -> List[WordCount]:
+    """
+    Select the `k` most frequent words with a bounded heap.
+
+    Runs in O(n log k) instead of sorting the whole vocabulary. Ties are broken
+    alphabetically, matching the order of the word count index.
+    """
+    candidates = (
+        (-count, word)
+        for word, count in word_counts.items()
+        if len(word) >= min_length and word not in stop_words
+    )
+    return [WordCount(word=word, count=-count) for count, word in heapq.nsmallest(k, candidates)]
+
+
+def configure_word_count_cache(enabled: bool = True, ttl: Optional[float] = None) -> None:
+    """
+    Replace the most common words cache with an empty one expiring its results after
+    `ttl` seconds, or disable it.
+
+    The cache only sees the writes of its own process, the TTL bounds how long a
+    worker serves results missing the writes of the other workers.
+    """
+    global _word_count_cache
+    _word_count_cache = LRUCache(max_entries=WORD_COUNT_CACHE_SIZE, ttl=ttl) if enabled else None
+
+
+def invalidate_word_count_cache() -> None:
+    """
+    Drop every cached most common words result, called after parts are written.
+    """
+    global _word_count_generation
+    with _word_count_lock:
+        _word_count_generation += 1
+        if _word_count_cache is not None:
+            _word_count_cache.clear()
+
+
+def get_most_common_words(
+    db: Session,
+    k: int = 5,
+    is_active: Optional[bool] = None,
+    sku_prefix: Optional[str] = None,
+    stop_words: Iterable[str] = (),
+    min_length: int = 1,
+    use_index: bool = True,
+    batch_size: int = 1000,
+    workers: int = 0,
+) -> List[WordCount]:
+    """
+    Get the `k` most common description words.
+
+    Reads the word count index when no part filter is given. With `is_active=True`,
+    the words of the inactive parts are streamed and subtracted from the index
+    counts, which stays cheap in soft-delete mode where they are purged after a
+    while. Filtering by `is_active=False` or `sku_prefix`, or running with
+    `use_index=False` for catalogs without a maintained index, recomputes the
+    counts by streaming the matching descriptions. Results are cached per
+    parameter set until the next write.
+    """
+    stop_words = frozenset(word.lower() for word in stop_words)
+    key = json.dumps([k, is_active, sku_prefix, sorted(stop_words), min_length, use_index])
+    # Bound once, the cache may be replaced while the words are counted
+    cache, generation = _word_count_cache, _word_count_generation
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        return [WordCount(word=word, count=count) for word, count in json.loads(cached)]
+
+    if use_index and is_active is not False and not sku_prefix:
+        inactive: Counter = Counter()
+        if is_active:
+            inactive = count_words(
+                db, active_criterion(False), batch_size=batch_size, workers=workers
+            )
+        stmt = select(ModelWordCount.word, ModelWordCount.count)
+        if stop_words:
+            stmt = stmt.where(ModelWordCount.word.not_in(stop_words))
+        if min_length > 1:
+            stmt = stmt.where(func.length(ModelWordCount.word) >= min_length)
+        # Each inactive word can drop out of the top `k` words of the index, but at
+        # least `k` of the first `k + len(inactive)` keep their count
+        rows = db.execute(
+            stmt.order_by(ModelWordCount.count.desc(), ModelWordCount.word).limit(k + len(inactive))
+        )
+        word_counts = Counter({word: count - inactive[word] for word, count in rows})
+        most_common_words = top_k_words(+word_counts, k, stop_words, min_length)
     else:
-        raise ValueError(f"ID: {part_id} not found, please try with a valid ID")
+        criteria = []
+        if is_active is not None:
+            criteria.append(active_criterion(is_active))
+        if sku_prefix:
+            criteria.append(prefix_filter(ModelPart.sku, sku_prefix))
+        word_counts = count_words(db, *criteria, batch_size=batch_size, workers=workers)
+        most_common_words = top_k_words(word_counts, k, stop_words, min_length)
 
+    # A write committed while the words were counted may be missing from them
+    with _word_count_lock:
+        if cache is not None and generation == _word_count_generation:
+            cache.set(
+                key, json.dumps([[row.word, row.count] for row in most_common_words]).encode()
+            )
+    return most_common_words
 
-def get_most_common_words(db: Session) -> List[WordCount]:
-    # Fetch all parts from the database
-    parts = db.query(ModelPart).all()
 
-    print(parts)
+def rebuild_word_counts(db: Session, batch_size: int = 1000, workers: int = 0) -> int:
+    """
+    Recompute the word count index from every part description.
 
-    # Extract descriptions from parts and filter out None values
-    descriptions = [part.description for part in parts if part.description]
+    Used to backfill the index for parts written before it existed. Returns the
+    number of distinct words stored.
+    """
+    word_counts = count_words(db, batch_size=batch_size, workers=workers)
 
-    print(descriptions)
+    db.execute(delete(ModelWordCount))
+    if word_counts:
+        db.execute(
+            sqlite_insert(ModelWordCount),
+            [{"word": word, "count": count} for word, count in word_counts.items()],
+        )
+    db.commit()
+    invalidate_word_count_cache()
+    return len(word_counts)
 
-    # Split descriptions into words, convert to lowercase, and flatten the list
-    words = []
-    for description in descriptions:
-        words.extend(description.lower().split())
 
-    # Count occurrences of each word
-    word_counts = Counter(words)
+# Metrics of the catalog statistics table, each counting parts by the value it
+# takes from a part row. "parts" has the single value 0, to count every part.
+PART_STAT_METRICS = ("parts", "weight_ounces", "description_length")
+
+
+def part_stat_values(row: Mapping[str, Any]) -> Iterator[Tuple[str, bool, int]]:
+    """
+    The (metric, is_active, value) keys of the catalog statistics a part counts in.
+    """
+    is_active = bool(row["is_active"])
+    yield "parts", is_active, 0
+    if row["weight_ounces"] is not None:
+        yield "weight_ounces", is_active, row["weight_ounces"]
+    if row["description"] is not None:
+        yield "description_length", is_active, len(row["description"])
+
+
+def part_stat_range(metric: str, value: int) -> Tuple[int, int]:
+    """
+    The [lower, upper) range of values counted with `value` in a catalog statistics
+    row, keyed by `lower`.
+
+    Description lengths are bounded by the column length and have a row per value.
+    Weights are not, they are counted in power of two ranges (0, 1, 2-3, 4-7, ...).
+    """
+    if metric == "weight_ounces" and value > 1:
+        lower = 1 << (value.bit_length() - 1)
+        return lower, 2 * lower
+    return value, value + 1
+
+
+def part_stat_rows(counts: Mapping[Tuple[str, bool, int], int]) -> List[Dict[str, Any]]:
+    """
+    Build the catalog statistics rows from part counts keyed by (metric, is_active,
+    value), as counted by `count_part_stats`.
+    """
+    rows: Dict[Tuple[str, bool, int], Dict[str, Any]] = {}
+    for (metric, is_active, value), count in counts.items():
+        if count <= 0:
+            continue
+        lower, _ = part_stat_range(metric, value)
+        row = rows.setdefault(
+            (metric, is_active, lower),
+            {
+                "metric": metric,
+                "is_active": is_active,
+                "value": lower,
+                "count": 0,
+                "total": 0,
+                "min_value": value,
+                "max_value": value,
+            },
+        )
+        row["count"] += count
+        row["total"] += value * count
+        row["min_value"] = min(row["min_value"], value)
+        row["max_value"] = max(row["max_value"], value)
+    return list(rows.values())
+
+
+def apply_part_stats_delta(
+    db: Session,
+    old_rows: Iterable[Mapping[Any, Any]] = (),
+    new_rows: Iterable[Mapping[Any, Any]] = (),
+) -> None:
+    """
+    Update the catalog statistics with the difference between part rows.
+
+    Rows are mappings with the part `is_active`, `weight_ounces` and `description`.
+    As for the word count index, only the counts that change are written and the
+    caller is responsible for committing the transaction. It runs after the parts
+    are written: a weight range losing its lowest or highest weight reads its new
+    bounds from the weight index.
+    """
+    values: Tuple[Dict[Tuple[str, bool, int], List[int]], ...] = ({}, {})
+    for rows, side in ((old_rows, values[0]), (new_rows, values[1])):
+        for row in rows:
+            for metric, is_active, value in part_stat_values(row):
+                lower, _ = part_stat_range(metric, value)
+                side.setdefault((metric, is_active, lower), []).append(value)
+    removed, added = values
+    changes: List[Dict[str, Any]] = []
+    # Weight ranges losing values, whose bounds may have to be read again
+    narrowed = []
+    for key in removed.keys() | added.keys():
+        old, new = removed.get(key, []), added.get(key, [])
+        if sorted(old) == sorted(new):
+            continue
+        metric, is_active, lower = key
+        if old and part_stat_range(metric, lower)[1] - lower > 1:
+            narrowed.append((key, old))
+        changes.append(
+            {
+                "metric": metric,
+                "is_active": is_active,
+                "value": lower,
+                "count": len(new) - len(old),
+                "total": sum(new) - sum(old),
+                "min_value": min(new, default=None),
+                "max_value": max(new, default=None),
+            }
+        )
+    if not changes:
+        return
+
+    stmt = sqlite_insert(ModelPartStat)
+    excluded = stmt.excluded
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ModelPartStat.metric, ModelPartStat.is_active, ModelPartStat.value],
+            set_={
+                "count": ModelPartStat.count + excluded.count,
+                "total": ModelPartStat.total + excluded.total,
+                # The two argument min() and max() of SQLite are NULL if either is,
+                # as the bounds of a change only removing values
+                "min_value": func.min(
+                    ModelPartStat.min_value,
+                    func.coalesce(excluded.min_value, ModelPartStat.min_value),
+                ),
+                "max_value": func.max(
+                    ModelPartStat.max_value,
+                    func.coalesce(excluded.max_value, ModelPartStat.max_value),
+                ),
+            },
+        ),
+        changes,
+        # A single statement for every change, whether its bounds are NULL or not
+        execution_options={"render_nulls": True},
+    )
+    if any(change["count"] < 0 for change in changes):
+        db.execute(delete(ModelPartStat).where(ModelPartStat.count <= 0))
 
-    # Get the 5 most common words
-    most_common_words = word_counts.most_common(5)
+    for (metric, is_active, lower), old in narrowed:
+        # Only weights have ranges wider than one value. The bounds are two seeks
+        # of a weight index, only made when a removed weight was one of them.
+        _, upper = part_stat_range(metric, lower)
+        in_range = and_(
+            ModelPart.weight_ounces >= lower,
+            ModelPart.weight_ounces < upper,
+            active_criterion() if is_active else ModelPart.is_active.is_not(true()),
+        )
+        db.execute(
+            update(ModelPartStat)
+            .where(
+                ModelPartStat.metric == metric,
+                ModelPartStat.is_active == is_active,
+                ModelPartStat.value == lower,
+                or_(ModelPartStat.min_value.in_(old), ModelPartStat.max_value.in_(old)),
+            )
+            .values(
+                min_value=select(func.min(ModelPart.weight_ounces))
+                .where(in_range)
+                .scalar_subquery(),
+                max_value=select(func.max(ModelPart.weight_ounces))
+                .where(in_range)
+                .scalar_subquery(),
+            )
+        )
 
-    print(most_common_words)
 
-    # Extract only the words (ignoring the counts) and return as a list
-    return [WordCount(word=word, count=count) for word, count in most_common_words]
+def _value_stats(rows: Sequence[Mapping[Any, Any]]) -> ValueStats:
+    count = sum(row["count"] for row in rows)
+    if not count:
+        return ValueStats(count=0)
+    return ValueStats(
+        count=count,
+        min=min(row["min_value"] for row in rows),
+        max=max(row["max_value"] for row in rows),
+        mean=sum(row["total"] for row in rows) / count,
+    )
+
+
+def get_part_stats(
+    db: Session, is_active: Optional[bool] = None, histogram_edges: Sequence[int] = (0,)
+) -> PartStats:
+    """
+    Get the catalog statistics from the statistics table.
+
+    The table has at most one row per description length and per power of two
+    weight range, so reading it costs the same whatever the number of parts and
+    their weights.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        is_active (bool, optional): Only describe parts with this active flag.
+        histogram_edges (Sequence[int], optional): Ascending lower bounds of the
+        weight histogram buckets, the last bucket is open-ended. Each is 0 or a
+        power of two, so the weight ranges of the table fall in a single bucket.
+
+    Returns:
+        PartStats: Part counts, weight and description length statistics.
+    """
+    stmt = select(
+        ModelPartStat.metric,
+        ModelPartStat.is_active,
+        ModelPartStat.value,
+        ModelPartStat.count,
+        ModelPartStat.total,
+        ModelPartStat.min_value,
+        ModelPartStat.max_value,
+    )
+    if is_active is not None:
+        stmt = stmt.where(ModelPartStat.is_active == is_active)
+    parts = {True: 0, False: 0}
+    ranges: Dict[str, List[Mapping[Any, Any]]] = {"weight_ounces": [], "description_length": []}
+    for row in db.execute(stmt).mappings():
+        if row["metric"] == "parts":
+            parts[row["is_active"]] += row["count"]
+        else:
+            ranges[row["metric"]].append(row)
+
+    edges = sorted(histogram_edges)
+    histogram = [
+        HistogramBucket(lower=lower, upper=upper, count=0)
+        for lower, upper in zip(edges, [*edges[1:], None])
+    ]
+    for weight_range in ranges["weight_ounces"]:
+        index = bisect.bisect_right(edges, weight_range["value"]) - 1
+        if index >= 0:
+            histogram[index].count += weight_range["count"]
+
+    return PartStats(
+        active=parts[True],
+        inactive=parts[False],
+        weight_ounces=_value_stats(ranges["weight_ounces"]),
+        weight_histogram=histogram,
+        description_length=_value_stats(ranges["description_length"]),
+    )
+
+
+def count_part_stats(db: Session, batch_size: int = 10_000) -> Counter:
+    """
+    Recompute the catalog statistics counts by streaming the parts table.
+
+    Each batch of (is_active, weight, description length) rows is counted with
+    vectorized NumPy operations instead of one Counter update per part.
+
+    Returns:
+        Counter: Part counts keyed by (metric, is_active, value).
+    """
+    import numpy as np
+
+    stmt = select(
+        func.coalesce(ModelPart.is_active, False),
+        ModelPart.weight_ounces,
+        func.length(ModelPart.description),
+    )
+    counts: Counter = Counter()
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        # NULL weights and descriptions become NaN, and are left out below
+        batch = np.array(partition, dtype=np.float64)
+        is_active = batch[:, 0]
+        columns = {"parts": np.zeros(len(batch)), "weight_ounces": batch[:, 1]}
+        columns["description_length"] = batch[:, 2]
+        for metric, column in columns.items():
+            present = ~np.isnan(column)
+            keys, key_counts = np.unique(
+                np.column_stack((is_active[present], column[present])), axis=0, return_counts=True
+            )
+            counts.update(
+                {
+                    (metric, bool(active), int(value)): int(count)
+                    for (active, value), count in zip(keys, key_counts)
+                }
+            )
+    return counts
+
+
+def rebuild_part_stats(db: Session, batch_size: int = 10_000) -> int:
+    """
+    Recompute the catalog statistics table from every part, to backfill it or
+    reconcile it with the catalog. Returns the number of rows stored.
+    """
+    rows = part_stat_rows(count_part_stats(db, batch_size=batch_size))
+    db.execute(delete(ModelPartStat))
+    if rows:
+        db.execute(sqlite_insert(ModelPartStat), rows)
+    db.commit()
+    return len(rows)
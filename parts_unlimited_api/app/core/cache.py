@@ -0,0 +1,161 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """
+    Storage for serialized payloads, keyed by string.
+
+    The in-process `LRUCache` is the default. Other implementations can share
+    entries across worker processes, as long as `delete` is visible to all of
+    them before it returns.
+
+    Entries may carry the version of the data they hold. A reader can load a row,
+    see it updated and invalidated by a writer, and only then store what it read:
+    a versioned `set` is ignored when the key holds a newer version, and a
+    versioned `delete` leaves a tombstone of the new version behind, so the reader
+    does not store the old row again.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get the payload stored under `key`, or None on a miss.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, version: Optional[int] = None) -> None:
+        """
+        Store `value` under `key`, replacing any previous payload, unless `version`
+        is older than the version the key holds, or its tombstone.
+        """
+
+    @abstractmethod
+    def delete(self, *keys: str, version: Optional[int] = None) -> None:
+        """
+        Invalidate the given keys, missing keys are ignored. With `version`, the
+        keys keep a tombstone refusing older versions for a while.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Invalidate every key.
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters describing the cache usage.
+        """
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process cache with LRU eviction and an optional TTL.
+
+    Args:
+        max_entries (int, optional): Maximum number of entries. Defaults to 10000.
+        max_bytes (int, optional): Maximum total size of the stored payloads, unbounded
+        when None. Defaults to None.
+        ttl (float, optional): Seconds an entry stays valid, forever when None.
+        Defaults to None.
+        tombstone_ttl (float, optional): Seconds a tombstone left by a versioned
+        `delete` stays. Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        tombstone_ttl: float = 60,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.tombstone_ttl = tombstone_ttl
+        # (expires_at, version, value), a tombstone has no value
+        self._entries: "OrderedDict[str, Tuple[float, Optional[int], Optional[bytes]]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is None or entry[2] is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, value: bytes, version: Optional[int] = None) -> None:
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None:
+                if version is not None and entry[1] is not None and entry[1] > version:
+                    return
+                self._remove(key)
+            self._store(key, (expires_at, version, value))
+
+    def delete(self, *keys: str, version: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + self.tombstone_ttl
+        with self._lock:
+            for key in keys:
+                entry = self._live_entry(key)
+                if entry is not None:
+                    self._remove(key)
+                if version is not None:
+                    if entry is not None and entry[1] is not None:
+                        # Keep refusing the newest version stored so far
+                        version_kept = max(entry[1], version)
+                    else:
+                        version_kept = version
+                    self._store(key, (expires_at, version_kept, None))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def _live_entry(self, key: str) -> Optional[Tuple[float, Optional[int], Optional[bytes]]]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            self._remove(key)
+            return None
+        return entry
+
+    def _store(self, key: str, entry: Tuple[float, Optional[int], Optional[bytes]]) -> None:
+        self._entries[key] = entry
+        self._size += len(entry[2] or b"")
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._size > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, value = self._entries.pop(key)
+        self._size -= len(value or b"")
@@ -16,6 +16,14 @@ def create_start_app_handler(
 
     async def start_app() -> None:
         await connect_to_db(app, settings)
+        if settings.write_behind:
+            from app.db.write_queue import start_write_queue
+
+            start_write_queue(app, settings)
+        if settings.purge_interval is not None:
+            from app.db.purge import start_purge_job
+
+            start_purge_job(app, settings)
 
     return start_app
 
@@ -27,6 +35,16 @@ def create_stop_app_handler(app: FastAPI) -> Callable:
 
     @logger.catch
     async def stop_app() -> None:
+        if hasattr(app.state, "purge_task"):
+            from app.db.purge import stop_purge_job
+
+            await stop_purge_job(app)
+        if app.state.write_queue is not None:
+            from app.db.write_queue import stop_write_queue
+
+            await stop_write_queue(app)
         await close_db_connection(app)
+        # Flush the records still queued for an enqueued sink
+        await logger.complete()
 
     return stop_app
@@ -1,11 +1,33 @@
+import asyncio
+import inspect
+import json
 import logging
-from types import FrameType
-from typing import cast
+import queue
+import random
+import threading
+import traceback
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TextIO
 
 from loguru import logger
 
+if TYPE_CHECKING:
+    from loguru import Record
+
 
 class InterceptHandler(logging.Handler):
+    """
+    Forward standard library records to loguru.
+
+    With `caller=False` the stack is not walked to find where the record was
+    logged from, which is most of the cost of a record, and the source logger
+    name is kept in the `logger` extra field instead.
+    """
+
+    def __init__(self, level: int = logging.NOTSET, caller: bool = True) -> None:
+        super().__init__(level=level)
+        self.caller = caller
+        self._loggers: Dict[str, Any] = {}
+
     def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover
         # Get corresponding Loguru level if it exists
         try:
@@ -13,13 +35,125 @@ class InterceptHandler(logging.Handler):
         except ValueError:
             level = str(record.levelno)
 
+        if not self.caller:
+            bound = self._loggers.get(record.name)
+            if bound is None:
+                bound = self._loggers.setdefault(record.name, logger.bind(logger=record.name))
+            bound.opt(exception=record.exc_info).log(level, record.getMessage())
+            return
+
         # Find caller from where originated the logged message
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:  # noqa: WPS609
-            frame = cast(FrameType, frame.f_back)
+        frame, depth = inspect.currentframe(), 0
+        while frame and (
+            depth == 0 or frame.f_code.co_filename == logging.__file__
+        ):  # noqa: WPS609
+            frame = frame.f_back
             depth += 1
 
         logger.opt(depth=depth, exception=record.exc_info).log(
             level,
             record.getMessage(),
         )
+
+
+class AccessLogSampler(logging.Filter):
+    """
+    Keep a random `rate` fraction of the uvicorn access log records.
+
+    Records of 5xx responses are always kept.
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn.access records carry (client, method, path, http version, status)
+        args = record.args
+        if (
+            isinstance(args, tuple)
+            and len(args) == 5
+            and isinstance(args[4], int)
+            and args[4] >= 500
+        ):
+            return True
+        return random.random() < self.rate
+
+
+def json_formatter(caller: bool = True) -> Callable[["Record"], str]:
+    """
+    Loguru format function writing every record as one JSON object per line.
+    """
+
+    def format_record(record: "Record") -> str:
+        extra = record["extra"]
+        entry = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "logger": extra.get("logger", record["name"]),
+            "message": record["message"],
+        }
+        if caller:
+            entry.update(module=record["name"], function=record["function"], line=record["line"])
+        entry.update((key, value) for key, value in extra.items() if key not in ("logger", "json"))
+        if record["exception"] is not None:
+            entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+        extra["json"] = json.dumps(entry, default=str)
+        return "{extra[json]}\n"
+
+    return format_record
+
+
+class QueuedStream:
+    """
+    File-like loguru sink handing the messages to a writer thread, so that logging
+    calls never wait on the stream.
+
+    The thread writes every message queued so far and flushes once per batch. The
+    sink is drained by `await logger.complete()` and stopped by `logger.remove()`.
+
+    At most `max_queued` messages wait for the thread. When the stream falls that
+    far behind, new messages are dropped rather than held in memory or left to
+    block the logging call, and counted in `dropped`.
+    """
+
+    def __init__(self, stream: TextIO, max_queued: int = 10_000) -> None:
+        self.stream = stream
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_queued)
+        self._thread = threading.Thread(target=self._write_loop, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # loguru calls the sink under its handler lock, one message at a time
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        running = True
+        while running:
+            messages: List[Optional[str]] = [self._queue.get()]
+            while True:
+                try:
+                    messages.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            running = None not in messages
+            try:
+                self.stream.write("".join(message for message in messages if message))
+                self.stream.flush()
+            except Exception:  # noqa: B902
+                # Nowhere left to report it, the messages are dropped
+                pass
+            finally:
+                for _ in messages:
+                    self._queue.task_done()
+
+    async def complete(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._queue.join)
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
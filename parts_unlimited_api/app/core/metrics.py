@@ -0,0 +1,136 @@
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from app.core.cache import CacheBackend
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608, float("inf"))
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf"))
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, float("inf"))
+STATEMENT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+    float("inf"),
+)
+
+# Number of database statements issued by the request being served, a one-item
+# list so that increments made in threadpool copies of the context are shared.
+request_queries: ContextVar[Optional[List[int]]] = ContextVar("request_queries", default=None)
+
+
+class CacheCollector(Collector):
+    """
+    Expose the `stats()` counters of a cache, read at scrape time.
+    """
+
+    def __init__(self, name: str, cache: CacheBackend) -> None:
+        self.name = name
+        self.cache = cache
+
+    def collect(self) -> Iterator[Metric]:
+        stats = self.cache.stats()
+        for stat in ("hits", "misses", "evictions"):
+            if stat in stats:
+                yield CounterMetricFamily(
+                    f"{self.name}_{stat}", f"Cache {stat}.", value=stats[stat]
+                )
+        for stat in ("entries", "bytes"):
+            if stat in stats:
+                yield GaugeMetricFamily(f"{self.name}_{stat}", f"Cached {stat}.", value=stats[stat])
+
+
+class AppMetrics:
+    """
+    Prometheus metrics of one application, in their own registry.
+
+    Requests are recorded by `app.core.middleware.MetricsMiddleware` and labelled
+    with the route path template, database statements by the cursor hooks that
+    `app.db.events.instrument_engine` sets on the engines, and the write batches of
+    the write-behind mode by `app.db.write_queue.WriteQueue`.
+    """
+
+    def __init__(self) -> None:
+        self.registry = CollectorRegistry()
+        self.requests = Counter(
+            "http_requests",
+            "HTTP requests served.",
+            ["method", "route", "status"],
+            registry=self.registry,
+        )
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency.",
+            ["method", "route"],
+            registry=self.registry,
+        )
+        self.requests_in_flight = Gauge(
+            "http_requests_in_flight",
+            "HTTP requests being served.",
+            registry=self.registry,
+        )
+        self.response_size = Histogram(
+            "http_response_size_bytes",
+            "HTTP response body size.",
+            ["method", "route"],
+            buckets=SIZE_BUCKETS,
+            registry=self.registry,
+        )
+        self.request_queries = Histogram(
+            "http_request_queries",
+            "Database statements issued per HTTP request.",
+            ["method", "route"],
+            buckets=QUERY_BUCKETS,
+            registry=self.registry,
+        )
+        self.statement_duration = Histogram(
+            "db_statement_duration_seconds",
+            "Database statement execution time, by statement type.",
+            ["statement"],
+            buckets=STATEMENT_BUCKETS,
+            registry=self.registry,
+        )
+
+        self.write_batch_size = Histogram(
+            "db_write_batch_size",
+            "Writes committed per transaction in write-behind mode.",
+            buckets=BATCH_BUCKETS,
+            registry=self.registry,
+        )
+        self.write_queue_wait = Histogram(
+            "db_write_queue_wait_seconds",
+            "Time writes wait in the write-behind queue before their batch starts.",
+            buckets=STATEMENT_BUCKETS,
+            registry=self.registry,
+        )
+        self.write_queue_rejected = Counter(
+            "db_write_queue_rejected",
+            "Writes refused as the write-behind queue was full.",
+            registry=self.registry,
+        )
+
+    def register_cache(self, name: str, cache: CacheBackend) -> None:
+        self.registry.register(CacheCollector(name, cache))
+
+    def render(self) -> bytes:
+        """
+        The metrics in the Prometheus text exposition format.
+        """
+        return generate_latest(self.registry)
@@ -0,0 +1,51 @@
+import time
+
+from app.core.metrics import AppMetrics, request_queries
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, status, response size and database statement count of
+    every HTTP request, and the number of requests in flight.
+
+    Requests are labelled with the path template of the matched route, so that
+    `/parts/{part_id}` is one series, or "unmatched" when no route matched.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: AppMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code, size = 500, 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        queries = [0]
+        token = request_queries.set(queries)
+        self.metrics.requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            self.metrics.requests_in_flight.dec()
+            request_queries.reset(token)
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"))
+            self.metrics.requests.labels(*labels, str(status_code)).inc()
+            self.metrics.request_duration.labels(*labels).observe(duration)
+            self.metrics.response_size.labels(*labels).observe(size)
+            self.metrics.request_queries.labels(*labels).observe(queries[0])
@@ -0,0 +1,52 @@
+"""
+Precompute the OpenAPI schema of the app, to serve it from disk.
+
+The schema is written for the settings selected by the APP_ENV environment
+variable, and served by apps created with `OPENAPI_SCHEMA_PATH` set to the file.
+
+Usage:
+    python -m app.core.openapi openapi.json
+"""
+
+import argparse
+import json
+from typing import Any, Dict, List, Optional
+
+from app.core.config import get_app_settings
+from fastapi import FastAPI
+
+
+def use_schema_file(application: FastAPI, path: str) -> None:
+    """
+    Serve the OpenAPI schema read from `path` on first use, instead of generating
+    it from the routes.
+    """
+
+    def openapi() -> Dict[str, Any]:
+        if application.openapi_schema is None:
+            with open(path) as schema_file:
+                application.openapi_schema = json.load(schema_file)
+        return application.openapi_schema
+
+    application.openapi = openapi  # type: ignore[method-assign]
+
+
+def write_schema(application: FastAPI, path: str) -> None:
+    # Generated from the routes even when the app serves a schema file
+    schema = FastAPI.openapi(application)
+    with open(path, "w") as schema_file:
+        json.dump(schema, schema_file, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from app.main import create_application
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="File the schema is written to.")
+    args = parser.parse_args(argv)
+
+    write_schema(create_application(get_app_settings()), args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
 import logging
 import sys
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from app.core.logging import InterceptHandler
+from app.core.logging import (
+    AccessLogSampler,
+    InterceptHandler,
+    QueuedStream,
+    json_formatter,
+)
+from app.core.settings.base import BaseAppSettings
 from loguru import logger
-from pydantic_settings import BaseSettings
+from pydantic import Field, field_validator
+from sqlalchemy.engine import make_url
 
 
-class AppSettings(BaseSettings):
+class AppSettings(BaseAppSettings):
     """
     Base Application settings class.
     """
@@ -25,14 +32,161 @@ class AppSettings(BaseSettings):
 
     # Sqlite
     database_url: str
+    # Serve the CRUD endpoints from async handlers on an aiosqlite engine
+    async_db: bool = False
+
+    # Connection pool class, None keeps the SQLAlchemy default for the database. The
+    # size, overflow and timeout only apply to the "queue" pool.
+    db_pool_class: Optional[Literal["queue", "null", "static", "singleton"]] = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = -1
+
+    # SQLite pragmas set on every new connection, None keeps the SQLite default.
+    # WAL lets readers proceed while a writer holds the database.
+    sqlite_journal_mode: Optional[str] = "WAL"
+    sqlite_synchronous: Optional[str] = "NORMAL"
+    sqlite_mmap_size: Optional[int] = 256 * 1024 * 1024
+    # Negative values are in KiB, so -65536 is a 64 MiB page cache
+    sqlite_cache_size: Optional[int] = -65536
+    sqlite_busy_timeout: Optional[int] = 5000
+    sqlite_temp_store: Optional[str] = "MEMORY"
+    # Only applies to a new database file, see the `enable-incremental-vacuum`
+    # command of `app.db.commands` for an existing one
+    sqlite_auto_vacuum: Optional[str] = None
+
+    # In-process LRU cache of serialized parts read by ID, bounded by entry count
+    # and optionally by total payload size. The TTL in seconds bounds how long an
+    # entry missed by an invalidation can be served, None keeps entries until evicted.
+    part_cache_enabled: bool = True
+    part_cache_max_entries: int = 10_000
+    part_cache_max_bytes: Optional[int] = None
+    part_cache_ttl: Optional[float] = 300
+    # Cache of the most common words results, cleared on every part write. The TTL
+    # in seconds bounds how long it misses the writes of other worker processes.
+    word_count_cache_enabled: bool = True
+    word_count_cache_ttl: Optional[float] = None
+
+    # Upper bound for the number of parts returned by a single list request
+    max_page_size: int = 100
+    # Serialize part lists and write responses straight from selected rows, instead
+    # of hydrating ORM objects and validating them against the response model.
+    fast_serialization: bool = False
+    # Upper bound for the number of SKUs resolved by a single batch lookup
+    max_sku_batch_size: int = 100
+
+    # Number of rows written per transaction by the bulk endpoints
+    bulk_chunk_size: int = 500
+
+    # Number of rows read and serialized per chunk by the export endpoint
+    export_batch_size: int = 1000
+
+    # Most common words: read from the maintained index, or stream the descriptions
+    # in batches (optionally tokenized by a process pool) when it is disabled.
+    word_index_enabled: bool = True
+    word_count_batch_size: int = 1000
+    word_count_workers: int = 0
+
+    # Lower bounds of the weight histogram buckets of /parts/stats, the last bucket
+    # is open-ended. Weights are summarized in power of two ranges, so each bound is
+    # 0 or a power of two.
+    stats_weight_histogram_edges: List[int] = [0, 8, 16, 32, 64, 128, 256]
+
+    # Soft-delete mode: deleting a part marks it inactive, and every read leaves the
+    # inactive parts out. The parts deleted more than `purge_retention` seconds ago are
+    # removed in batches of `purge_batch_size`.
+    soft_delete: bool = False
+    purge_retention: float = 7 * 24 * 3600
+    purge_batch_size: int = Field(500, ge=1)
+    # Seconds a deletion is kept in the change log of /parts/changes, change feed
+    # tokens last in sync longer ago are rejected with 410 Gone
+    change_retention: float = 7 * 24 * 3600
+    # Every `purge_interval` seconds (None disables the job), a background job purges
+    # the soft-deleted parts and the expired deletions of the change log, followed
+    # by an incremental vacuum of `purge_vacuum_pages` pages at a time when the
+    # database uses `auto_vacuum = INCREMENTAL`.
+    purge_interval: Optional[float] = 3600
+    purge_vacuum_pages: int = Field(1000, ge=1)
+
+    # Write-behind mode: the create, update and delete of single parts are queued for
+    # one writer task, which commits them together, up to `write_batch_size` writes
+    # per transaction, waiting at most `write_batch_delay` seconds for a batch to
+    # fill. A write finding `write_queue_depth` writes queued is refused with 429.
+    write_behind: bool = False
+    write_batch_size: int = Field(64, ge=1)
+    write_batch_delay: float = Field(0.002, ge=0)
+    write_queue_depth: int = Field(1024, ge=1)
+
+    # Server started by `python -m app`. Every worker process builds its own app,
+    # engines and caches on startup, and is given `server_graceful_timeout` seconds
+    # to finish the requests in flight on shutdown.
+    server_host: str = "127.0.0.1"
+    server_port: int = 8000
+    server_workers: int = Field(1, ge=1)
+    server_graceful_timeout: int = 30
+
+    # OpenAPI schema precomputed by `python -m app.core.openapi`, served from this
+    # file instead of generated from the routes on the first docs request
+    openapi_schema_path: Optional[str] = None
+
+    # Prometheus metrics of the requests, database statements and part cache,
+    # served at /metrics
+    metrics_enabled: bool = True
 
     logging_level: int = logging.INFO
     loggers: Tuple[str, str] = ("uvicorn.asgi", "uvicorn.access")
+    # Write records from a background thread instead of the logging call site,
+    # see `app.core.logging.QueuedStream`
+    log_enqueue: bool = False
+    # Records waiting for the writer thread, further ones are dropped
+    log_queue_size: int = Field(10_000, ge=1)
+    # One JSON object per record instead of colored text
+    log_json: bool = False
+    # Module, function and line of every record, which costs a stack walk per
+    # standard library record
+    log_caller: bool = True
+    # Fraction of the uvicorn access log records kept, 5xx responses are always kept
+    access_log_sample_rate: float = Field(1.0, ge=0, le=1)
 
-    class Config:
+    class Config(BaseAppSettings.Config):
         validate_assignment = True
         env_nested_delimiter = "__"
 
+    @field_validator("stats_weight_histogram_edges")
+    @classmethod
+    def check_histogram_edges(cls, edges: List[int]) -> List[int]:
+        if any(edge < 0 or edge & (edge - 1) for edge in edges):
+            raise ValueError("Histogram edges must be 0 or powers of two.")
+        return edges
+
+    @property
+    def sqlite_pragmas(self) -> Dict[str, Any]:
+        """
+        SQLite pragmas to set on new connections.
+        """
+        pragmas = {
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "mmap_size": self.sqlite_mmap_size,
+            "cache_size": self.sqlite_cache_size,
+            "busy_timeout": self.sqlite_busy_timeout,
+            "temp_store": self.sqlite_temp_store,
+            "auto_vacuum": self.sqlite_auto_vacuum,
+        }
+        return {name: value for name, value in pragmas.items() if value is not None}
+
+    @property
+    def async_database_url(self) -> str:
+        """
+        Database URL using the aiosqlite driver, for the async engine.
+        """
+        return (
+            make_url(self.database_url)
+            .set(drivername="sqlite+aiosqlite")
+            .render_as_string(hide_password=False)
+        )
+
     @property
     def fastapi_kwargs(self) -> Dict[str, Any]:
         """
@@ -47,9 +201,24 @@ class AppSettings(BaseSettings):
         }
 
     def configure_logging(self) -> None:
-        logging.getLogger().handlers = [InterceptHandler()]
+        logging.getLogger().handlers = [InterceptHandler(caller=self.log_caller)]
         for logger_name in self.loggers:
             logging_logger = logging.getLogger(logger_name)
-            logging_logger.handlers = [InterceptHandler(level=self.logging_level)]
+            logging_logger.handlers = [
+                InterceptHandler(level=self.logging_level, caller=self.log_caller)
+            ]
+            logging_logger.filters = []
+        if self.access_log_sample_rate < 1:
+            logging.getLogger("uvicorn.access").addFilter(
+                AccessLogSampler(self.access_log_sample_rate)
+            )
 
-        logger.configure(handlers=[{"sink": sys.stderr, "level": self.logging_level}])
+        handler: Dict[str, Any] = {
+            "sink": (
+                QueuedStream(sys.stderr, self.log_queue_size) if self.log_enqueue else sys.stderr
+            ),
+            "level": self.logging_level,
+        }
+        if self.log_json:
+            handler.update(format=json_formatter(caller=self.log_caller), colorize=False)
+        logger.configure(handlers=[handler])
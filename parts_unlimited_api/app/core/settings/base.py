@@ -0,0 +1,21 @@
+from enum import Enum
+
+from pydantic_settings import BaseSettings
+
+
+class AppEnvTypes(Enum):
+    prod: str = "prod"
+    dev: str = "dev"
+    test: str = "test"
+
+
+class BaseAppSettings(BaseSettings):
+    """
+    Settings needed to pick the settings class, read from the APP_ENV variable.
+    """
+
+    app_env: AppEnvTypes = AppEnvTypes.dev
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
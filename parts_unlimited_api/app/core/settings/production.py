@@ -0,0 +1,28 @@
+import logging
+from typing import Literal, Optional
+
+from app.core.settings.app import AppSettings
+
+
+class ProdAppSettings(AppSettings):
+    """
+    Production Application settings class.
+    """
+
+    debug: bool = False
+
+    server_host: str = "0.0.0.0"
+
+    logging_level: int = logging.INFO
+    log_enqueue: bool = True
+    log_json: bool = True
+    log_caller: bool = False
+
+    db_pool_class: Optional[Literal["queue", "null", "static", "singleton"]] = "queue"
+    db_pool_size: int = 20
+    db_max_overflow: int = 20
+    # New databases release the pages freed by the purge of soft-deleted parts
+    sqlite_auto_vacuum: Optional[str] = "INCREMENTAL"
+
+    class Config(AppSettings.Config):
+        env_file = "prod.env"
@@ -0,0 +1,97 @@
+"""
+Maintenance commands for the parts database.
+
+Usage:
+    python -m app.db.commands rebuild-word-counts
+    python -m app.db.commands rebuild-search-index
+    python -m app.db.commands rebuild-part-stats
+    python -m app.db.commands purge-deleted-parts
+    python -m app.db.commands compact-part-changes
+    python -m app.db.commands enable-incremental-vacuum
+"""
+
+import argparse
+from typing import Callable, Dict, List, Optional
+
+from app.api import utils
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+from app.db.events import create_db_engine
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+
+def rebuild_word_counts(db: Session, settings: AppSettings) -> None:
+    words = utils.rebuild_word_counts(
+        db, batch_size=settings.word_count_batch_size, workers=settings.word_count_workers
+    )
+    logger.info(f"Word count index rebuilt with {words} distinct words.")
+
+
+def rebuild_search_index(db: Session, settings: AppSettings) -> None:
+    utils.rebuild_search_index(db)
+    logger.info("Full-text search index rebuilt.")
+
+
+def rebuild_part_stats(db: Session, settings: AppSettings) -> None:
+    rows = utils.rebuild_part_stats(db)
+    logger.info(f"Catalog statistics rebuilt with {rows} rows.")
+
+
+def purge_deleted_parts(db: Session, settings: AppSettings) -> None:
+    from app.db.purge import purge_deleted_parts
+
+    purged, pages = purge_deleted_parts(db, settings)
+    logger.info(f"Purged {purged} deleted parts, released {pages} pages.")
+
+
+def compact_part_changes(db: Session, settings: AppSettings) -> None:
+    from app.db.purge import compact_part_changes
+
+    compacted = compact_part_changes(db, settings)
+    logger.info(f"Removed {compacted} expired change log entries.")
+
+
+def enable_incremental_vacuum(db: Session, settings: AppSettings) -> None:
+    # Changing auto_vacuum from NONE only applies once the file is rebuilt by VACUUM,
+    # which needs the app stopped: open connections keep the mode they started with
+    connection = db.connection()
+    connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+    connection.exec_driver_sql("VACUUM")
+    mode = db.execute(text("PRAGMA auto_vacuum")).scalar()
+    logger.info(f"Database rebuilt with auto_vacuum = {mode}.")
+
+
+COMMANDS: Dict[str, Callable[[Session, AppSettings], None]] = {
+    "compact-part-changes": compact_part_changes,
+    "enable-incremental-vacuum": enable_incremental_vacuum,
+    "purge-deleted-parts": purge_deleted_parts,
+    "rebuild-part-stats": rebuild_part_stats,
+    "rebuild-search-index": rebuild_search_index,
+    "rebuild-word-counts": rebuild_word_counts,
+}
+
+
+def run(command: str, settings: AppSettings) -> None:
+    engine = create_db_engine(settings)
+    session_local = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    try:
+        with session_local() as session:
+            COMMANDS[command](session, settings)
+    finally:
+        engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parts database maintenance commands.")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+
+    settings = get_app_settings()
+    settings.configure_logging()
+    run(args.command, settings)
+
+
+if __name__ == "__main__":
+    main()
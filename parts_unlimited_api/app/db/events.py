@@ -1,18 +1,121 @@
+import time
+from typing import TYPE_CHECKING, Any, Dict
+
 from app.core.settings.app import AppSettings
 from fastapi import FastAPI
 from loguru import logger
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    NullPool,
+    QueuePool,
+    SingletonThreadPool,
+    StaticPool,
+)
+
+if TYPE_CHECKING:
+    from app.core.metrics import AppMetrics
+
+POOL_CLASSES = {
+    "queue": QueuePool,
+    "null": NullPool,
+    "static": StaticPool,
+    "singleton": SingletonThreadPool,
+}
+
+
+def get_engine_kwargs(settings: AppSettings, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build the `create_engine` pool arguments from the settings.
+    """
+    # echo=True show generated SQL queries in the console
+    kwargs: Dict[str, Any] = {"echo": settings.debug, "pool_recycle": settings.db_pool_recycle}
+    if settings.db_pool_class is not None:
+        pool_class = POOL_CLASSES[settings.db_pool_class]
+        if is_async and pool_class is QueuePool:
+            pool_class = AsyncAdaptedQueuePool
+        kwargs["poolclass"] = pool_class
+    if settings.db_pool_class == "queue":
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return kwargs
+
+
+def set_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Run the given `PRAGMA name = value` statements on every new connection.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def instrument_engine(engine: Engine, metrics: "AppMetrics") -> None:
+    """
+    Record the duration of every statement, and count it for the current request.
+    """
+    from app.core.metrics import request_queries
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_statement(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        duration = time.perf_counter() - conn.info["statement_started"].pop()
+        metrics.statement_duration.labels(statement.split(None, 1)[0].upper()).observe(duration)
+        queries = request_queries.get()
+        if queries is not None:
+            queries[0] += 1
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(context: Any) -> None:
+        # Failed statements never reach after_cursor_execute
+        started = context.connection.info.get("statement_started") if context.connection else None
+        if started:
+            started.pop()
+
+
+def create_db_engine(settings: AppSettings) -> Engine:
+    engine = create_engine(settings.database_url, **get_engine_kwargs(settings))
+    set_sqlite_pragmas(engine, settings.sqlite_pragmas)
+    return engine
 
 
 async def connect_to_db(app: FastAPI, settings: AppSettings) -> None:
     logger.info("Connecting to DB...")
 
-    # echo=True show generated SQL queries in the console
-    engine = create_engine(settings.database_url, echo=settings.debug)
+    engine = create_db_engine(settings)
+    if app.state.metrics is not None:
+        instrument_engine(engine, app.state.metrics)
     app.state.engine = engine
     app.state.session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+    if settings.async_db:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        async_engine = create_async_engine(
+            settings.async_database_url, **get_engine_kwargs(settings, is_async=True)
+        )
+        set_sqlite_pragmas(async_engine.sync_engine, settings.sqlite_pragmas)
+        if app.state.metrics is not None:
+            instrument_engine(async_engine.sync_engine, app.state.metrics)
+        app.state.async_engine = async_engine
+        app.state.async_session = async_sessionmaker(
+            bind=async_engine, autocommit=False, autoflush=False
+        )
+
     logger.info("Connection established.")
 
 
@@ -20,5 +123,7 @@ async def close_db_connection(app: FastAPI) -> None:
     logger.info("Closing connection to database...")
 
     app.state.engine.dispose()
+    if hasattr(app.state, "async_engine"):
+        await app.state.async_engine.dispose()
 
     logger.info("Connection closed.")
@@ -0,0 +1,75 @@
+from logging.config import fileConfig
+from typing import Any, Optional
+
+from alembic import context
+from app.core.config import get_app_settings
+from app.models.base import Base
+from sqlalchemy import engine_from_config, pool
+from sqlalchemy.engine import Connection
+
+config = context.config
+
+# A connection handed in by the caller, e.g. the tests, is migrated as is
+connection = config.attributes.get("connection")
+
+if config.config_file_name is not None and connection is None:
+    fileConfig(config.config_file_name)
+
+# Otherwise migrate the database the app is configured with, from the APP_ENV settings
+if connection is None:
+    config.set_main_option("sqlalchemy.url", get_app_settings().database_url)
+
+target_metadata = Base.metadata
+
+
+def include_name(name: Optional[str], type_: str, parent_names: Any) -> bool:
+    # The full-text index and its shadow tables are created by the migrations
+    # themselves, they are not in the models metadata.
+    return not (type_ == "table" and name is not None and name.startswith("part_fts"))
+
+
+def run_migrations_offline() -> None:
+    """
+    Emit the migrations as SQL, without connecting to the database.
+    """
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online(connection: Connection) -> None:
+    """
+    Run the migrations on a connection to the database.
+    """
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite alters tables by copying them
+        render_as_batch=True,
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+elif connection is not None:
+    run_migrations_online(connection)
+else:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as engine_connection:
+        run_migrations_online(engine_connection)
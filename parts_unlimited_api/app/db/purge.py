@@ -0,0 +1,91 @@
+"""
+Background purge of the soft-deleted parts and of the expired change log entries.
+
+Every `purge_interval` seconds, the deletions recorded in the change log more than
+`change_retention` seconds ago are compacted away and, in soft-delete mode, the
+parts deleted more than `purge_retention` seconds ago are removed, both in short
+batches. The freed pages are then returned to the file system by an incremental
+vacuum. The work runs in a worker thread, so the
+event loop keeps serving requests, and a batch in progress is finished on shutdown.
+"""
+
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+from typing import Tuple
+
+import anyio
+from app.api import utils
+from app.core.settings.app import AppSettings
+from app.models.base_class import utcnow
+from fastapi import FastAPI
+from loguru import logger
+from sqlalchemy.orm import Session, sessionmaker
+
+# Seconds between two purge batches, to let the waiting writers take the lock
+PURGE_BATCH_PAUSE = 0.01
+
+
+def purge_deleted_parts(db: Session, settings: AppSettings) -> Tuple[int, int]:
+    """
+    Purge the parts deleted more than `purge_retention` seconds ago.
+
+    Returns:
+        Tuple[int, int]: The number of parts removed and of pages released.
+    """
+    deleted_before = utcnow() - timedelta(seconds=settings.purge_retention)
+    purged = utils.purge_deleted_parts(
+        db, deleted_before, batch_size=settings.purge_batch_size, pause=PURGE_BATCH_PAUSE
+    )
+    pages = utils.incremental_vacuum(db, pages=settings.purge_vacuum_pages)
+    return purged, pages
+
+
+def compact_part_changes(db: Session, settings: AppSettings) -> int:
+    """
+    Remove the deletions recorded in the change log more than `change_retention`
+    seconds ago.
+
+    Returns:
+        int: The number of change log entries removed.
+    """
+    deleted_before = utcnow() - timedelta(seconds=settings.change_retention)
+    return utils.compact_part_changes(db, deleted_before, batch_size=settings.purge_batch_size)
+
+
+def _purge(session_local: sessionmaker, settings: AppSettings) -> Tuple[int, int, int]:
+    with session_local() as db:
+        compacted = compact_part_changes(db, settings)
+        if settings.soft_delete:
+            purged, pages = purge_deleted_parts(db, settings)
+        else:
+            purged, pages = 0, utils.incremental_vacuum(db, pages=settings.purge_vacuum_pages)
+        return purged, compacted, pages
+
+
+async def run_purge_job(app: FastAPI, settings: AppSettings) -> None:
+    while True:
+        await asyncio.sleep(settings.purge_interval)
+        try:
+            purged, compacted, pages = await anyio.to_thread.run_sync(
+                _purge, app.state.session, settings
+            )
+        except Exception:
+            logger.exception("Purge of deleted parts failed.")
+            continue
+        if purged or compacted or pages:
+            logger.info(
+                f"Purged {purged} deleted parts and {compacted} change log entries, "
+                f"released {pages} pages."
+            )
+
+
+def start_purge_job(app: FastAPI, settings: AppSettings) -> None:
+    app.state.purge_task = asyncio.get_running_loop().create_task(run_purge_job(app, settings))
+
+
+async def stop_purge_job(app: FastAPI) -> None:
+    # Waits for a purge in progress, the worker thread cannot be interrupted
+    app.state.purge_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.purge_task
@@ -0,0 +1,216 @@
+"""
+Write-behind mode: the part writes of the API are committed in groups by a single
+writer task, instead of one transaction per request.
+
+Writes are queued with the helper of `app.api.utils` to run, and the writer takes
+them a batch at a time: up to `write_batch_size` writes, or those queued within
+`write_batch_delay` seconds of the first one. A batch runs in a worker thread, in
+one `BEGIN IMMEDIATE` transaction with a savepoint per write, so a failing write
+only rolls back its own changes, and is committed once. Each caller awaits the
+result of its own write, available once its batch is committed. The queue holds
+at most `write_queue_depth` writes, a write finding it full is refused.
+"""
+
+import asyncio
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import anyio
+from app.api import utils
+from app.core.settings.app import AppSettings
+from fastapi import FastAPI
+from loguru import logger
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+
+if TYPE_CHECKING:
+    from app.core.metrics import AppMetrics
+
+
+class WriteQueueFullError(Exception):
+    """
+    Raised when a write is submitted while the write queue is full.
+    """
+
+
+class BatchSession(Session):
+    """
+    Session of a write batch.
+
+    The helpers of `app.api.utils` commit or roll back their own work, which here
+    releases or rolls back the savepoint of the current write instead, the writer
+    commits the batch once all its writes ran.
+    """
+
+    savepoint: Optional[SessionTransaction] = None
+
+    def commit(self) -> None:
+        if self.savepoint is None:
+            return super().commit()
+        self.savepoint.commit()
+        self.savepoint = self.begin_nested()
+
+    def rollback(self) -> None:
+        if self.savepoint is None:
+            return super().rollback()
+        self.savepoint.rollback()
+        self.savepoint = self.begin_nested()
+
+
+@dataclass
+class _Write:
+    write: Callable[..., Any]
+    kwargs: Dict[str, Any]
+    future: "asyncio.Future[Any]"
+    queued_at: float = field(default_factory=time.perf_counter)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class WriteQueue:
+    """
+    Queue of the part writes, drained by a single writer task.
+
+    Args:
+        engine (Engine): Engine of the database to write to.
+        batch_size (int): Maximum number of writes committed together.
+        batch_delay (float): Seconds the writer waits for a batch to fill.
+        max_depth (int): Maximum number of queued writes.
+        metrics (AppMetrics, optional): Metrics recording the batch sizes and the
+        time writes wait in the queue.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 64,
+        batch_delay: float = 0.002,
+        max_depth: int = 1024,
+        metrics: Optional["AppMetrics"] = None,
+    ) -> None:
+        self.session_local = sessionmaker(bind=engine, class_=BatchSession, autoflush=False)
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.metrics = metrics
+        self.queue: "asyncio.Queue[_Write]" = asyncio.Queue(maxsize=max_depth)
+        self.batch_full = asyncio.Event()
+        self.task: Optional["asyncio.Task[None]"] = None
+        # The sync endpoints wait for their write in threads of the default limiter,
+        # the writer thread must not queue behind them
+        self.limiter = anyio.CapacityLimiter(1)
+
+    def start(self) -> None:
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        # Commits the writes still queued first
+        await self.queue.join()
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+
+    async def submit(self, write: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Queue `write(db, **kwargs)`, a write helper of `app.api.utils`, and wait for
+        the commit of its batch.
+
+        Returns:
+            Any: The result of `write`.
+
+        Raises:
+            WriteQueueFullError: If `max_depth` writes are already queued.
+            Exception: Any exception raised by `write`, or by the commit of its batch.
+        """
+        item = _Write(write, kwargs, asyncio.get_running_loop().create_future())
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.metrics is not None:
+                self.metrics.write_queue_rejected.inc()
+            raise WriteQueueFullError("Too many writes in progress, try again later.")
+        # The writer holds the first write of the next batch
+        if self.queue.qsize() >= self.batch_size - 1:
+            self.batch_full.set()
+        return await item.future
+
+    async def next_batch(self) -> List[_Write]:
+        batch = [await self.queue.get()]
+        if self.queue.qsize() < self.batch_size - 1 and self.batch_delay > 0:
+            self.batch_full.clear()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.batch_full.wait(), self.batch_delay)
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def run(self) -> None:
+        while True:
+            batch = await self.next_batch()
+            if self.metrics is not None:
+                started = time.perf_counter()
+                self.metrics.write_batch_size.observe(len(batch))
+                for item in batch:
+                    self.metrics.write_queue_wait.observe(started - item.queued_at)
+            try:
+                await anyio.to_thread.run_sync(self.write_batch, batch, limiter=self.limiter)
+            except Exception as e:
+                logger.exception("Write batch failed.")
+                for item in batch:
+                    item.error = item.error or e
+            for item in batch:
+                # The caller may have gone away, e.g. on a client disconnect
+                if not item.future.done():
+                    if item.error is not None:
+                        item.future.set_exception(item.error)
+                    else:
+                        item.future.set_result(item.result)
+                self.queue.task_done()
+
+    def write_batch(self, batch: List[_Write]) -> None:
+        """
+        Run the writes of `batch` in a single transaction, and store their result or
+        error on them.
+        """
+        with self.session_local() as db:
+            # Take the write lock upfront, so a write never fails to upgrade a read
+            # transaction, and give the savepoints an enclosing transaction
+            db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+            for item in batch:
+                db.savepoint = db.begin_nested()
+                try:
+                    item.result = item.write(db, **item.kwargs)
+                except Exception as e:
+                    item.error = e
+                    db.savepoint.rollback()
+                else:
+                    db.savepoint.commit()
+                finally:
+                    db.savepoint = None
+            try:
+                db.commit()
+            except Exception as e:
+                for item in batch:
+                    item.error = item.error or e
+            finally:
+                # A request may have cached the old results before the batch committed.
+                # The part cache refuses the old versions through its tombstones.
+                utils.invalidate_word_count_cache()
+
+
+def start_write_queue(app: FastAPI, settings: AppSettings) -> None:
+    app.state.write_queue = WriteQueue(
+        app.state.engine,
+        batch_size=settings.write_batch_size,
+        batch_delay=settings.write_batch_delay,
+        max_depth=settings.write_queue_depth,
+        metrics=app.state.metrics,
+    )
+    app.state.write_queue.start()
+
+
+async def stop_write_queue(app: FastAPI) -> None:
+    await app.state.write_queue.stop()
+    app.state.write_queue = None
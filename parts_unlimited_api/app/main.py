@@ -1,22 +1,67 @@
+from typing import Optional
+
+from app.core.cache import LRUCache
+from app.core.config import get_app_settings
 from app.core.events import create_start_app_handler, create_stop_app_handler
-from app.core.settings.development import DevAppSettings
-from app.routers.parts import part_router
+from app.core.settings.app import AppSettings
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from starlette.middleware.cors import CORSMiddleware
 
 
-def create_application() -> FastAPI:
+def create_application(settings: Optional[AppSettings] = None) -> FastAPI:
     """
     Creates and initializes FastAPI application.
+
+    This is the only entry point, nothing is built at import time. The routers,
+    and the async and metrics support, are imported when the settings need them.
     """
-    settings = DevAppSettings()
+    settings = settings or get_app_settings()
     settings.configure_logging()
 
     application = FastAPI(**settings.fastapi_kwargs)
+    application.state.settings = settings
+    # Any CacheBackend can replace the in-process cache, e.g. to share it across workers
+    application.state.part_cache = (
+        LRUCache(
+            max_entries=settings.part_cache_max_entries,
+            max_bytes=settings.part_cache_max_bytes,
+            ttl=settings.part_cache_ttl,
+        )
+        if settings.part_cache_enabled
+        else None
+    )
+    from app.api import utils
+
+    utils.configure_word_count_cache(
+        settings.word_count_cache_enabled, settings.word_count_cache_ttl
+    )
+    application.state.metrics = None
+    # Started with the database connection in write-behind mode
+    application.state.write_queue = None
+    if settings.metrics_enabled:
+        from app.core.metrics import AppMetrics
+
+        application.state.metrics = AppMetrics()
+        if application.state.part_cache is not None:
+            application.state.metrics.register_cache("part_cache", application.state.part_cache)
 
     # Include routers
+    if settings.async_db:
+        from app.routers.parts_async import async_part_router as part_router
+    else:
+        from app.routers.parts import part_router
     application.include_router(part_router, prefix=settings.api_v1_prefix)
+    if settings.metrics_enabled:
+        from app.routers.metrics import metrics_router
+
+        application.include_router(metrics_router)
+    application.get("/")(read_root)
+
+    if settings.openapi_schema_path is not None:
+        from app.core.openapi import use_schema_file
+
+        use_schema_file(application, settings.openapi_schema_path)
 
     # Configure middleware
     application.add_middleware(
@@ -26,6 +71,10 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if application.state.metrics is not None:
+        from app.core.middleware import MetricsMiddleware
+
+        application.add_middleware(MetricsMiddleware, metrics=application.state.metrics)
 
     # Event handlers for startup and shutdown
     application.add_event_handler(
@@ -39,10 +88,6 @@ def create_application() -> FastAPI:
     return application
 
 
-app = create_application()
-
-
-@app.get("/")
 def read_root() -> RedirectResponse:
     """
     Redirects to the Swagger documentation page.
@@ -1,3 +1,6 @@
 # Import all the models, so that Base has them before being imported by Alembic
 from app.models.base_class import Base  # noqa
+from app.models.part_changes import PartChange  # noqa
+from app.models.part_stats import PartStat  # noqa
 from app.models.parts import Part  # noqa
+from app.models.word_counts import WordCount  # noqa
@@ -1,14 +1,41 @@
-from typing import Any, Dict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, ClassVar, Dict
 
-from sqlalchemy import Boolean, Column, Integer
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    Table,
+    literal_column,
+)
 from sqlalchemy.orm import as_declarative, declared_attr
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 @as_declarative()
 class Base:
     __name__: str
+    if TYPE_CHECKING:
+        # Set by as_declarative, declared for the type checker
+        __table__: ClassVar[Table]
+        metadata: ClassVar[MetaData]
+
     id = Column(Integer, primary_key=True, index=True)
     is_active = Column(Boolean, default=True)
+    # Bumped by every UPDATE statement, including bulk ones, to derive ETags from
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column("version + 1"),
+    )
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, onupdate=utcnow)
 
     # Generate __tablename__ automatically
     @declared_attr
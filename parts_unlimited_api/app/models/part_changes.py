@@ -0,0 +1,24 @@
+from app.models.base_class import Base
+from sqlalchemy import Boolean, Column, Index, Integer, text
+
+
+class PartChange(Base):
+    """
+    Change log of the parts, read by the change feed of incremental syncs.
+
+    The inherited `id` is the change sequence and `updated_at` the time of the
+    change. Every write moves its parts to the end of the log, replacing their
+    previous entry, so the log holds the last change of each part and a sync reads
+    every part changed since its token once. AUTOINCREMENT keeps the sequence
+    increasing even when the last entries are removed.
+    """
+
+    part_id = Column(Integer, nullable=False, unique=True)
+    deleted = Column(Boolean, nullable=False, default=False)
+
+    # Deletions expire after the retention of the change log (see
+    # app.api.utils.compact_part_changes), the entries of existing parts are kept.
+    __table_args__ = (
+        Index("ix_partchange_deleted_updated_at", "updated_at", sqlite_where=text("deleted = 1")),
+        {"sqlite_autoincrement": True},
+    )
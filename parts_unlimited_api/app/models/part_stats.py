@@ -0,0 +1,24 @@
+from app.models.base_class import Base
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+
+
+class PartStat(Base):
+    """
+    Catalog statistics summary: the number of parts whose value of a metric falls in
+    the range starting at `value`, for active and inactive parts separately (in the
+    inherited `is_active`), with the sum and bounds of their values.
+
+    Metrics are listed in `app.api.utils.PART_STAT_METRICS`, and their ranges given
+    by `app.api.utils.part_stat_range`: one value per row for description lengths,
+    which the column length bounds, and power of two ranges for weights. The table
+    stays small whatever the size of the catalog or its weights.
+    """
+
+    metric = Column(String(30), nullable=False)
+    value = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    min_value = Column(Integer)
+    max_value = Column(Integer)
+
+    __table_args__ = (UniqueConstraint("metric", "is_active", "value"),)
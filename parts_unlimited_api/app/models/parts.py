@@ -1,8 +1,14 @@
 from app.models.base_class import Base
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import DDL, Column, Index, Integer, String, column, event, table, text
 from sqlalchemy.orm import validates
 
 
+def check_weight_ounces(value: int) -> int:
+    if value < 0:
+        raise ValueError("Weight must be non-negative.")
+    return value
+
+
 class Part(Base):
 
     name = Column(String(150), nullable=False)
@@ -10,8 +16,38 @@ class Part(Base):
     description = Column(String(1024))
     weight_ounces = Column(Integer)
 
+    # Back the filters and sort orders of the parts list (see app.api.utils.PART_SORTS).
+    # Under an `is_active = 1` filter, the default of the list in soft-delete mode,
+    # the sort orders are served by partial indexes leaving the inactive parts out,
+    # and the purge of soft-deleted parts by an index of the inactive ones alone.
+    # Index entries end with the ID, so equal keys come out in ID order as the
+    # keyset pagination expects.
+    __table_args__ = (
+        Index("ix_part_weight_ounces", "weight_ounces"),
+        Index("ix_part_name", "name"),
+        Index("ix_part_updated_at", "updated_at"),
+        Index("ix_part_active_id", "id", sqlite_where=text("is_active = 1")),
+        Index("ix_part_active_weight_ounces", "weight_ounces", sqlite_where=text("is_active = 1")),
+        Index("ix_part_active_name", "name", sqlite_where=text("is_active = 1")),
+        Index("ix_part_active_sku", "sku", sqlite_where=text("is_active = 1")),
+        Index("ix_part_active_updated_at", "updated_at", sqlite_where=text("is_active = 1")),
+        Index("ix_part_inactive_id", "id", sqlite_where=text("is_active = 0")),
+        Index("ix_part_inactive_updated_at", "updated_at", sqlite_where=text("is_active = 0")),
+    )
+
     @validates("weight_ounces")
     def validate_weight_ounces(self, key: str, value: int) -> int:
-        if value < 0:
-            raise ValueError("Weight must be non-negative.")
-        return value
+        return check_weight_ounces(value)
+
+
+# Full-text index over name and description. It is an external content FTS5 table
+# reading the text from `part`, kept in sync by the write helpers in app.api.utils.
+part_fts = table("part_fts", column("rowid"), column("name"), column("description"))
+create_part_fts = DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS part_fts "
+    "USING fts5(name, description, content='part', content_rowid='id')"
+)
+drop_part_fts = DDL("DROP TABLE IF EXISTS part_fts")
+
+event.listen(Part.__table__, "after_create", create_part_fts.execute_if(dialect="sqlite"))
+event.listen(Part.__table__, "before_drop", drop_part_fts.execute_if(dialect="sqlite"))
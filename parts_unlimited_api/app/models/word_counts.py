@@ -0,0 +1,8 @@
+from app.models.base_class import Base
+from sqlalchemy import Column, Integer, String
+
+
+class WordCount(Base):
+
+    word = Column(String(1024), nullable=False, unique=True, index=True)
+    count = Column(Integer, nullable=False, default=0, index=True)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+def read_metrics(request: Request) -> Response:
+    """
+    Prometheus scrape endpoint.
+    """
+    return Response(content=request.app.state.metrics.render(), media_type=CONTENT_TYPE_LATEST)
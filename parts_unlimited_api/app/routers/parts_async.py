@@ -0,0 +1,32 @@
+from app.api.api_v1.endpoints import parts, parts_async
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+
+# With `async_db` enabled the CRUD endpoints are served by their async versions,
+# every other endpoint keeps its sync handler. The sync-only routes go first so
+# that the async `/{part_id}` catch-all is still matched last.
+_async_paths = {
+    (route.path, method)
+    for route in parts_async.router.routes
+    if isinstance(route, APIRoute)
+    for method in route.methods
+}
+_sync_only_router = APIRouter()
+_sync_only_router.routes.extend(
+    route
+    for route in parts.router.routes
+    if isinstance(route, APIRoute)
+    and not any((route.path, method) in _async_paths for method in route.methods)
+)
+
+async_part_router = APIRouter()
+async_part_router.include_router(
+    _sync_only_router,
+    prefix="/parts",
+    tags=["parts"],
+)
+async_part_router.include_router(
+    parts_async.router,
+    prefix="/parts",
+    tags=["parts"],
+)
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Any, List, Literal
+
+from pydantic import BaseModel, RootModel, field_validator
 
 
 class PartBase(BaseModel):
@@ -14,3 +16,95 @@ class Part(PartBase):
 
     class Config:
         from_attributes = True
+
+
+# Sort orders of the parts list, a leading "-" sorts in descending order
+PartSort = Literal[
+    "id",
+    "-id",
+    "name",
+    "-name",
+    "sku",
+    "-sku",
+    "weight_ounces",
+    "-weight_ounces",
+    "updated_at",
+    "-updated_at",
+]
+
+
+class PartFilter(BaseModel):
+    is_active: bool | None = None
+    min_weight: int | None = None
+    max_weight: int | None = None
+    name_prefix: str | None = None
+    sku_prefix: str | None = None
+    sort: PartSort = "id"
+
+
+class PartPatch(BaseModel):
+    name: str | None = None
+    sku: str | None = None
+    description: str | None = None
+    weight_ounces: int | None = None
+    is_active: bool | None = None
+
+    @field_validator("name", "sku", "weight_ounces", "is_active")
+    @classmethod
+    def check_not_null(cls, value: Any) -> Any:
+        # Leaving a field out keeps its value, only the description can be cleared
+        if value is None:
+            raise ValueError("Field may not be null.")
+        return value
+
+
+class PartBulkUpdate(PartBase):
+    id: int
+
+
+class PartId(RootModel[int]):
+    root: int
+
+
+class PartBulkResult(BaseModel):
+    index: int
+    id: int | None = None
+    status: Literal["created", "updated", "deleted", "error"]
+    detail: str | None = None
+
+
+class ValueStats(BaseModel):
+    count: int
+    min: int | None = None
+    max: int | None = None
+    mean: float | None = None
+
+
+class HistogramBucket(BaseModel):
+    # Values from `lower` included to `upper` excluded, None for the last bucket
+    lower: int
+    upper: int | None = None
+    count: int
+
+
+class PartStats(BaseModel):
+    active: int
+    inactive: int
+    weight_ounces: ValueStats
+    weight_histogram: List[HistogramBucket]
+    description_length: ValueStats
+
+
+class PartChange(BaseModel):
+    seq: int
+    id: int
+    deleted: bool
+    # The current part, None when it was deleted
+    part: Part | None = None
+
+
+class PartChanges(BaseModel):
+    changes: List[PartChange]
+    # Token of the next request, to pass as `since`
+    next: str
+    has_more: bool
@@ -4,9 +4,10 @@ import pytest
 from app.api.deps import get_db
 from app.core.settings.app import AppSettings
 from app.core.settings.test import TestAppSettings
-from app.main import app
+from app.main import create_application
 from app.models.base import Base
 from app.schemas.parts import Part
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
@@ -18,6 +19,11 @@ def settings() -> AppSettings:
     return TestAppSettings()
 
 
+@pytest.fixture(scope="session")
+def app(settings: TestAppSettings) -> FastAPI:
+    return create_application(settings)
+
+
 @pytest.fixture(scope="session")
 def db_engine(settings: TestAppSettings) -> Engine:
     engine = create_engine(settings.database_url)
@@ -39,7 +45,7 @@ def db_session(db_engine: Engine) -> Session:
 
 
 @pytest.fixture
-def client(db_session: Session) -> TestClient:
+def client(app: FastAPI, db_session: Session) -> TestClient:
     # Override the get_db dependency to use the test database session
     def _get_test_db() -> Session:
         yield db_session
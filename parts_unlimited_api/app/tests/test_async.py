@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from app.core.settings.app import AppSettings
+from app.main import create_application
+from app.models.base import Base
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+
+@pytest.mark.parametrize("fast_serialization", [False, True])
+def test_async_crud_flow(tmp_path: Path, settings: AppSettings, fast_serialization: bool) -> None:
+    settings = settings.model_copy(
+        update={
+            "database_url": f"sqlite:///{tmp_path}/async.db",
+            "async_db": True,
+            "fast_serialization": fast_serialization,
+        }
+    )
+    engine = create_engine(settings.database_url)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    engine.dispose()
+    parts_url = f"{settings.api_v1_prefix}/parts"
+
+    with TestClient(create_application(settings)) as client:
+        response = client.post(
+            f"{parts_url}/create/",
+            json={
+                "name": "Async",
+                "sku": "ASYNC1",
+                "description": "async part",
+                "weight_ounces": 3,
+            },
+        )
+        assert response.status_code == 200
+        part_id = response.json()["id"]
+
+        response = client.post(
+            f"{parts_url}/create/",
+            json={"name": "Bad", "sku": "ASYNC2", "weight_ounces": -3},
+        )
+        assert response.status_code == 400
+        response = client.post(
+            f"{parts_url}/create/",
+            json={"name": "Twin", "sku": "ASYNC1", "weight_ounces": 3},
+        )
+        assert response.status_code == 409
+
+        response = client.get(f"{parts_url}/{part_id}")
+        assert response.status_code == 200
+        assert response.json()["sku"] == "ASYNC1"
+        etag = response.headers["ETag"]
+        response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        # Uncached, the version alone answers the precondition
+        client.app.state.part_cache.clear()  # type: ignore
+        response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": '"other"'})
+        assert response.status_code == 200
+        assert response.headers["ETag"] == etag
+
+        response = client.put(
+            f"{parts_url}/update/{part_id}",
+            json={"name": "Async", "sku": "ASYNC1", "description": "updated", "weight_ounces": 4},
+        )
+        assert response.status_code == 200
+        assert response.json()["description"] == "updated"
+
+        response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+        response = client.patch(
+            f"{parts_url}/update/{part_id}", json={"weight_ounces": 5}, headers={"If-Match": etag}
+        )
+        assert response.status_code == 412
+        etag = client.get(f"{parts_url}/{part_id}").headers["ETag"]
+        response = client.patch(
+            f"{parts_url}/update/{part_id}", json={"weight_ounces": 5}, headers={"If-Match": etag}
+        )
+        assert response.json()["weight_ounces"] == 5
+
+        response = client.get(f"{parts_url}/list/", params={"limit": 1})
+        assert [part["id"] for part in response.json()] == [part_id]
+        assert "X-Next-Cursor" in response.headers
+        response = client.get(
+            f"{parts_url}/list/",
+            params={"limit": 1},
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 304
+        params: Dict[str, Any] = {"min_weight": 5, "max_weight": 5, "sort": "-name", "limit": 1}
+        response = client.get(f"{parts_url}/list/", params=params)
+        assert [part["id"] for part in response.json()] == [part_id]
+        cursor = response.headers["X-Next-Cursor"]
+        response = client.get(f"{parts_url}/list/", params={**params, "cursor": cursor})
+        assert response.json() == []
+
+        # Endpoints without an async version keep working through their sync handler.
+        response = client.get(f"{parts_url}/most_common_words/")
+        assert response.json() == [{"word": "updated", "count": 1}]
+
+        response = client.delete(f"{parts_url}/delete/{part_id}")
+        assert response.status_code == 200
+        response = client.get(f"{parts_url}/{part_id}")
+        assert response.status_code == 404
+
+        # The async writes are recorded in the change feed as well
+        changes = client.get(f"{parts_url}/changes").json()["changes"]
+        assert [(change["id"], change["deleted"]) for change in changes] == [(part_id, True)]
@@ -0,0 +1,72 @@
+import asyncio
+from pathlib import Path
+from typing import List, Tuple
+
+from benchmarks.common import benchmark_settings, build_app, running, seed_catalog
+from benchmarks.query_plans import full_scans, list_query_plans
+from benchmarks.startup import parse_importtime
+from benchmarks.suite import RunState, compare, parse_setting, read_changes
+from sqlalchemy.orm import Session
+
+
+def test_compare_flags_regressions_past_the_threshold() -> None:
+    baseline = {
+        "scenarios": {
+            "read_part": {"throughput_rps": 100.0, "p50_ms": 10.0, "p99_ms": 20.0},
+            "search": {"throughput_rps": 50.0},
+        }
+    }
+    current = {
+        "scenarios": {
+            "read_part": {"throughput_rps": 85.0, "p50_ms": 13.0, "p99_ms": 10.0},
+            "search": {"throughput_rps": 20.0},
+            "new_scenario": {"throughput_rps": 1.0},
+        }
+    }
+
+    assert compare(baseline, current, threshold=0.2) == [
+        "read_part.p50_ms: 10.0 -> 13.0 (+30.0%)",
+        "search.throughput_rps: 50.0 -> 20.0 (-60.0%)",
+    ]
+    assert compare(baseline, current, threshold=0.7) == []
+
+
+def test_parse_setting() -> None:
+    assert parse_setting("async_db=true") == ("async_db", True)
+    assert parse_setting("max_page_size=500") == ("max_page_size", 500)
+    assert parse_setting("sqlite_journal_mode=WAL") == ("sqlite_journal_mode", "WAL")
+
+
+def test_parse_importtime() -> None:
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   app.core\n"
+        "import time:      2500 |       2620 | app.main\n"
+    )
+    assert parse_importtime(output) == [("app.core", 120), ("app.main", 2620)]
+
+
+def test_list_filters_use_indexes(db_session: Session) -> None:
+    plans = list_query_plans(db_session.connection())
+    assert plans and full_scans(plans) == []
+    assert full_scans({"min_weight=16&sort=id": ["SCAN part"]}) == [
+        "min_weight=16&sort=id: SCAN part"
+    ]
+
+
+def test_changes_scenario_pages_through_the_seeded_log(tmp_path: Path) -> None:
+    database_url = f"sqlite:///{tmp_path / 'bench.db'}"
+    seed_catalog(database_url, 250, batch_size=100)
+    settings = benchmark_settings(database_url)
+    state = RunState(f"{settings.api_v1_prefix}/parts", 250)
+
+    async def read_pages() -> List[Tuple[int, bool]]:
+        pages = []
+        async with running(build_app(settings)) as client:
+            for i in range(4):
+                response = await read_changes(state, client, i)
+                pages.append((len(response.json()["changes"]), state.change_token is None))
+        return pages
+
+    # Every seeded part is in the log, the feed starts over once caught up
+    assert asyncio.run(read_pages()) == [(100, False), (100, False), (50, True), (100, False)]
@@ -0,0 +1,239 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from app.api import utils
+from app.api.utils import part_cache_key
+from app.core.cache import CacheBackend, LRUCache
+from app.core.settings.app import AppSettings
+from app.schemas.parts import PartBase
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+
+class FakeSharedCache(CacheBackend):
+    """
+    Dict-backed stand-in for a cache shared across workers.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, Tuple[Optional[int], Optional[bytes]]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key, (None, None))[1]
+
+    def set(self, key: str, value: bytes, version: Optional[int] = None) -> None:
+        stored_version = self.entries.get(key, (None, None))[0]
+        if version is None or stored_version is None or stored_version <= version:
+            self.entries[key] = (version, value)
+
+    def delete(self, *keys: str, version: Optional[int] = None) -> None:
+        for key in keys:
+            stored_version = self.entries.pop(key, (None, None))[0]
+            if version is not None:
+                self.entries[key] = (max(version, stored_version or version), None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.entries)}
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "entries": 2, "bytes": 2}
+
+
+def test_lru_cache_bounded_by_bytes() -> None:
+    cache = LRUCache(max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.set("c", b"123")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+
+    cache.set("big", b"12345678901")
+    assert cache.get("big") is None
+
+
+def test_lru_cache_ttl() -> None:
+    cache = LRUCache(ttl=-1)
+    cache.set("a", b"1")
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_cache_versions() -> None:
+    cache = LRUCache()
+    cache.set("a", b"2", version=2)
+    cache.set("a", b"1", version=1)
+    assert cache.get("a") == b"2"
+
+    # The tombstone refuses the versions older than the delete
+    cache.delete("a", version=3)
+    assert cache.get("a") is None
+    cache.set("a", b"2", version=2)
+    assert cache.get("a") is None
+    cache.set("a", b"3", version=3)
+    assert cache.get("a") == b"3"
+
+    cache = LRUCache(tombstone_ttl=-1)
+    cache.delete("a", version=3)
+    cache.set("a", b"2", version=2)
+    assert cache.get("a") == b"2"
+
+
+def test_stale_read_not_cached(db_session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = LRUCache()
+    part = utils.create_part(db_session, PartBase(name="Old", sku="STALE1", weight_ounces=1))
+    get_part = utils.get_part
+
+    def get_part_then_update(db: Session, part_id: int, active_only: bool = False) -> Any:
+        db_part = get_part(db, part_id, active_only)
+        db.expunge(db_part)
+        # A concurrent update commits and invalidates the part before the old row
+        # read here is cached
+        utils.update_part(db, part_id, {"name": "New"}, cache)
+        return db_part
+
+    monkeypatch.setattr(utils, "get_part", get_part_then_update)
+    assert json.loads(utils.get_cached_part(db_session, part.id, cache).payload)["name"] == "Old"
+    monkeypatch.undo()
+    assert json.loads(utils.get_cached_part(db_session, part.id, cache).payload)["name"] == "New"
+    utils.delete_part(db_session, part.id)
+
+
+def test_configure_word_count_cache(db_session: Session) -> None:
+    try:
+        utils.configure_word_count_cache(ttl=60)
+        words = utils.get_most_common_words(db_session, k=3)
+        assert isinstance(utils._word_count_cache, LRUCache)
+        assert utils._word_count_cache.ttl == 60
+        assert utils._word_count_cache.stats()["entries"] == 1
+        # Disabled, the words are counted on every call
+        utils.configure_word_count_cache(enabled=False)
+        assert utils.get_most_common_words(db_session, k=3) == words
+        utils.invalidate_word_count_cache()
+        assert utils._word_count_cache is None
+    finally:
+        utils.configure_word_count_cache()
+
+
+def test_stale_word_counts_not_cached(db_session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    top_k_words = utils.top_k_words
+    created: List[Any] = []
+
+    def top_k_words_then_create(*args: Any, **kwargs: Any) -> Any:
+        most_common_words = top_k_words(*args, **kwargs)
+        # A concurrent write commits and invalidates the cache before the words
+        # counted here are cached
+        created.append(
+            utils.create_part(
+                db_session,
+                PartBase(
+                    name="Words", sku="STALEWORDS1", description="zyzzyva " * 50, weight_ounces=1
+                ),
+            )
+        )
+        return most_common_words
+
+    try:
+        utils.configure_word_count_cache()
+        monkeypatch.setattr(utils, "top_k_words", top_k_words_then_create)
+        words = utils.get_most_common_words(db_session, k=1)
+        assert "zyzzyva" not in [row.word for row in words]
+        assert utils._word_count_cache.stats()["entries"] == 0
+        monkeypatch.undo()
+        words = utils.get_most_common_words(db_session, k=1)
+        assert [row.word for row in words] == ["zyzzyva"]
+        assert utils._word_count_cache.stats()["entries"] == 1
+    finally:
+        for part in created:
+            utils.delete_part(db_session, part.id)
+
+
+def test_read_part_through_cache(app: FastAPI, client: TestClient, settings: AppSettings) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    cache = FakeSharedCache()
+    original_cache = app.state.part_cache
+    app.state.part_cache = cache
+    try:
+        response = client.post(
+            f"{parts_url}/create/",
+            json={"name": "Cached", "sku": "CACHED1", "weight_ounces": 1},
+        )
+        part_id = response.json()["id"]
+        key = part_cache_key(part_id)
+
+        assert client.get(f"{parts_url}/{part_id}").json()["name"] == "Cached"
+        assert cache.get(key) is not None
+        assert client.get(f"{parts_url}/{part_id}").json() == response.json()
+
+        response = client.put(
+            f"{parts_url}/update/{part_id}",
+            json={"name": "Renamed", "sku": "CACHED1", "weight_ounces": 1},
+        )
+        assert cache.get(key) is None
+        response = client.get(f"{parts_url}/{part_id}")
+        assert response.json()["name"] == "Renamed"
+        # The validators are cached along with the body they describe
+        etag = response.headers["ETag"]
+        assert etag.startswith('"2-')
+        assert utils.decode_cached_part(cache.get(key)).version == 2
+        response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        client.delete(f"{parts_url}/delete/{part_id}")
+        assert cache.get(key) is None
+        assert client.get(f"{parts_url}/{part_id}").status_code == 404
+    finally:
+        app.state.part_cache = original_cache
+
+
+def test_read_parts_by_sku(app: FastAPI, client: TestClient, settings: AppSettings) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    cache = FakeSharedCache()
+    original_cache = app.state.part_cache
+    app.state.part_cache = cache
+    try:
+        ids = {}
+        for sku in ("BYSKU1", "BYSKU2"):
+            response = client.post(
+                f"{parts_url}/create/", json={"name": sku, "sku": sku, "weight_ounces": 1}
+            )
+            ids[sku] = response.json()["id"]
+
+        response = client.get(f"{parts_url}/by-sku/BYSKU1")
+        assert response.status_code == 200
+        assert response.json()["id"] == ids["BYSKU1"]
+        assert client.get(f"{parts_url}/by-sku/NOSUCHSKU").status_code == 404
+
+        response = client.post(f"{parts_url}/by-sku", json=["BYSKU2", "NOSUCHSKU", "BYSKU1"])
+        assert response.status_code == 200
+        assert [part["sku"] for part in response.json()] == ["BYSKU2", "BYSKU1"]
+
+        response = client.put(
+            f"{parts_url}/update/{ids['BYSKU1']}",
+            json={"name": "Moved", "sku": "BYSKU3", "weight_ounces": 1},
+        )
+        assert client.get(f"{parts_url}/by-sku/BYSKU1").status_code == 404
+        assert client.get(f"{parts_url}/by-sku/BYSKU3").json()["name"] == "Moved"
+
+        too_many = [f"SKU{i}" for i in range(settings.max_sku_batch_size + 1)]
+        assert client.post(f"{parts_url}/by-sku", json=too_many).status_code == 400
+
+        for part_id in ids.values():
+            client.delete(f"{parts_url}/delete/{part_id}")
+        assert client.get(f"{parts_url}/by-sku/BYSKU3").status_code == 404
+    finally:
+        app.state.part_cache = original_cache
@@ -0,0 +1,174 @@
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from app.api import utils
+from app.core.config import get_app_settings
+from app.core.settings.app import AppSettings
+from app.core.settings.production import ProdAppSettings
+from app.db import commands
+from app.db.events import create_db_engine
+from app.db.purge import purge_deleted_parts
+from app.main import create_application
+from app.models.base import Base
+from app.models.parts import Part as ModelPart
+from app.models.word_counts import WordCount as ModelWordCount
+from app.schemas.parts import PartBase
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+
+def test_engine_applies_sqlite_pragmas(tmp_path: Path, settings: AppSettings) -> None:
+    settings = settings.model_copy(
+        update={"database_url": f"sqlite:///{tmp_path}/pragmas.db", "sqlite_busy_timeout": 1234}
+    )
+    engine = create_db_engine(settings)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert connection.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
+
+
+def test_production_settings_selected_by_env(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("APP_ENV", "prod")
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/prod.db")
+    get_app_settings.cache_clear()
+    try:
+        settings = get_app_settings()
+    finally:
+        get_app_settings.cache_clear()
+
+    assert isinstance(settings, ProdAppSettings)
+    assert not settings.debug
+    engine = create_db_engine(settings)
+    assert not engine.echo
+    assert isinstance(engine.pool, QueuePool)
+    assert engine.pool.size() == settings.db_pool_size
+    engine.dispose()
+
+
+def include_name(name: Optional[str], type_: str, parent_names: Any) -> bool:
+    # The full-text index is created by the migrations only, as in env.py
+    return not (type_ == "table" and name is not None and name.startswith("part_fts"))
+
+
+def test_migrations_match_models(tmp_path: Path) -> None:
+    root = Path(__file__).parents[2]
+    config = Config(str(root / "alembic.ini"))
+    config.set_main_option("script_location", str(root / "app" / "db" / "migrations"))
+    engine = create_engine(f"sqlite:///{tmp_path}/migrated.db")
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        context = MigrationContext.configure(connection, opts={"include_name": include_name})
+        assert compare_metadata(context, Base.metadata) == []
+        assert "part_fts" in inspect(connection).get_table_names()
+
+        command.downgrade(config, "base")
+        assert inspect(connection).get_table_names() == ["alembic_version"]
+    engine.dispose()
+
+
+def test_bulk_retry_is_atomic(
+    tmp_path: Path, settings: AppSettings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = settings.model_copy(update={"database_url": f"sqlite:///{tmp_path}/retry.db"})
+    engine = create_db_engine(settings)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    with Session(engine) as db:
+        utils.create_part(db, PartBase(name="Taken", sku="RETRY0", weight_ounces=1))
+    # As if a concurrent writer took the SKU once the chunk was checked: the batched
+    # INSERT fails and the rows are retried one by one, then the index update fails
+    monkeypatch.setattr(utils, "_validate_bulk_row", lambda part, taken, seen: None)
+
+    def fail(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("Index update failed.")
+
+    monkeypatch.setattr(utils, "apply_search_index_delta", fail)
+    parts = [
+        (0, PartBase(name="New", sku="RETRY1", description="retried", weight_ounces=1)),
+        (1, PartBase(name="Dup", sku="RETRY0", weight_ounces=1)),
+    ]
+    with Session(engine) as db:
+        with pytest.raises(RuntimeError):
+            utils.bulk_create_parts(db, parts)
+        db.rollback()
+
+    # Neither the retried row nor its word counts were committed
+    with Session(engine) as db:
+        assert db.scalars(select(ModelPart.sku)).all() == ["RETRY0"]
+        assert db.scalar(select(ModelWordCount).where(ModelWordCount.word == "retried")) is None
+    engine.dispose()
+
+
+def test_purge_releases_pages(tmp_path: Path, settings: AppSettings) -> None:
+    settings = settings.model_copy(
+        update={"database_url": f"sqlite:///{tmp_path}/purge.db", "purge_retention": 0}
+    )
+    engine = create_db_engine(settings)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    parts = [
+        (
+            index,
+            PartBase(name=f"P{index}", sku=f"PURGE{index}", description="x" * 500, weight_ounces=1),
+        )
+        for index in range(200)
+    ]
+
+    def create_and_delete_parts(db: Session) -> None:
+        results = utils.bulk_create_parts(db, parts)
+        utils.bulk_delete_parts(db, [(result.index, result.id) for result in results], soft=True)
+
+    with Session(engine) as db:
+        create_and_delete_parts(db)
+        # Without incremental auto-vacuum, the freed pages stay in the file
+        assert purge_deleted_parts(db, settings) == (200, 0)
+        assert db.execute(text("PRAGMA freelist_count")).scalar() > 0
+
+    engine.dispose()
+    commands.run("enable-incremental-vacuum", settings)
+    with Session(engine) as db:
+        assert db.execute(text("PRAGMA auto_vacuum")).scalar() == 2  # INCREMENTAL
+        create_and_delete_parts(db)
+        purged, pages = purge_deleted_parts(db, settings)
+        assert purged == 200 and pages > 0
+        assert db.execute(text("PRAGMA freelist_count")).scalar() == 0
+    engine.dispose()
+
+
+def test_purge_job(tmp_path: Path, settings: AppSettings) -> None:
+    settings = settings.model_copy(
+        update={
+            "database_url": f"sqlite:///{tmp_path}/purge_job.db",
+            "soft_delete": True,
+            "purge_interval": 0.05,
+            "purge_retention": 0,
+        }
+    )
+    engine = create_engine(settings.database_url)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    parts_url = f"{settings.api_v1_prefix}/parts"
+
+    with TestClient(create_application(settings)) as client:
+        part = {"name": "Purged", "sku": "PURGEJOB", "weight_ounces": 1}
+        part_id = client.post(f"{parts_url}/create/", json=part).json()["id"]
+        assert client.delete(f"{parts_url}/delete/{part_id}").status_code == 200
+        with engine.connect() as connection:
+            for _ in range(100):
+                if connection.execute(text("SELECT count(*) FROM part")).scalar() == 0:
+                    break
+                time.sleep(0.05)
+            else:
+                pytest.fail("The deleted part was not purged.")
+    engine.dispose()
@@ -0,0 +1,108 @@
+import asyncio
+import io
+import json
+import logging
+import threading
+from typing import Iterator
+
+import pytest
+from app.core.logging import (
+    AccessLogSampler,
+    InterceptHandler,
+    QueuedStream,
+    json_formatter,
+)
+from loguru import logger
+
+
+@pytest.fixture()
+def stdlib_logger() -> Iterator[logging.Logger]:
+    stdlib_logger = logging.getLogger("parts.test")
+    stdlib_logger.setLevel(logging.INFO)
+    stdlib_logger.propagate = False
+    yield stdlib_logger
+    stdlib_logger.handlers = []
+    stdlib_logger.filters = []
+
+
+def access_record(status: int) -> logging.LogRecord:
+    return logging.LogRecord(
+        "uvicorn.access",
+        logging.INFO,
+        __file__,
+        1,
+        '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:50000", "GET", "/", "1.1", status),
+        None,
+    )
+
+
+def test_access_log_sampler() -> None:
+    assert AccessLogSampler(1).filter(access_record(200))
+    assert not AccessLogSampler(0).filter(access_record(200))
+    # Server errors are always kept
+    assert AccessLogSampler(0).filter(access_record(503))
+
+
+@pytest.mark.parametrize("caller", [True, False])
+def test_json_records(stdlib_logger: logging.Logger, caller: bool) -> None:
+    stream = io.StringIO()
+    handler_id = logger.add(stream, format=json_formatter(caller=caller), colorize=False)
+    stdlib_logger.handlers = [InterceptHandler(caller=caller)]
+    try:
+        stdlib_logger.info("served %s", "part")
+        try:
+            raise ValueError("broken part")
+        except ValueError:
+            stdlib_logger.exception("failed")
+    finally:
+        logger.remove(handler_id)
+
+    served, failed = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert (served["level"], served["message"]) == ("INFO", "served part")
+    assert "ValueError: broken part" in failed["exception"]
+    if caller:
+        assert (served["module"], served["function"]) == (__name__, "test_json_records")
+    else:
+        # No stack walk, the record only knows the logger it was sent to
+        assert served["logger"] == "parts.test"
+        assert "function" not in served
+
+
+def test_queued_stream() -> None:
+    async def drain() -> None:
+        await logger.complete()
+
+    stream = io.StringIO()
+    handler_id = logger.add(QueuedStream(stream), format="{message}")
+    try:
+        for i in range(100):
+            logger.info(f"record {i}")
+        asyncio.run(drain())
+        assert stream.getvalue().splitlines() == [f"record {i}" for i in range(100)]
+    finally:
+        logger.remove(handler_id)
+
+
+def test_queued_stream_drops_when_full() -> None:
+    class BlockedStream(io.StringIO):
+        def __init__(self) -> None:
+            super().__init__()
+            self.writing, self.unblocked = threading.Event(), threading.Event()
+
+        def write(self, message: str) -> int:
+            self.writing.set()
+            self.unblocked.wait()
+            return super().write(message)
+
+    stream = BlockedStream()
+    sink = QueuedStream(stream, max_queued=2)
+    sink.write("first\n")
+    # The writer thread holds the first message, two more fit in the queue
+    assert stream.writing.wait(timeout=5)
+    for i in range(5):
+        sink.write(f"record {i}\n")
+    assert sink.dropped == 3
+    stream.unblocked.set()
+    sink.stop()
+    assert stream.getvalue().splitlines() == ["first", "record 0", "record 1"]
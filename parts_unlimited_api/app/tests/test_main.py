@@ -0,0 +1,87 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from app import __main__ as cli
+from app.core.openapi import write_schema
+from app.core.settings.app import AppSettings
+from app.core.settings.test import TestAppSettings
+from app.main import create_application
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture()
+def uvicorn_run(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    calls: Dict[str, Any] = {}
+    monkeypatch.setattr(cli.uvicorn, "run", lambda app, **kwargs: calls.update(kwargs, app=app))
+    monkeypatch.delenv("PART_CACHE_ENABLED", raising=False)
+    monkeypatch.delenv("WORD_COUNT_CACHE_ENABLED", raising=False)
+    return calls
+
+
+def test_serve_with_settings_defaults(
+    monkeypatch: pytest.MonkeyPatch, uvicorn_run: Dict[str, Any]
+) -> None:
+    settings = TestAppSettings(server_port=9000, server_graceful_timeout=5)
+    monkeypatch.setattr(cli, "get_app_settings", lambda: settings)
+    cli.main([])
+    # Every worker builds its own app from the factory
+    assert uvicorn_run["app"] == "app.main:create_application"
+    assert uvicorn_run["factory"]
+    assert (uvicorn_run["port"], uvicorn_run["workers"]) == (9000, 1)
+    assert uvicorn_run["timeout_graceful_shutdown"] == 5
+
+
+@pytest.mark.parametrize(
+    "cache_settings,part_cache_enabled,word_count_cache_enabled",
+    [
+        ({}, "false", "false"),
+        ({"part_cache_ttl": None}, "false", "false"),
+        ({"part_cache_ttl": 10}, None, "false"),
+        ({"word_count_cache_ttl": 10}, "false", None),
+    ],
+)
+def test_serve_multiple_workers(
+    monkeypatch: pytest.MonkeyPatch,
+    uvicorn_run: Dict[str, Any],
+    cache_settings: Dict[str, Any],
+    part_cache_enabled: Any,
+    word_count_cache_enabled: Any,
+) -> None:
+    settings = TestAppSettings(**cache_settings)
+    monkeypatch.setattr(cli, "get_app_settings", lambda: settings)
+    cli.main(["--workers", "4"])
+    assert uvicorn_run["workers"] == 4
+    # Per worker caches only stay when their staleness is bounded by a TTL
+    assert cli.os.environ.get("PART_CACHE_ENABLED") == part_cache_enabled
+    assert cli.os.environ.get("WORD_COUNT_CACHE_ENABLED") == word_count_cache_enabled
+    monkeypatch.delenv("PART_CACHE_ENABLED", raising=False)
+    monkeypatch.delenv("WORD_COUNT_CACHE_ENABLED", raising=False)
+
+
+def test_import_builds_nothing() -> None:
+    # A fresh interpreter, the test session already imported everything
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in sys.modules if m.startswith(('app.routers', 'app.api'))))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_openapi_schema_file(app: FastAPI, settings: AppSettings, tmp_path: Path) -> None:
+    path = tmp_path / "openapi.json"
+    write_schema(app, str(path))
+    schema = json.loads(path.read_text())
+    assert "/api/v1/parts/{part_id}" in schema["paths"]
+
+    schema["info"]["title"] = "Precomputed"
+    path.write_text(json.dumps(schema))
+    served = create_application(settings.model_copy(update={"openapi_schema_path": str(path)}))
+    assert TestClient(served).get("/openapi.json").json()["info"]["title"] == "Precomputed"
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+from app.core.settings.app import AppSettings
+from app.main import create_application
+from app.models.base import Base
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+
+@pytest.mark.parametrize("async_db", [False, True])
+def test_metrics(tmp_path: Path, settings: AppSettings, async_db: bool) -> None:
+    settings = settings.model_copy(
+        update={"database_url": f"sqlite:///{tmp_path}/metrics.db", "async_db": async_db}
+    )
+    engine = create_engine(settings.database_url)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    engine.dispose()
+    parts_url = f"{settings.api_v1_prefix}/parts"
+
+    with TestClient(create_application(settings)) as client:
+        response = client.post(
+            f"{parts_url}/create/",
+            json={"name": "Metered", "sku": "MET1", "description": "metered", "weight_ounces": 1},
+        )
+        part_id = response.json()["id"]
+        # The first read loads the part, the second one is cached.
+        client.get(f"{parts_url}/{part_id}")
+        client.get(f"{parts_url}/{part_id}")
+        client.get(f"{parts_url}/{part_id + 1}")
+        client.get("/nowhere")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        lines = set(response.text.splitlines())
+
+    route = f'method="GET",route="{parts_url}/{{part_id}}"'
+    assert f'http_requests_total{{{route},status="200"}} 2.0' in lines
+    assert f'http_requests_total{{{route},status="404"}} 1.0' in lines
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1.0' in lines
+    assert f"http_request_duration_seconds_count{{{route}}} 3.0" in lines
+    # One statement for the first read, none for the cached one, one for the 404
+    assert f"http_request_queries_sum{{{route}}} 2.0" in lines
+    assert f'http_request_queries_bucket{{le="0.0",{route}}} 1.0' in lines
+    assert f"http_response_size_bytes_count{{{route}}} 3.0" in lines
+    assert "http_requests_in_flight 1.0" in lines  # the /metrics request itself
+    assert 'db_statement_duration_seconds_count{statement="SELECT"} 2.0' in lines
+    # The part, word count, search index, catalog statistics and change log inserts
+    assert 'db_statement_duration_seconds_count{statement="INSERT"} 5.0' in lines
+    assert "part_cache_hits_total 1.0" in lines
+    assert "part_cache_entries 1.0" in lines
+
+
+def test_metrics_disabled(settings: AppSettings) -> None:
+    app = create_application(settings.model_copy(update={"metrics_enabled": False}))
+    assert TestClient(app).get("/metrics").status_code == 404
@@ -1,7 +1,24 @@
+import csv
+import io
+import json
+import sys
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Dict, List, Tuple
+
+from app.api import utils
+from app.api.deps import get_db
 from app.core.settings.app import AppSettings
+from app.main import create_application
+from app.models.base_class import utcnow
+from app.models.part_stats import PartStat as ModelPartStat
 from app.models.parts import Part as ModelPart
+from app.models.word_counts import WordCount as ModelWordCount
+from app.schemas.parts import PartBase
+from app.schemas.utils import WordCount
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import desc
+from sqlalchemy import desc, event, select, text
 from sqlalchemy.orm import Session
 
 
@@ -135,3 +152,820 @@ def test_get_most_common_words(
     assert len(data) == 5
     assert data[0]["word"] == "part"
     assert data[0]["count"] > 1
+
+
+def test_word_counts_follow_part_writes(
+    client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    def word_count(word: str) -> int:
+        count = db_session.scalar(select(ModelWordCount.count).where(ModelWordCount.word == word))
+        return count or 0
+
+    response = client.post(
+        f"{settings.api_v1_prefix}/parts/create/",
+        json={
+            "name": "Gasket",
+            "sku": "SKUWORDIDX",
+            "description": "Gasket rubber gasket",
+            "weight_ounces": 1,
+        },
+    )
+    assert response.status_code == 200
+    part_id = response.json()["id"]
+    assert word_count("gasket") == 2
+    assert word_count("rubber") == 1
+
+    response = client.put(
+        f"{settings.api_v1_prefix}/parts/update/{part_id}",
+        json={
+            "name": "Gasket",
+            "sku": "SKUWORDIDX",
+            "description": "Gasket silicone",
+            "weight_ounces": 1,
+        },
+    )
+    assert response.status_code == 200
+    assert word_count("gasket") == 1
+    assert word_count("rubber") == 0
+    assert word_count("silicone") == 1
+
+    response = client.delete(f"{settings.api_v1_prefix}/parts/delete/{part_id}")
+    assert response.status_code == 200
+    assert word_count("gasket") == 0
+    assert word_count("silicone") == 0
+
+
+def test_rebuild_word_counts(db_session: Session) -> None:
+    expected: Counter = Counter()
+    for (description,) in db_session.query(ModelPart.description):
+        expected.update(utils.tokenize(description))
+
+    db_session.query(ModelWordCount).delete()
+    db_session.commit()
+    assert utils.rebuild_word_counts(db_session) == len(expected)
+
+    stored = {row.word: row.count for row in db_session.query(ModelWordCount)}
+    assert stored == dict(expected)
+
+
+def test_count_words_streaming_matches_index(db_session: Session) -> None:
+    indexed = {row.word: row.count for row in db_session.query(ModelWordCount)}
+
+    assert utils.count_words(db_session, batch_size=3) == indexed
+    assert utils.count_words(db_session, batch_size=3, workers=2) == indexed
+    assert utils.get_most_common_words(db_session, use_index=False, batch_size=3) == (
+        utils.get_most_common_words(db_session)
+    )
+
+
+def test_get_most_common_words_parameters(
+    client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    for i, (description, is_active) in enumerate(
+        [("widget bolt widget", True), ("widget bolt", False), ("an bolt", True)]
+    ):
+        response = client.post(
+            f"{settings.api_v1_prefix}/parts/create/",
+            json={
+                "name": f"Filtered {i}",
+                "sku": f"TOPK{i}",
+                "description": description,
+                "weight_ounces": 1,
+                "is_active": is_active,
+            },
+        )
+        assert response.status_code == 200, response.text
+
+    url = f"{settings.api_v1_prefix}/parts/most_common_words/"
+    response = client.get(url, params={"sku_prefix": "TOPK", "k": 2})
+    assert response.json() == [{"word": "bolt", "count": 3}, {"word": "widget", "count": 3}]
+
+    response = client.get(url, params={"sku_prefix": "TOPK", "is_active": True})
+    assert response.json() == [
+        {"word": "bolt", "count": 2},
+        {"word": "widget", "count": 2},
+        {"word": "an", "count": 1},
+    ]
+
+    response = client.get(
+        url, params={"sku_prefix": "TOPK", "stop_words": ["Bolt"], "min_length": 3}
+    )
+    assert response.json() == [{"word": "widget", "count": 3}]
+
+    response = client.get(url, params={"k": 3, "stop_words": ["part", "this"]})
+    words = [item["word"] for item in response.json()]
+    assert len(words) == 3
+    assert "part" not in words and "this" not in words
+
+    # The index less the inactive parts counts the same as the active parts
+    cases: List[Dict[str, Any]] = [
+        {"k": 1},
+        {"k": 5, "min_length": 3},
+        {"k": 100, "stop_words": ["bolt"]},
+    ]
+    for params in cases:
+        assert utils.get_most_common_words(db_session, is_active=True, **params) == (
+            utils.get_most_common_words(db_session, is_active=True, use_index=False, **params)
+        )
+
+
+def test_get_most_common_words_cache_invalidated_on_write(
+    client: TestClient, settings: AppSettings
+) -> None:
+    url = f"{settings.api_v1_prefix}/parts/most_common_words/"
+    params = {"sku_prefix": "CACHE"}
+    assert client.get(url, params=params).json() == []
+
+    response = client.post(
+        f"{settings.api_v1_prefix}/parts/create/",
+        json={"name": "Cached", "sku": "CACHE1", "description": "sprocket", "weight_ounces": 2},
+    )
+    assert response.status_code == 200
+    assert client.get(url, params=params).json() == [{"word": "sprocket", "count": 1}]
+
+
+def test_top_k_words() -> None:
+    word_counts = {"a": 5, "bb": 5, "ccc": 3, "dddd": 9}
+    assert utils.top_k_words(word_counts, 2) == [
+        WordCount(word="dddd", count=9),
+        WordCount(word="a", count=5),
+    ]
+    assert utils.top_k_words(word_counts, 2, stop_words={"dddd"}, min_length=2) == [
+        WordCount(word="bb", count=5),
+        WordCount(word="ccc", count=3),
+    ]
+
+
+def test_prefix_filter_max_code_point(db_session: Session) -> None:
+    top = chr(sys.maxunicode)
+    skus = [f"PFX{top}", f"PFX{top}{top}A", "PFY"]
+    for sku in skus:
+        utils.create_part(
+            db_session, PartBase(name="Prefix", sku=sku, description="prefix", weight_ounces=1)
+        )
+
+    def matching(prefix: str) -> list:
+        stmt = select(ModelPart.sku).where(utils.prefix_filter(ModelPart.sku, prefix))
+        return list(db_session.scalars(stmt.order_by(ModelPart.sku)))
+
+    assert matching(f"PFX{top}") == skus[:2]
+    assert matching(f"PFX{top}{top}") == skus[1:2]
+    assert matching(top) == []
+
+
+def test_read_parts_cursor_pagination(
+    client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    url = f"{settings.api_v1_prefix}/parts/list/"
+    expected = [part_id for (part_id,) in db_session.query(ModelPart.id).order_by(ModelPart.id)]
+
+    seen: List[int] = []
+    response = client.get(url, params={"limit": 4})
+    while True:
+        assert response.status_code == 200
+        seen.extend(part["id"] for part in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get(url, params={"limit": 4, "cursor": cursor})
+    assert seen == expected
+
+
+def test_read_parts_pagination_limits(client: TestClient, settings: AppSettings) -> None:
+    url = f"{settings.api_v1_prefix}/parts/list/"
+    response = client.get(url, params={"limit": settings.max_page_size + 50})
+    assert response.status_code == 200
+    assert len(response.json()) <= settings.max_page_size
+
+    response = client.get(url, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    cursor = utils.encode_cursor(1)
+    response = client.get(url, params={"cursor": cursor, "skip": 5})
+    assert response.status_code == 400
+
+
+def test_read_parts_filters_and_sorts(
+    client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    url = f"{settings.api_v1_prefix}/parts/list/"
+    for i, weight in enumerate([40, 10, 30, 10, 20]):
+        response = client.post(
+            f"{settings.api_v1_prefix}/parts/create/",
+            json={"name": f"Filter {4 - i}", "sku": f"FLT{i}", "weight_ounces": weight},
+        )
+        assert response.status_code == 200
+    inactive_id = response.json()["id"]
+    client.patch(f"{settings.api_v1_prefix}/parts/update/{inactive_id}", json={"is_active": False})
+    parts = db_session.query(ModelPart).filter(ModelPart.sku.startswith("FLT")).all()
+
+    for sort in ["id", "-id", "name", "-sku", "weight_ounces", "-weight_ounces", "-updated_at"]:
+        # Equal keys are ordered by ID, in the sort direction too
+        field = sort.lstrip("-")
+        keys = sorted(
+            ((getattr(part, field), part.id) for part in parts), reverse=sort.startswith("-")
+        )
+        seen: List[int] = []
+        params: Dict[str, Any] = {"sku_prefix": "FLT", "sort": sort, "limit": 2}
+        response = client.get(url, params=params)
+        while True:
+            assert response.status_code == 200
+            seen.extend(part["id"] for part in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            response = client.get(url, params={**params, "cursor": cursor})
+        assert seen == [part_id for _, part_id in keys]
+
+    response = client.get(
+        url,
+        params={"name_prefix": "Filter", "is_active": True, "min_weight": 10, "max_weight": 30},
+    )
+    assert sorted(part["weight_ounces"] for part in response.json()) == [10, 10, 30]
+    response = client.get(url, params={"sku_prefix": "FLT", "is_active": False})
+    assert [part["id"] for part in response.json()] == [inactive_id]
+
+    # A cursor only continues the sort order it was built for
+    cursor = utils.encode_cursor(inactive_id, "-name", "Filter 0")
+    assert client.get(url, params={"cursor": cursor, "sort": "name"}).status_code == 400
+    assert client.get(url, params={"cursor": cursor, "sort": "-name"}).status_code == 200
+    # Keys of the wrong type for the sort column are refused before the query
+    cases: List[Tuple[str, Any]] = [
+        ("name", {"a": 1}),
+        ("name", [1]),
+        ("name", None),
+        ("sku", 1),
+        ("weight_ounces", "10"),
+        ("weight_ounces", True),
+        ("weight_ounces", 2**63),
+        ("updated_at", None),
+    ]
+    for sort, key in cases:
+        cursor = utils.encode_cursor(inactive_id, sort, key)
+        response = client.get(url, params={"cursor": cursor, "sort": sort})
+        assert response.status_code == 400, (sort, key)
+        assert response.json()["detail"] == "Invalid cursor."
+    for sort, key in [("sku", None), ("weight_ounces", None), ("weight_ounces", 10.5)]:
+        cursor = utils.encode_cursor(inactive_id, sort, key)
+        assert client.get(url, params={"cursor": cursor, "sort": sort}).status_code == 200
+    assert client.get(url, params={"min_weight": -1}).status_code == 422
+    assert client.get(url, params={"sort": "description"}).status_code == 422
+
+
+def test_bulk_create_update_delete(
+    client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    url = f"{settings.api_v1_prefix}/parts/bulk/"
+    response = client.post(
+        url,
+        json=[
+            {"name": "Bulk 0", "sku": "BULK0", "description": "bulk nut", "weight_ounces": 1},
+            {"name": "Bulk 1", "sku": "BULK0", "description": "bulk dup", "weight_ounces": 1},
+            {"name": "Bulk 2", "sku": "BULK2", "description": "bulk nut", "weight_ounces": -1},
+            {"name": "Bulk 3", "sku": "BULK3"},
+            {"name": "Bulk 4", "sku": "BULK4", "description": "bulk bolt", "weight_ounces": 4},
+        ],
+    )
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == [
+        "created",
+        "error",
+        "error",
+        "error",
+        "created",
+    ]
+    assert results[1]["detail"] == "SKU BULK0 already exists."
+    assert results[2]["detail"] == "Weight must be non-negative."
+    created_ids = [results[0]["id"], results[4]["id"]]
+    assert db_session.query(ModelWordCount).filter_by(word="bulk").one().count == 2
+
+    response = client.put(
+        url,
+        json=[
+            {
+                "id": created_ids[0],
+                "name": "Bulk 0",
+                "sku": "BULK0",
+                "description": "washer",
+                "weight_ounces": 3,
+            },
+            {"id": created_ids[1], "name": "Bulk 4", "sku": "BULK0", "weight_ounces": 4},
+            {"id": 10**9, "name": "Missing", "sku": "BULKX", "weight_ounces": 4},
+        ],
+    )
+    assert [result["status"] for result in response.json()] == ["updated", "error", "error"]
+    db_session.expire_all()
+    assert db_session.get(ModelPart, created_ids[0]).description == "washer"
+    assert db_session.query(ModelWordCount).filter_by(word="bulk").one().count == 1
+
+    response = client.request(
+        "DELETE",
+        url,
+        content="\n".join([str(created_ids[0]), "{oops", str(created_ids[1]), "", "-1"]),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert [result["status"] for result in response.json()] == [
+        "deleted",
+        "error",
+        "deleted",
+        "error",
+    ]
+    assert db_session.query(ModelPart).filter(ModelPart.id.in_(created_ids)).count() == 0
+    assert db_session.query(ModelWordCount).filter_by(word="bulk").first() is None
+
+
+def test_bulk_create_ndjson(client: TestClient, settings: AppSettings) -> None:
+    lines = [
+        '{"name": "Nd 0", "sku": "NDJSON0", "weight_ounces": 1}',
+        '{"name": "Nd 1", "sku": "NDJSON1", "weight_ounces": 2}',
+    ]
+    response = client.post(
+        f"{settings.api_v1_prefix}/parts/bulk/",
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == ["created", "created"]
+
+    response = client.post(f"{settings.api_v1_prefix}/parts/bulk/", json={"name": "x"})
+    assert response.status_code == 400
+
+
+def test_export_parts(client: TestClient, db_session: Session, settings: AppSettings) -> None:
+    expected = db_session.query(ModelPart).order_by(ModelPart.id).all()
+    url = f"{settings.api_v1_prefix}/parts/export"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [part.id for part in expected]
+    assert rows[0]["sku"] == expected[0].sku
+
+    response = client.get(url, params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [part.id for part in expected]
+
+
+def test_search_parts(client: TestClient, db_session: Session, settings: AppSettings) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    ids = []
+    for i, (name, description) in enumerate(
+        [
+            ("Brake caliper", "Front brake caliper, brake pads sold separately"),
+            ("Caliper bolt", "Bolt for the front caliper"),
+            ("Oil filter", 'Spin-on "oil" filter'),
+        ]
+    ):
+        response = client.post(
+            f"{parts_url}/create/",
+            json={"name": name, "sku": f"FTS{i}", "description": description, "weight_ounces": 1},
+        )
+        ids.append(response.json()["id"])
+
+    response = client.get(f"{parts_url}/search", params={"q": "caliper"})
+    assert response.status_code == 200
+    # BM25 favours the shorter description mentioning "caliper".
+    assert [part["id"] for part in response.json()] == [ids[1], ids[0]]
+    response = client.get(f"{parts_url}/search", params={"q": "Brake caliper"})
+    assert [part["id"] for part in response.json()] == [ids[0]]
+    response = client.get(f"{parts_url}/search", params={"q": "caliper", "skip": 1})
+    assert [part["id"] for part in response.json()] == [ids[0]]
+    response = client.get(f"{parts_url}/search", params={"q": '"oil" AND'})
+    assert response.json() == []
+
+    client.put(
+        f"{parts_url}/update/{ids[1]}",
+        json={"name": "Wheel bolt", "sku": "FTS1", "description": "Lug bolt", "weight_ounces": 1},
+    )
+    client.delete(f"{parts_url}/delete/{ids[0]}")
+    response = client.get(f"{parts_url}/search", params={"q": "caliper"})
+    assert response.json() == []
+    response = client.get(f"{parts_url}/search", params={"q": "lug"})
+    assert [part["id"] for part in response.json()] == [ids[1]]
+
+    db_session.execute(text("INSERT INTO part_fts(part_fts, rank) VALUES ('integrity-check', 1)"))
+    utils.rebuild_search_index(db_session)
+    response = client.get(f"{parts_url}/search", params={"q": "oil filter"})
+    assert [part["id"] for part in response.json()] == [ids[2]]
+
+    for part_id in ids[1:]:
+        client.delete(f"{parts_url}/delete/{part_id}")
+
+
+def test_conditional_read_part(client: TestClient, settings: AppSettings) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    part = {"name": "Conditional", "sku": "COND1", "description": "etag", "weight_ounces": 1}
+    part_id = client.post(f"{parts_url}/create/", json=part).json()["id"]
+
+    response = client.get(f"{parts_url}/{part_id}")
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+    assert etag.startswith('"1-')
+
+    for headers in (
+        {"If-None-Match": etag},
+        {"If-None-Match": f'"other", W/{etag}'},
+        {"If-None-Match": "*"},
+        {"If-Modified-Since": last_modified},
+    ):
+        response = client.get(f"{parts_url}/{part_id}", headers=headers)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    # If-None-Match takes precedence over If-Modified-Since.
+    response = client.get(
+        f"{parts_url}/{part_id}",
+        headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 200
+
+    client.put(f"{parts_url}/update/{part_id}", json={**part, "description": "changed"})
+    response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["description"] == "changed"
+    assert response.headers["ETag"].startswith('"2-')
+
+    # Bulk updates bump the version too.
+    etag = response.headers["ETag"]
+    client.put(f"{parts_url}/bulk/", json=[{**part, "id": part_id, "weight_ounces": 2}])
+    response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"3-')
+
+    client.delete(f"{parts_url}/delete/{part_id}")
+    response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+
+def test_conditional_read_part_uncached(
+    app: FastAPI, client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    part = {"name": "Uncached", "sku": "UNCACHED1", "description": "etag", "weight_ounces": 1}
+    part_id = client.post(f"{parts_url}/create/", json=part).json()["id"]
+    original_cache = app.state.part_cache
+    app.state.part_cache = None
+    statements: List[str] = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    try:
+        etag = client.get(f"{parts_url}/{part_id}").headers["ETag"]
+        # A matching precondition reads the version of the part, not the whole row
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert len(statements) == 1 and "description" not in statements[0]
+
+        # Otherwise the validators come from the row of the body
+        response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": '"other"'})
+        assert response.status_code == 200
+        assert response.json()["description"] == "etag"
+        assert response.headers["ETag"] == etag
+    finally:
+        app.state.part_cache = original_cache
+    client.delete(f"{parts_url}/delete/{part_id}")
+    response = client.get(f"{parts_url}/{part_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+
+def test_conditional_list_and_most_common_words(client: TestClient, settings: AppSettings) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    part = {"name": "Conditional", "sku": "COND2", "description": "etag list", "weight_ounces": 1}
+    part_id = client.post(f"{parts_url}/create/", json=part).json()["id"]
+
+    cases: List[Tuple[str, Dict[str, Any]]] = [
+        (f"{parts_url}/list/", {"cursor": utils.encode_cursor(part_id - 1)}),
+        (f"{parts_url}/most_common_words/", {"k": 100}),
+    ]
+    for url, params in cases:
+        response = client.get(url, params=params)
+        etag = response.headers["ETag"]
+        response = client.get(url, params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        client.put(f"{parts_url}/update/{part_id}", json={**part, "description": url})
+        response = client.get(url, params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    client.delete(f"{parts_url}/delete/{part_id}")
+
+
+def test_optimistic_update(client: TestClient, db_session: Session, settings: AppSettings) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    part = {"name": "Optimistic", "sku": "OPT1", "description": "lock free", "weight_ounces": 1}
+    part_id = client.post(f"{parts_url}/create/", json=part).json()["id"]
+    etag = client.get(f"{parts_url}/{part_id}").headers["ETag"]
+
+    response = client.put(
+        f"{parts_url}/update/{part_id}",
+        json={**part, "description": "locked"},
+        headers={"If-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.json()["description"] == "locked"
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+    assert client.get(f"{parts_url}/{part_id}").headers["ETag"] == new_etag
+
+    # The first writer wins, the second one holds a stale ETag.
+    for method in (client.put, client.patch):
+        response = method(
+            f"{parts_url}/update/{part_id}",
+            json={**part, "name": "Lost"},
+            headers={"If-Match": etag},
+        )
+        assert response.status_code == 412
+    response = client.put(
+        f"{parts_url}/update/{part_id}",
+        json=part,
+        headers={"If-Match": f'W/{new_etag}, "unknown"'},
+    )
+    assert response.status_code == 412
+    assert client.get(f"{parts_url}/{part_id}").json()["name"] == "Optimistic"
+
+    # A PATCH of the weight reads the indexed fields of the part, then writes it with a
+    # single UPDATE ... RETURNING statement and moves it between statistics rows.
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.patch(
+            f"{parts_url}/update/{part_id}",
+            json={"weight_ounces": 7},
+            headers={"If-Match": new_etag},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    assert response.json() == {
+        **part,
+        "id": part_id,
+        "description": "locked",
+        "weight_ounces": 7,
+        "is_active": True,
+    }
+    assert [statement.split(None, 1)[0] for statement in statements] == [
+        "SELECT",
+        "UPDATE",
+        "INSERT",
+        "DELETE",
+        "INSERT",
+    ]
+    assert statements[1].startswith("UPDATE part SET") and "RETURNING" in statements[1]
+
+    response = client.patch(f"{parts_url}/update/{part_id}", json={"name": "Renamed"})
+    assert response.status_code == 200
+    assert [p["id"] for p in client.get(f"{parts_url}/search", params={"q": "renamed"}).json()] == [
+        part_id
+    ]
+    response = client.patch(f"{parts_url}/update/{part_id}", json={"description": None})
+    assert response.json()["description"] is None
+    assert db_session.query(ModelWordCount).filter(ModelWordCount.word == "locked").count() == 0
+
+    assert client.patch(f"{parts_url}/update/{part_id}", json={}).status_code == 400
+    assert client.patch(f"{parts_url}/update/{part_id}", json={"name": None}).status_code == 422
+    response = client.patch(f"{parts_url}/update/{part_id}", json={"weight_ounces": -1})
+    assert response.status_code == 400
+    response = client.patch(f"{parts_url}/update/{part_id + 1000}", json={"weight_ounces": 1})
+    assert response.status_code == 404
+    response = client.put(
+        f"{parts_url}/update/{part_id + 1000}", json=part, headers={"If-Match": new_etag}
+    )
+    assert response.status_code == 404
+
+    client.delete(f"{parts_url}/delete/{part_id}")
+
+
+def test_fast_serialization(client: TestClient, db_session: Session, settings: AppSettings) -> None:
+    fast_app = create_application(settings.model_copy(update={"fast_serialization": True}))
+    fast_app.dependency_overrides[get_db] = lambda: db_session
+    fast_client = TestClient(fast_app)
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    part = {"name": "Fast", "sku": "FAST1", "description": "fast ünicode", "weight_ounces": 1}
+
+    response = fast_client.post(f"{parts_url}/create/", json=part)
+    assert response.status_code == 200
+    part_id = response.json()["id"]
+    assert response.json() == {**part, "id": part_id, "is_active": True}
+    response = fast_client.patch(f"{parts_url}/update/{part_id}", json={"weight_ounces": 2})
+    assert response.json()["weight_ounces"] == 2
+    assert response.headers["ETag"] == client.get(f"{parts_url}/{part_id}").headers["ETag"]
+    response = fast_client.post(f"{parts_url}/create/", json={**part, "weight_ounces": -1})
+    assert response.status_code == 400
+
+    # Both paths produce the same bytes and headers.
+    pages: List[Dict[str, Any]] = [{"limit": 3}, {"cursor": utils.encode_cursor(part_id - 1)}]
+    for params in pages:
+        response = client.get(f"{parts_url}/list/", params=params)
+        fast_response = fast_client.get(f"{parts_url}/list/", params=params)
+        assert fast_response.content == response.content
+        assert fast_response.headers.get("X-Next-Cursor") == response.headers.get("X-Next-Cursor")
+        assert fast_response.headers["ETag"] == response.headers["ETag"]
+        response = fast_client.get(
+            f"{parts_url}/list/", params=params, headers={"If-None-Match": response.headers["ETag"]}
+        )
+        assert response.status_code == 304
+
+    client.delete(f"{parts_url}/delete/{part_id}")
+
+
+def test_part_stats_follow_part_writes(
+    client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    stats_url = f"{settings.api_v1_prefix}/parts/stats"
+
+    columns = ["metric", "is_active", "value", "count", "total", "min_value", "max_value"]
+
+    def stored_stats() -> List[Tuple]:
+        stored = db_session.query(*(getattr(ModelPartStat, column) for column in columns))
+        return sorted(tuple(row) for row in stored)
+
+    def recomputed_stats() -> List[Tuple]:
+        rows = utils.part_stat_rows(utils.count_part_stats(db_session))
+        return sorted(tuple(row[column] for column in columns) for row in rows)
+
+    # Reconcile with the parts other tests wrote around the write helpers
+    utils.rebuild_part_stats(db_session)
+    before = client.get(stats_url).json()
+
+    response = client.post(
+        f"{settings.api_v1_prefix}/parts/create/",
+        json={"name": "Anvil", "sku": "SKUSTATS", "description": "heavy", "weight_ounces": 5000},
+    )
+    part_id = response.json()["id"]
+    stats = client.get(stats_url).json()
+    assert (stats["active"], stats["inactive"]) == (before["active"] + 1, before["inactive"])
+    assert stats["weight_ounces"]["max"] == 5000
+    assert stats["weight_histogram"][-1] == {
+        "lower": 256,
+        "upper": None,
+        "count": before["weight_histogram"][-1]["count"] + 1,
+    }
+    assert stats["description_length"]["count"] == before["description_length"]["count"] + 1
+
+    client.patch(f"{settings.api_v1_prefix}/parts/update/{part_id}", json={"is_active": False})
+    stats = client.get(stats_url).json()
+    assert (stats["active"], stats["inactive"]) == (before["active"], before["inactive"] + 1)
+    inactive = client.get(stats_url, params={"is_active": False}).json()
+    assert (inactive["active"], inactive["weight_ounces"]["max"]) == (0, 5000)
+    # The incrementally maintained table matches a full recompute
+    assert stored_stats() == recomputed_stats()
+
+    # Weights share a row per power of two range, which keeps their exact bounds
+    response = client.post(
+        f"{settings.api_v1_prefix}/parts/create/",
+        json={"name": "Anvil", "sku": "SKUSTATS2", "weight_ounces": 4500, "is_active": False},
+    )
+    second_id = response.json()["id"]
+    for weight, max_weight in [(4600, 4600), (4400, 4500)]:
+        client.patch(
+            f"{settings.api_v1_prefix}/parts/update/{part_id}", json={"weight_ounces": weight}
+        )
+        inactive = client.get(stats_url, params={"is_active": False}).json()
+        assert inactive["weight_ounces"]["max"] == max_weight
+    client.delete(f"{settings.api_v1_prefix}/parts/delete/{second_id}")
+    client.patch(f"{settings.api_v1_prefix}/parts/update/{part_id}", json={"weight_ounces": 5000})
+    assert stored_stats() == recomputed_stats()
+
+    etag = client.get(stats_url).headers["ETag"]
+    response = client.get(stats_url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    client.delete(f"{settings.api_v1_prefix}/parts/delete/{part_id}")
+    assert client.get(stats_url).json() == before
+    assert stored_stats() == recomputed_stats()
+
+
+def test_soft_delete_and_purge(
+    client: TestClient, db_session: Session, settings: AppSettings
+) -> None:
+    soft_app = create_application(settings.model_copy(update={"soft_delete": True}))
+    soft_app.dependency_overrides[get_db] = lambda: db_session
+    soft_client = TestClient(soft_app)
+    parts_url = f"{settings.api_v1_prefix}/parts"
+    part = {"name": "Tombstone", "sku": "SOFT1", "description": "ghostly anvil", "weight_ounces": 9}
+    part_id = soft_client.post(f"{parts_url}/create/", json=part).json()["id"]
+    soft_client.get(f"{parts_url}/{part_id}")
+    utils.rebuild_part_stats(db_session)
+    before = soft_client.get(f"{parts_url}/stats").json()
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = soft_client.delete(f"{parts_url}/delete/{part_id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    # One UPDATE flips the flag, only the statistics are written besides
+    part_statements = [
+        statement.split(None, 1)[0]
+        for statement in statements
+        if "part " in statement and "partstat" not in statement
+    ]
+    assert part_statements == ["UPDATE"]
+    assert db_session.get(ModelPart, part_id).is_active is False
+
+    # Every read leaves the deleted part out, also once it is out of the part cache
+    assert soft_client.get(f"{parts_url}/{part_id}").status_code == 404
+    assert soft_client.get(f"{parts_url}/by-sku/SOFT1").status_code == 404
+    assert soft_client.get(f"{parts_url}/search", params={"q": "ghostly"}).json() == []
+    listed = soft_client.get(f"{parts_url}/list/", params={"limit": 100}).json()
+    assert part_id not in [row["id"] for row in listed]
+    listed = soft_client.get(f"{parts_url}/list/", params={"is_active": False, "limit": 100})
+    assert part_id in [row["id"] for row in listed.json()]
+    words_params: List[Dict[str, Any]] = [{}, {"is_active": False}]
+    for params, counted in zip(words_params, [False, True]):
+        words = soft_client.get(
+            f"{parts_url}/most_common_words/", params={"k": 100, "min_length": 7, **params}
+        )
+        assert ("ghostly" in [item["word"] for item in words.json()]) is counted
+    for export_client, exported in [(soft_client, False), (client, True)]:
+        lines = export_client.get(f"{parts_url}/export").text.splitlines()
+        assert (part_id in [json.loads(line)["id"] for line in lines]) is exported
+    response = soft_client.patch(f"{parts_url}/update/{part_id}", json={"weight_ounces": 1})
+    assert response.status_code == 404
+    assert soft_client.delete(f"{parts_url}/delete/{part_id}").status_code == 404
+    stats = soft_client.get(f"{parts_url}/stats").json()
+    assert (stats["active"], stats["inactive"]) == (before["active"] - 1, before["inactive"] + 1)
+    # The hard delete mode still sees it
+    assert client.get(f"{parts_url}/{part_id}").json()["is_active"] is False
+    # Its SKU stays taken until it is purged
+    response = soft_client.post(f"{parts_url}/create/", json=part)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "SKU already exists (possibly soft-deleted)"
+    other_id = soft_client.post(f"{parts_url}/create/", json={**part, "sku": "SOFT2"}).json()["id"]
+    response = soft_client.patch(f"{parts_url}/update/{other_id}", json={"sku": "SOFT1"})
+    assert response.status_code == 409
+    assert soft_client.get(f"{parts_url}/{other_id}").json()["sku"] == "SOFT2"
+    client.delete(f"{parts_url}/delete/{other_id}")
+
+    # Recently deleted parts are kept, older ones are purged with their indexes
+    assert utils.purge_deleted_parts(db_session, utcnow() - timedelta(hours=1)) == 0
+    assert utils.purge_deleted_parts(db_session, utcnow(), batch_size=1) >= 1
+    assert db_session.get(ModelPart, part_id) is None
+    assert db_session.get(ModelWordCount, "ghostly") is None
+    assert client.get(f"{parts_url}/search", params={"q": "ghostly"}).json() == []
+    stats = soft_client.get(f"{parts_url}/stats").json()
+    assert (stats["active"], stats["inactive"]) == (before["active"] - 1, 0)
+    response = soft_client.post(f"{parts_url}/create/", json=part)
+    assert response.status_code == 200
+    client.delete(f"{parts_url}/delete/{response.json()['id']}")
+
+
+def test_part_changes(client: TestClient, db_session: Session, settings: AppSettings) -> None:
+    parts_url = f"{settings.api_v1_prefix}/parts"
+
+    def read_changes(since: str, limit: int = 100) -> dict:
+        response = client.get(f"{parts_url}/changes", params={"since": since, "limit": limit})
+        assert response.status_code == 200
+        return response.json()
+
+    # Catch up with the whole log, page by page
+    page = client.get(f"{parts_url}/changes", params={"limit": 2}).json()
+    while page["has_more"]:
+        page = read_changes(page["next"], limit=2)
+    since = page["next"]
+    assert read_changes(since)["changes"] == []
+
+    part = {"name": "Feed", "sku": "FEED1", "weight_ounces": 3}
+    created_id = client.post(f"{parts_url}/create/", json=part).json()["id"]
+    part = {"name": "Feed", "sku": "FEED2", "weight_ounces": 3}
+    updated_id = client.post(f"{parts_url}/create/", json=part).json()["id"]
+    client.patch(f"{parts_url}/update/{updated_id}", json={"weight_ounces": 4})
+    client.patch(f"{parts_url}/update/{created_id}", json={"weight_ounces": 5})
+    client.delete(f"{parts_url}/delete/{updated_id}")
+
+    # One entry per part, in the order of their last change
+    page = read_changes(since, limit=1)
+    assert page["has_more"] is True
+    [change] = page["changes"]
+    assert (change["id"], change["deleted"]) == (created_id, False)
+    assert change["part"]["weight_ounces"] == 5
+    page = read_changes(page["next"])
+    assert page["has_more"] is False
+    assert [(c["id"], c["deleted"], c["part"]) for c in page["changes"]] == [
+        (updated_id, True, None)
+    ]
+    assert page["changes"][0]["seq"] > change["seq"]
+
+    assert client.get(f"{parts_url}/changes", params={"since": "nope"}).status_code == 400
+    expired = utils.encode_change_token(0, utcnow() - timedelta(seconds=settings.change_retention))
+    assert client.get(f"{parts_url}/changes", params={"since": expired}).status_code == 410
+
+    # Recent deletions are kept, older ones are compacted away
+    assert utils.compact_part_changes(db_session, utcnow() - timedelta(hours=1)) == 0
+    assert utils.compact_part_changes(db_session, utcnow(), batch_size=1) >= 1
+    assert read_changes(since)["changes"][0]["id"] == created_id
+    assert [c["id"] for c in read_changes(since)["changes"]] == [created_id]
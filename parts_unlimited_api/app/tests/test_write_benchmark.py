@@ -0,0 +1,103 @@
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+from app.api import utils
+from app.models.parts import Part as ModelPart
+from app.schemas.parts import PartBase
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+CALLS = 100
+
+
+@contextmanager
+def recorded_statements(db: Session) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement.split(None, 1)[0])
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def orm_create_part(db: Session, part: PartBase) -> ModelPart:
+    # The unit of work path the RETURNING helpers replaced: INSERT, then a refresh
+    db_part = ModelPart(**part.model_dump())
+    db.add(db_part)
+    db.flush()
+    utils.apply_word_count_delta(db, new_descriptions=[db_part.description])  # type: ignore
+    utils.apply_search_index_delta(db, new_rows=[vars(db_part)])
+    utils.apply_part_stats_delta(db, new_rows=[vars(db_part)])
+    utils.record_part_changes(db, [db_part.id])  # type: ignore
+    db.commit()
+    db.refresh(db_part)
+    return db_part
+
+
+def orm_delete_part(db: Session, part_id: int) -> None:
+    # ... and a SELECT to load the part before deleting it
+    db_part = db.query(ModelPart).filter(ModelPart.id == part_id).first()
+    utils.apply_word_count_delta(db, old_descriptions=[db_part.description])  # type: ignore
+    utils.apply_search_index_delta(db, old_rows=[vars(db_part)])
+    utils.apply_part_stats_delta(db, old_rows=[vars(db_part)])
+    utils.record_part_changes(db, [part_id], deleted=True)
+    db.delete(db_part)
+    db.commit()
+
+
+def measure(
+    db: Session, create: Callable[[Session, PartBase], Any], delete: Callable[[Session, int], None]
+) -> Dict[str, Any]:
+    create_times, delete_times = [], []
+    with recorded_statements(db) as statements:
+        for i in range(CALLS):
+            part = PartBase(
+                name="Bench", sku=f"WBENCH{i}", description="bench part", weight_ounces=i
+            )
+            started = time.perf_counter()
+            part_id = create(db, part).id
+            create_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            delete(db, part_id)
+            delete_times.append(time.perf_counter() - started)
+
+    def percentiles(times: List[float]) -> Dict[str, float]:
+        quantiles = statistics.quantiles(times, n=100)
+        return {"p50_us": round(quantiles[49] * 1e6, 1), "p99_us": round(quantiles[98] * 1e6, 1)}
+
+    return {
+        "statements_per_call": len(statements) / (2 * CALLS),
+        "create": percentiles(create_times),
+        "delete": percentiles(delete_times),
+    }
+
+
+def test_write_helpers_use_returning(db_session: Session) -> None:
+    part = PartBase(name="Returning", sku="RET1", description="one statement", weight_ounces=1)
+    with recorded_statements(db_session) as statements:
+        db_part = utils.create_part(db_session, part)
+    assert (db_part.name, db_part.version, db_part.is_active) == ("Returning", 1, True)
+    # The part, word count, search index, statistics and change log inserts, no SELECT to
+    # refresh the part
+    assert statements == ["INSERT"] * 5
+
+    with recorded_statements(db_session) as statements:
+        utils.delete_part(db_session, db_part.id)
+    # The part delete, the word count upsert and cleanup, the search index delete, then
+    # the statistics upsert and cleanup, and the change log insert
+    assert statements == ["DELETE", "INSERT", "DELETE", "INSERT", "INSERT", "DELETE", "INSERT"]
+
+
+def test_write_helpers_micro_benchmark(db_session: Session) -> None:
+    orm = measure(db_session, orm_create_part, orm_delete_part)
+    returning = measure(db_session, utils.create_part, utils.delete_part)
+    logger.info(f"Write helpers per call: unit of work {orm}, RETURNING {returning}.")
+    assert returning["statements_per_call"] < orm["statements_per_call"]
@@ -0,0 +1,113 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from app.api import utils
+from app.core.metrics import AppMetrics
+from app.core.settings.app import AppSettings
+from app.db.events import create_db_engine
+from app.db.write_queue import WriteQueue, WriteQueueFullError
+from app.main import create_application
+from app.models.base import Base
+from app.models.parts import Part as ModelPart
+from app.schemas.parts import PartBase
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+
+def test_group_commit(tmp_path: Path, settings: AppSettings) -> None:
+    settings = settings.model_copy(update={"database_url": f"sqlite:///{tmp_path}/queue.db"})
+    engine = create_db_engine(settings)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    metrics = AppMetrics()
+    parts = [
+        PartBase(name="Queued", sku=f"QUEUED{i}", description="queued part", weight_ounces=i - 1)
+        for i in range(10)
+    ]
+
+    async def write_parts() -> list:
+        write_queue = WriteQueue(engine, batch_size=10, batch_delay=1, metrics=metrics)
+        write_queue.start()
+        try:
+            return await asyncio.gather(
+                *(write_queue.submit(utils.create_part, part=part) for part in parts),
+                return_exceptions=True,
+            )
+        finally:
+            await write_queue.stop()
+
+    results = asyncio.run(write_parts())
+    # A full batch is written at once, in one transaction where the invalid part
+    # only rolls back its own changes
+    assert len(commits) == 1
+    assert isinstance(results[0], ValueError)
+    assert [row.sku for row in results[1:]] == [part.sku for part in parts[1:]]
+    with Session(engine) as db:
+        assert db.scalar(select(func.count()).select_from(ModelPart)) == 9
+        assert utils.get_part_changes(db)[-1].id == results[-1].id
+        assert utils.get_part_stats(db).active == 9
+    assert metrics.registry.get_sample_value("db_write_batch_size_sum") == 10
+    assert metrics.registry.get_sample_value("db_write_queue_wait_seconds_count") == 10
+    engine.dispose()
+
+
+def test_queue_full(settings: AppSettings) -> None:
+    engine = create_db_engine(settings)
+    metrics = AppMetrics()
+
+    async def overflow() -> None:
+        write_queue = WriteQueue(engine, max_depth=1, metrics=metrics)
+        # Without the writer started, the first write stays queued
+        pending = asyncio.ensure_future(write_queue.submit(utils.delete_part, part_id=1))
+        await asyncio.sleep(0)
+        with pytest.raises(WriteQueueFullError):
+            await write_queue.submit(utils.delete_part, part_id=2)
+        pending.cancel()
+
+    asyncio.run(overflow())
+    assert metrics.registry.get_sample_value("db_write_queue_rejected_total") == 1
+    engine.dispose()
+
+
+@pytest.mark.parametrize("async_db", [False, True])
+def test_write_behind_crud_flow(tmp_path: Path, settings: AppSettings, async_db: bool) -> None:
+    settings = settings.model_copy(
+        update={
+            "database_url": f"sqlite:///{tmp_path}/write_behind.db",
+            "async_db": async_db,
+            "write_behind": True,
+        }
+    )
+    engine = create_db_engine(settings)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    engine.dispose()
+    parts_url = f"{settings.api_v1_prefix}/parts"
+
+    with TestClient(create_application(settings)) as client:
+        part = {"name": "Behind", "sku": "BEHIND1", "description": "late", "weight_ounces": 2}
+        response = client.post(f"{parts_url}/create/", json=part)
+        assert response.status_code == 200
+        part_id = response.json()["id"]
+        response = client.post(f"{parts_url}/create/", json={**part, "weight_ounces": -1})
+        assert response.status_code == 400
+
+        # The cached part is dropped once the update is committed
+        assert client.get(f"{parts_url}/{part_id}").json()["weight_ounces"] == 2
+        etag = client.get(f"{parts_url}/{part_id}").headers["ETag"]
+        response = client.patch(
+            f"{parts_url}/update/{part_id}", json={"weight_ounces": 3}, headers={"If-Match": etag}
+        )
+        assert response.status_code == 200
+        assert client.get(f"{parts_url}/{part_id}").json()["weight_ounces"] == 3
+        response = client.patch(
+            f"{parts_url}/update/{part_id}", json={"weight_ounces": 4}, headers={"If-Match": etag}
+        )
+        assert response.status_code == 412
+
+        assert client.delete(f"{parts_url}/delete/{part_id}").status_code == 200
+        assert client.delete(f"{parts_url}/delete/{part_id}").status_code == 404
+        assert client.get(f"{parts_url}/{part_id}").status_code == 404
+        assert "db_write_batch_size_count 6.0" in client.get("/metrics").text
@@ -0,0 +1,57 @@
+"""
+Compare the sync and the async (aiosqlite) database paths under concurrent reads.
+
+Usage:
+    python -m benchmarks.async_vs_sync --rows 100000 --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+from typing import Any, Dict
+
+import httpx
+from benchmarks.common import (
+    benchmark_settings,
+    build_app,
+    run_load,
+    running,
+    seed_catalog,
+)
+
+
+async def bench(database_url: str, rows: int, requests: int, concurrency: int) -> Dict[str, Any]:
+    results = {}
+    for mode, async_db in (("sync", False), ("async", True)):
+        settings = benchmark_settings(database_url, async_db=async_db)
+        prefix = f"{settings.api_v1_prefix}/parts"
+        rng = random.Random(0)
+
+        def make_request(client: httpx.AsyncClient, i: int) -> Any:
+            if i % 10 == 0:
+                return client.get(f"{prefix}/list/", params={"limit": 50})
+            return client.get(f"{prefix}/{rng.randint(1, rows)}")
+
+        async with running(build_app(settings)) as client:
+            results[mode] = await run_load(client, make_request, requests, concurrency)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{tmp_dir}/bench.db"
+        seed_catalog(database_url, args.rows)
+        results = asyncio.run(bench(database_url, args.rows, args.requests, args.concurrency))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Shared helpers for the benchmarks: catalog seeding, app setup and load generation.
+"""
+
+import asyncio
+import logging
+import random
+import resource
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Type
+
+import httpx
+from app.api import utils
+from app.core.settings.app import AppSettings
+from app.core.settings.development import DevAppSettings
+from app.main import create_application
+from app.models.base import Base
+from app.models.parts import Part as ModelPart
+from fastapi import FastAPI
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+WORDS = (
+    "steel aluminum brass nylon rubber bolt nut washer gasket bearing bracket hinge "
+    "spring clamp valve fitting hose seal pin rivet sprocket pulley shaft coupling "
+    "flange bushing spacer heavy duty light corrosion resistant zinc plated threaded "
+    "hex socket metric imperial replacement assembly kit for with and the of"
+).split()
+
+
+def benchmark_settings(
+    database_url: str, settings_class: Type[AppSettings] = DevAppSettings, **overrides: Any
+) -> AppSettings:
+    """
+    Settings for a benchmarked app: no SQL echo and only warnings logged.
+    """
+    overrides = {"debug": False, "logging_level": logging.WARNING, **overrides}
+    return settings_class(database_url=database_url, **overrides)
+
+
+def seed_catalog(database_url: str, rows: int, batch_size: int = 10_000, seed: int = 0) -> None:
+    """
+    Create the schema and fill it with `rows` parts with random realistic descriptions,
+    along with their indexes, statistics and change log.
+    """
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)  # type: ignore
+    session_local = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    with session_local() as session:
+        for start in range(0, rows, batch_size):
+            part_ids = session.scalars(
+                insert(ModelPart).returning(ModelPart.id),
+                [
+                    {
+                        "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+                        "sku": f"SKU{i:08d}",
+                        "description": " ".join(rng.choices(WORDS, k=rng.randint(5, 30))),
+                        "weight_ounces": rng.randint(0, 320),
+                        "is_active": rng.random() < 0.9,
+                    }
+                    for i in range(start, min(start + batch_size, rows))
+                ],
+            )
+            utils.record_part_changes(session, part_ids)
+            session.commit()
+        utils.rebuild_word_counts(session, batch_size=batch_size)
+        utils.rebuild_search_index(session)
+        utils.rebuild_part_stats(session, batch_size=batch_size)
+    engine.dispose()
+
+
+@asynccontextmanager
+async def running(app: FastAPI) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Run the app startup/shutdown handlers around an in-process ASGI client.
+    """
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+    finally:
+        await app.router.shutdown()
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of the process so far, in MiB.
+    """
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Throughput and latency percentiles (in milliseconds) of a run.
+    """
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    make_request: Callable[[httpx.AsyncClient, int], Any],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """
+    Issue `requests` calls with `concurrency` concurrent workers and summarize them.
+
+    `make_request(client, i)` returns the awaitable for the i-th request.
+    """
+    latencies: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def build_app(settings: AppSettings) -> FastAPI:
+    return create_application(settings)
@@ -0,0 +1,85 @@
+"""
+Compare SQLite engine defaults with the production pool and pragma settings.
+
+Runs a concurrent mix of reads and writes, where without WAL the readers wait
+behind every write transaction.
+
+Usage:
+    python -m benchmarks.engine_tuning --rows 100000 --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import tempfile
+from typing import Any, Dict
+
+import httpx
+from app.core.settings.production import ProdAppSettings
+from benchmarks.common import (
+    benchmark_settings,
+    build_app,
+    run_load,
+    running,
+    seed_catalog,
+)
+
+UNTUNED = {
+    "db_pool_class": None,
+    "sqlite_journal_mode": None,
+    "sqlite_synchronous": None,
+    "sqlite_mmap_size": None,
+    "sqlite_cache_size": None,
+    "sqlite_busy_timeout": None,
+    "sqlite_temp_store": None,
+}
+
+
+async def bench(
+    seed_path: str, tmp_dir: str, rows: int, requests: int, concurrency: int, write_ratio: float
+) -> Dict[str, Any]:
+    results = {}
+    for variant, overrides in (("default", UNTUNED), ("production", {})):
+        # Every variant starts from the same catalog, in its own journal mode.
+        database_path = f"{tmp_dir}/{variant}.db"
+        shutil.copyfile(seed_path, database_path)
+        settings = benchmark_settings(
+            f"sqlite:///{database_path}", settings_class=ProdAppSettings, **overrides
+        )
+        prefix = f"{settings.api_v1_prefix}/parts"
+        rng = random.Random(0)
+
+        def make_request(client: httpx.AsyncClient, i: int) -> Any:
+            if rng.random() < write_ratio:
+                return client.post(
+                    f"{prefix}/create/",
+                    json={"name": "Bench", "sku": f"BENCH{i}", "weight_ounces": i % 100},
+                )
+            return client.get(f"{prefix}/{rng.randint(1, rows)}")
+
+        async with running(build_app(settings)) as client:
+            results[variant] = await run_load(client, make_request, requests, concurrency)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seed_path = f"{tmp_dir}/seed.db"
+        seed_catalog(f"sqlite:///{seed_path}", args.rows)
+        results = asyncio.run(
+            bench(seed_path, tmp_dir, args.rows, args.requests, args.concurrency, args.write_ratio)
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure the logging cost per request of the development and production logging modes.
+
+Every request logs one uvicorn access record, timed at the call site as the request
+handler would pay for it. Records are written to `--sink` (default /dev/null), the
+time left to drain an enqueued sink is reported separately.
+
+Usage:
+    python -m benchmarks.logging_cost --requests 20000
+    python -m benchmarks.logging_cost --requests 20000 --sink /tmp/access.log
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple, Type
+
+from app.core.settings.app import AppSettings
+from app.core.settings.development import DevAppSettings
+from app.core.settings.production import ProdAppSettings
+from benchmarks.common import summarize
+from loguru import logger
+
+MODES: Dict[str, Tuple[Type[AppSettings], Dict[str, Any]]] = {
+    "dev": (DevAppSettings, {}),
+    "prod": (ProdAppSettings, {}),
+    "prod_sampled": (ProdAppSettings, {"access_log_sample_rate": 0.1}),
+}
+
+
+def access_record(access_logger: logging.Logger, i: int) -> None:
+    # The same call uvicorn makes once per response
+    access_logger.info(
+        '%s - "%s %s HTTP/%s" %d', "127.0.0.1:50000", "GET", f"/api/v1/parts/{i}", "1.1", 200
+    )
+
+
+def bench(mode: str, requests: int, sink: str) -> Dict[str, Any]:
+    settings_class, overrides = MODES[mode]
+    settings = settings_class(database_url="sqlite://", logging_level=logging.INFO, **overrides)
+    with open(sink, "a") as sink_file:
+        stderr, sys.stderr = sys.stderr, sink_file
+        try:
+            settings.configure_logging()
+        finally:
+            sys.stderr = stderr
+        # As uvicorn sets it up
+        access_logger = logging.getLogger("uvicorn.access")
+        access_logger.setLevel(logging.INFO)
+        access_logger.propagate = False
+
+        latencies: List[float] = []
+        started = time.perf_counter()
+        for i in range(requests):
+            call_started = time.perf_counter()
+            access_record(access_logger, i)
+            latencies.append(time.perf_counter() - call_started)
+        elapsed = time.perf_counter() - started
+        drain_started = time.perf_counter()
+        # Waits for the writer thread of an enqueued sink to write everything
+        logger.remove()
+        drain = time.perf_counter() - drain_started
+
+    result = summarize(latencies, elapsed)
+    return {
+        "per_request_us": round(elapsed / requests * 1e6, 2),
+        "p50_us": round(result["p50_ms"] * 1000, 2),
+        "p99_us": round(result["p99_ms"] * 1000, 2),
+        "drain_ms": round(drain * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--sink", default=os.devnull, help="File the records are written to.")
+    args = parser.parse_args()
+
+    results = {mode: bench(mode, args.requests, args.sink) for mode in MODES}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
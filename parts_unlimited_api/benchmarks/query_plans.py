@@ -0,0 +1,146 @@
+"""
+Check with `EXPLAIN QUERY PLAN` that every parts list filter is served by an index.
+
+The list query of every filter in `PLAN_FILTERS` is explained for every sort order,
+for the first page and for a cursor page. A filtered query whose plan scans the
+parts table or a whole index, instead of searching an index, is reported as a full
+scan and fails the check with status 1. Scanning a partial index in sort order only
+reads the parts matching its filter, which is what the page asks for.
+
+Usage:
+    python -m benchmarks.query_plans --rows 10000
+    python -m benchmarks.query_plans --database catalog.db --verbose
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple, get_args
+
+from app.api import utils
+from app.models.parts import Part as ModelPart
+from app.schemas.parts import PartFilter, PartSort
+from benchmarks.common import WORDS, seed_catalog
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.engine import Connection
+
+# Every filter alone and under an `is_active` filter, as the indexes are laid out.
+# Deleted parts of the soft-delete mode are only indexed by ID and deletion time.
+PLAN_FILTERS: List[Dict[str, Any]] = [
+    {"is_active": True},
+    {"min_weight": 16},
+    {"min_weight": 16, "max_weight": 64},
+    {"is_active": True, "max_weight": 64},
+    {"name_prefix": WORDS[0].title()},
+    {"is_active": False, "name_prefix": WORDS[0].title()},
+    {"sku_prefix": "SKU00001"},
+    {"is_active": True, "sku_prefix": "SKU00001"},
+]
+
+# Indexes over the parts matching their WHERE clause only
+PARTIAL_INDEXES = frozenset(
+    index.name
+    for index in ModelPart.__table__.indexes
+    if index.dialect_options["sqlite"]["where"] is not None
+)
+
+# The columns of `utils.get_part_rows`, which include every sort column
+LIST_SELECT = select(*utils.PART_COLUMNS, ModelPart.version, ModelPart.updated_at)
+
+
+def explain(connection: Connection, stmt: Any) -> List[str]:
+    """
+    The detail lines of the SQLite query plan of `stmt`.
+    """
+    compiled = stmt.compile(connection, compile_kwargs={"literal_binds": True})
+    return [row[3] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+
+def list_query_plans(
+    connection: Connection, filters: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, List[str]]:
+    """
+    The plans of the list queries of `filters`, for every sort order, keyed by the
+    query string of the request.
+    """
+    plans = {}
+    for values in PLAN_FILTERS if filters is None else filters:
+        for sort in get_args(PartSort):
+            part_filter = PartFilter(sort=sort, **values)
+            query = "&".join(f"{name}={value}" for name, value in {**values, "sort": sort}.items())
+            stmt = utils._parts_page(LIST_SELECT, filters=part_filter)
+            plans[query] = explain(connection, stmt)
+            # The cursor page seeks after the last part of the first page
+            last = connection.execute(stmt).fetchall()[-1:]
+            if last:
+                after_key = getattr(last[0], sort.lstrip("-"))
+                stmt = utils._parts_page(
+                    LIST_SELECT,
+                    after_id=last[0].id,
+                    filters=part_filter,
+                    after_key=after_key,
+                )
+                plans[f"{query}&cursor"] = explain(connection, stmt)
+    return plans
+
+
+def full_scans(plans: Dict[str, List[str]]) -> List[str]:
+    """
+    Describe every plan of `list_query_plans` scanning the parts table or one of
+    its full indexes from end to end.
+    """
+    return [
+        f"{query}: {' / '.join(plan)}"
+        for query, plan in plans.items()
+        if any(
+            line.startswith("SCAN part") and line.split()[-1] not in PARTIAL_INDEXES
+            for line in plan
+        )
+    ]
+
+
+def check_query_plans(database_url: str) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    The list query plans of the catalog at `database_url`, and their full scans.
+    """
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            plans = list_query_plans(connection)
+    finally:
+        engine.dispose()
+    return plans, full_scans(plans)
+
+
+def report_full_scans(scans: List[str]) -> None:
+    for scan in scans:
+        print(f"FULL SCAN {scan}", file=sys.stderr)
+    if scans:
+        sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument(
+        "--database", help="SQLite file to check, seeded with --rows parts if it is new."
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print every plan.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.database or os.path.join(tmp_dir, "bench.db")
+        database_url = f"sqlite:///{path}"
+        if not os.path.exists(path):
+            seed_catalog(database_url, args.rows)
+        plans, scans = check_query_plans(database_url)
+    if args.verbose:
+        for query, plan in plans.items():
+            print(f"{query}: {' / '.join(plan)}")
+    report_full_scans(scans)
+    print(f"{len(plans)} list queries, all served by an index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Measure how read throughput scales with the number of `python -m app` worker processes.
+
+For every worker count a real server is started on a seeded SQLite catalog and loaded
+over HTTP with random part reads, from `--clients` client processes so that the load
+generator is not the bottleneck. Throughput should grow about linearly with the worker
+count, up to the number of CPUs.
+
+Usage:
+    python -m benchmarks.scaling --rows 100000 --workers 1 2 4 8 --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from benchmarks.common import seed_catalog, summarize
+
+PREFIX = "/api/v1/parts"
+
+
+def wait_until_ready(base_url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}{PREFIX}/1").raise_for_status()
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start in {timeout}s")
+
+
+def client_load(
+    base_url: str, rows: int, requests: int, concurrency: int, seed: int
+) -> Tuple[List[float], float]:
+    """
+    Read `requests` random parts from one client process, returning the latencies.
+    """
+    rng = random.Random(seed)
+
+    async def load() -> Tuple[List[float], float]:
+        latencies: List[float] = []
+        counter = iter(range(requests))
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+
+            async def worker() -> None:
+                for _ in counter:
+                    started = time.perf_counter()
+                    response = await client.get(f"{PREFIX}/{rng.randint(1, rows)}")
+                    latencies.append(time.perf_counter() - started)
+                    response.raise_for_status()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return latencies, time.perf_counter() - started
+
+    return asyncio.run(load())
+
+
+def bench(
+    database_url: str, workers: int, rows: int, requests: int, clients: int, concurrency: int
+) -> Dict[str, float]:
+    port = 8700 + workers
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "APP_ENV": "prod",
+        "DATABASE_URL": database_url,
+        "LOGGING_LEVEL": "30",
+        # Keep the cache out of the comparison, it is disabled for several workers
+        "PART_CACHE_ENABLED": "false",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app", "--workers", str(workers), "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(base_url)
+        with ProcessPoolExecutor(clients) as executor:
+            runs = list(
+                executor.map(
+                    client_load,
+                    [base_url] * clients,
+                    [rows] * clients,
+                    [requests // clients] * clients,
+                    [concurrency] * clients,
+                    range(clients),
+                )
+            )
+    finally:
+        # Graceful shutdown, as on a deployment
+        server.send_signal(signal.SIGINT)
+        server.wait(timeout=60)
+    latencies = [latency for run_latencies, _ in runs for latency in run_latencies]
+    return summarize(latencies, max(elapsed for _, elapsed in runs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--clients", type=int, default=4, help="Client processes.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Per client process.")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {"cpus": os.cpu_count()}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{tmp_dir}/bench.db"
+        seed_catalog(database_url, args.rows)
+        for workers in args.workers:
+            results[f"workers_{workers}"] = bench(
+                database_url, workers, args.rows, args.requests, args.clients, args.concurrency
+            )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
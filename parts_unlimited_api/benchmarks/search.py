@@ -0,0 +1,91 @@
+"""
+Compare the FTS5 part search with a `LIKE '%term%'` scan of the descriptions.
+
+Usage:
+    python -m benchmarks.search --rows 1000000 --queries 200
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from app.api import utils
+from app.models.parts import Part as ModelPart
+from benchmarks.common import WORDS, seed_catalog, summarize
+from sqlalchemy import and_, create_engine, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+
+def like_search(db: Session, q: str, skip: int = 0, limit: int = 10) -> List[ModelPart]:
+    """
+    The search the FTS index replaces: every word in the name or the description.
+    """
+    stmt = (
+        select(ModelPart)
+        .where(
+            and_(
+                *(
+                    or_(ModelPart.name.like(f"%{word}%"), ModelPart.description.like(f"%{word}%"))
+                    for word in q.split()
+                )
+            )
+        )
+        .order_by(ModelPart.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(db.execute(stmt).scalars())
+
+
+def bench(database_url: str, rows: int, queries: int, limit: int) -> Dict[str, Any]:
+    engine = create_engine(database_url)
+    session_local = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    rng = random.Random(0)
+    # Common words match most of the catalog, so a scan fills a page after a few
+    # rows while BM25 ranks every match. A part number matches one part, which a
+    # scan can only find by reading the whole table.
+    workloads = {
+        "common_words": [" ".join(rng.sample(WORDS, rng.randint(1, 2))) for _ in range(queries)],
+        "part_number": [str(rng.randrange(rows)) for _ in range(queries)],
+    }
+
+    methods: Dict[str, Callable[..., List[ModelPart]]] = {
+        "like": like_search,
+        "fts5": utils.search_parts,
+    }
+    results: Dict[str, Any] = {}
+    with session_local() as session:
+        for workload, terms in workloads.items():
+            for method, search in methods.items():
+                latencies = []
+                started = time.perf_counter()
+                for term in terms:
+                    query_started = time.perf_counter()
+                    search(session, term, limit=limit)
+                    latencies.append(time.perf_counter() - query_started)
+                results.setdefault(workload, {})[method] = summarize(
+                    latencies, time.perf_counter() - started
+                )
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{tmp_dir}/bench.db"
+        seed_catalog(database_url, args.rows)
+        results = bench(database_url, args.rows, args.queries, args.limit)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
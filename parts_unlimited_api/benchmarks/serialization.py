@@ -0,0 +1,64 @@
+"""
+Compare the default and the `fast_serialization` list path on large pages.
+
+Usage:
+    python -m benchmarks.serialization --rows 100000 --requests 2000 --limit 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+from typing import Any, Dict
+
+import httpx
+from benchmarks.common import (
+    benchmark_settings,
+    build_app,
+    run_load,
+    running,
+    seed_catalog,
+)
+
+
+async def bench(
+    database_url: str, rows: int, requests: int, concurrency: int, limit: int
+) -> Dict[str, Any]:
+    results = {}
+    for mode, fast_serialization in (("default", False), ("fast", True)):
+        settings = benchmark_settings(
+            database_url, fast_serialization=fast_serialization, max_page_size=limit
+        )
+        prefix = f"{settings.api_v1_prefix}/parts"
+        rng = random.Random(0)
+
+        def make_request(client: httpx.AsyncClient, i: int) -> Any:
+            return client.get(
+                f"{prefix}/list/", params={"limit": limit, "skip": rng.randint(0, rows - limit)}
+            )
+
+        async with running(build_app(settings)) as client:
+            results[mode] = await run_load(client, make_request, requests, concurrency)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{tmp_dir}/bench.db"
+        seed_catalog(database_url, args.rows)
+        results = asyncio.run(
+            bench(database_url, args.rows, args.requests, args.concurrency, args.limit)
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
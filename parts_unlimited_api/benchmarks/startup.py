@@ -0,0 +1,126 @@
+"""
+Measure the cold start of the app: import time, app construction and first request.
+
+Every run is a fresh interpreter. The import time is the cumulative time of `app.main`
+reported by `python -X importtime`, the other phases are timed in the process.
+
+Usage:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --setting async_db=true
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import seed_catalog
+
+# Run in the fresh interpreter, after `app.main` was imported
+STARTUP_SCRIPT = """
+import asyncio, json, sys, time
+import httpx
+from app.main import create_application
+from benchmarks.common import benchmark_settings
+
+async def main():
+    started = time.perf_counter()
+    app = create_application(benchmark_settings(sys.argv[1], **json.loads(sys.argv[2])))
+    created = time.perf_counter()
+    await app.router.startup()
+    started_up = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get(app.state.settings.api_v1_prefix + "/parts/1")).raise_for_status()
+        first_request = time.perf_counter()
+        (await client.get("/openapi.json")).raise_for_status()
+        openapi = time.perf_counter()
+    await app.router.shutdown()
+    print(json.dumps({
+        "create_ms": (created - started) * 1000,
+        "startup_ms": (started_up - created) * 1000,
+        "first_request_ms": (first_request - started_up) * 1000,
+        "openapi_ms": (openapi - first_request) * 1000,
+    }))
+
+asyncio.run(main())
+"""
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int]]:
+    """
+    (module, cumulative microseconds) of every import in `-X importtime` output.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split(":", 1)[1].split("|")
+        imports.append((module.strip(), int(cumulative)))
+    return imports
+
+
+def run_once(database_url: str, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            STARTUP_SCRIPT,
+            database_url,
+            json.dumps(overrides),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = parse_importtime(process.stderr)
+    phases = json.loads(process.stdout.strip().splitlines()[-1])
+    app_imports = sorted(
+        (item for item in imports if item[0].startswith("app.")), key=lambda item: -item[1]
+    )
+    return {
+        "import_ms": dict(imports)["app.main"] / 1000,
+        **phases,
+        "slowest_app_imports": [f"{module} {us / 1000:.1f}ms" for module, us in app_imports[:5]],
+    }
+
+
+def measure_startup(database_url: str, runs: int = 5, **overrides: Any) -> Dict[str, Any]:
+    """
+    Median of every cold start phase over `runs` fresh interpreters, in milliseconds.
+    """
+    results = [run_once(database_url, overrides) for _ in range(runs)]
+    summary: Dict[str, Any] = {
+        metric: round(statistics.median(result[metric] for result in results), 1)
+        for metric in ("import_ms", "create_ms", "startup_ms", "first_request_ms", "openapi_ms")
+    }
+    summary["cold_start_ms"] = round(
+        summary["import_ms"] + summary["create_ms"] + summary["startup_ms"], 1
+    )
+    summary["slowest_app_imports"] = results[-1]["slowest_app_imports"]
+    return summary
+
+
+def main() -> None:
+    from benchmarks.suite import parse_setting
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--setting", type=parse_setting, action="append", default=[])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        seed_catalog(database_url, 100)
+        results = measure_startup(database_url, args.runs, **dict(args.setting))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+Load test every parts endpoint in-process and compare the results with a baseline.
+
+`run` seeds a catalog (or reuses `--database`), drives each scenario through the
+ASGI app and writes throughput, p50/p95/p99 latency and peak RSS as JSON, along with
+the cold start import and startup latency of `benchmarks.startup`. `compare` exits
+with status 1 when a metric is worse than the baseline by more than the threshold,
+`run` also when a parts list filter is not served by an index, see
+`benchmarks.query_plans`.
+
+Usage:
+    python -m benchmarks.suite run --rows 100000 --output results.json
+    python -m benchmarks.suite run --rows 100000 --baseline baseline.json
+    python -m benchmarks.suite run --rows 5000000 --database catalog.db --setting async_db=true
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+from app.api import utils
+from benchmarks.common import (
+    WORDS,
+    benchmark_settings,
+    build_app,
+    peak_rss_mb,
+    run_load,
+    running,
+    seed_catalog,
+)
+from benchmarks.query_plans import check_query_plans, report_full_scans
+from benchmarks.startup import measure_startup
+from sqlalchemy import create_engine, inspect
+
+MakeRequest = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+# Metrics compared against the baseline, and whether higher values are better
+METRICS = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+    "import_ms": False,
+    "cold_start_ms": False,
+    "first_request_ms": False,
+}
+
+BULK_SIZE = 100
+
+
+class Scenario(NamedTuple):
+    name: str
+    # Builds the request maker from the run state, see `scenarios`
+    build: Callable[["RunState"], MakeRequest]
+    # Fraction of `--requests` issued, for the endpoints that are expensive per call
+    scale: float = 1.0
+    # Earlier scenario writing the parts this one updates or deletes, one by one
+    after: Optional[str] = None
+
+
+class RunState:
+    def __init__(self, prefix: str, rows: int, seed: int = 0) -> None:
+        self.prefix = prefix
+        self.rows = rows
+        self.rng = random.Random(seed)
+        self.created: List[int] = []
+        self.bulk_created: List[int] = []
+        self.change_token: Optional[str] = None
+
+    def part_id(self) -> int:
+        return self.rng.randint(1, self.rows)
+
+    def sku(self) -> str:
+        return f"SKU{self.rng.randrange(self.rows):08d}"
+
+    def new_part(self, sku: str) -> Dict[str, Any]:
+        return {
+            "name": f"Bench {sku}",
+            "sku": sku,
+            "description": " ".join(self.rng.choices(WORDS, k=12)),
+            "weight_ounces": self.rng.randint(0, 320),
+        }
+
+
+def created_part(state: RunState, i: int) -> int:
+    return state.created[i % len(state.created)]
+
+
+async def create(state: RunState, client: httpx.AsyncClient, i: int) -> httpx.Response:
+    response = await client.post(f"{state.prefix}/create/", json=state.new_part(f"BENCH{i}"))
+    state.created.append(response.json()["id"])
+    return response
+
+
+def update(state: RunState, client: httpx.AsyncClient, part_id: int) -> Awaitable[httpx.Response]:
+    # The SKU is derived from the ID, so that it stays unique
+    return client.put(f"{state.prefix}/update/{part_id}", json=state.new_part(f"UPDATED{part_id}"))
+
+
+async def bulk_create(state: RunState, client: httpx.AsyncClient, i: int) -> httpx.Response:
+    parts = [state.new_part(f"BULK{i}-{j}") for j in range(BULK_SIZE)]
+    response = await client.post(f"{state.prefix}/bulk/", json=parts)
+    state.bulk_created.extend(result["id"] for result in response.json())
+    return response
+
+
+async def read_changes(state: RunState, client: httpx.AsyncClient, i: int) -> httpx.Response:
+    # Follow the change feed a page at a time as a syncing replica would, from the
+    # start again once caught up
+    params: Dict[str, Any] = {"limit": 100}
+    if state.change_token is not None:
+        params["since"] = state.change_token
+    response = await client.get(f"{state.prefix}/changes", params=params)
+    page = response.json()
+    state.change_token = page["next"] if page["has_more"] else None
+    return response
+
+
+def bulk_chunk(state: RunState, i: int) -> List[int]:
+    return state.bulk_created[i * BULK_SIZE : (i + 1) * BULK_SIZE]  # noqa: E203
+
+
+def scenarios() -> List[Scenario]:
+    return [
+        Scenario("read_part", lambda s: lambda c, i: c.get(f"{s.prefix}/{s.part_id()}")),
+        Scenario(
+            "list_offset",
+            lambda s: lambda c, i: c.get(
+                f"{s.prefix}/list/", params={"skip": s.part_id() - 1, "limit": 100}
+            ),
+        ),
+        Scenario(
+            "list_cursor",
+            lambda s: lambda c, i: c.get(
+                f"{s.prefix}/list/",
+                params={"cursor": utils.encode_cursor(s.part_id() - 1), "limit": 100},
+            ),
+        ),
+        Scenario(
+            "list_filtered",
+            lambda s: lambda c, i: c.get(
+                f"{s.prefix}/list/",
+                params={
+                    "is_active": True,
+                    "min_weight": s.rng.randrange(320),
+                    "sort": "-weight_ounces",
+                    "limit": 100,
+                },
+            ),
+        ),
+        Scenario("read_by_sku", lambda s: lambda c, i: c.get(f"{s.prefix}/by-sku/{s.sku()}")),
+        Scenario(
+            "read_by_sku_batch",
+            lambda s: lambda c, i: c.post(f"{s.prefix}/by-sku", json=[s.sku() for _ in range(50)]),
+        ),
+        Scenario(
+            "search",
+            lambda s: lambda c, i: c.get(
+                f"{s.prefix}/search", params={"q": " ".join(s.rng.sample(WORDS, 2))}
+            ),
+        ),
+        Scenario(
+            "most_common_words",
+            lambda s: lambda c, i: c.get(f"{s.prefix}/most_common_words/", params={"k": 10}),
+        ),
+        Scenario(
+            "most_common_words_filtered",
+            lambda s: lambda c, i: c.get(
+                f"{s.prefix}/most_common_words/",
+                params={"k": 10, "is_active": True, "sku_prefix": f"SKU{s.rng.randrange(100):02d}"},
+            ),
+            scale=0.05,
+        ),
+        Scenario("stats", lambda s: lambda c, i: c.get(f"{s.prefix}/stats")),
+        Scenario("changes", lambda s: lambda c, i: read_changes(s, c, i)),
+        Scenario("export_ndjson", lambda s: lambda c, i: c.get(f"{s.prefix}/export"), scale=0.005),
+        Scenario(
+            "export_csv",
+            lambda s: lambda c, i: c.get(f"{s.prefix}/export", params={"format": "csv"}),
+            scale=0.005,
+        ),
+        Scenario("create", lambda s: lambda c, i: create(s, c, i), scale=0.5),
+        Scenario(
+            "update",
+            lambda s: lambda c, i: update(s, c, created_part(s, i)),
+            scale=0.5,
+            after="create",
+        ),
+        Scenario(
+            "patch",
+            lambda s: lambda c, i: c.patch(
+                f"{s.prefix}/update/{created_part(s, i)}", json={"weight_ounces": i % 320}
+            ),
+            scale=0.5,
+            after="create",
+        ),
+        Scenario(
+            "delete",
+            lambda s: lambda c, i: c.delete(f"{s.prefix}/delete/{created_part(s, i)}"),
+            scale=0.5,
+            after="create",
+        ),
+        Scenario("bulk_create", lambda s: lambda c, i: bulk_create(s, c, i), scale=0.02),
+        Scenario(
+            "bulk_update",
+            lambda s: lambda c, i: c.put(
+                f"{s.prefix}/bulk/",
+                json=[
+                    {**s.new_part(f"UPDATED{part_id}"), "id": part_id}
+                    for part_id in bulk_chunk(s, i)
+                ],
+            ),
+            scale=0.02,
+            after="bulk_create",
+        ),
+        Scenario(
+            "bulk_delete",
+            lambda s: lambda c, i: c.request("DELETE", f"{s.prefix}/bulk/", json=bulk_chunk(s, i)),
+            scale=0.02,
+            after="bulk_create",
+        ),
+    ]
+
+
+async def run_scenarios(
+    database_url: str,
+    rows: int,
+    requests: int,
+    concurrency: int,
+    only: Optional[List[str]] = None,
+    **overrides: Any,
+) -> Dict[str, Dict[str, float]]:
+    settings = benchmark_settings(database_url, **overrides)
+    state = RunState(f"{settings.api_v1_prefix}/parts", rows)
+    results = {}
+    selected = {scenario.name for scenario in scenarios()}
+    if only:
+        selected = set(only) | {s.after for s in scenarios() if s.name in only and s.after}
+    async with running(build_app(settings)) as client:
+        for scenario in scenarios():
+            if scenario.name not in selected:
+                continue
+            count = max(1, int(requests * scenario.scale))
+            make_request = scenario.build(state)
+            results[scenario.name] = {
+                **await run_load(client, make_request, count, 1 if scenario.after else concurrency),
+                "peak_rss_mb": peak_rss_mb(),
+            }
+    return results
+
+
+def is_seeded(database_url: str) -> bool:
+    engine = create_engine(database_url)
+    try:
+        return inspect(engine).has_table("part")
+    finally:
+        engine.dispose()
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Describe every metric of `current` worse than in `baseline` by more than
+    `threshold`, a fraction of the baseline value.
+    """
+    regressions = []
+    for name, metrics in current["scenarios"].items():
+        base_metrics = baseline["scenarios"].get(name)
+        if base_metrics is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            base, value = base_metrics.get(metric), metrics.get(metric)
+            if not base or value is None:
+                continue
+            change = (value - base) / base
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{name}.{metric}: {base} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def report_regressions(baseline_path: str, current: Dict[str, Any], threshold: float) -> None:
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare(baseline, current, threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+def parse_setting(value: str) -> Tuple[str, Any]:
+    """
+    Parse a `name=value` settings override, the value as JSON when it is valid JSON.
+    """
+    name, _, raw = value.partition("=")
+    try:
+        return name, json.loads(raw)
+    except ValueError:
+        return name, raw
+
+
+def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite:///{args.database or os.path.join(tmp_dir, 'bench.db')}"
+        if not is_seeded(database_url):
+            seed_catalog(database_url, args.rows)
+        results: Dict[str, Any] = {
+            "meta": {
+                "rows": args.rows,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "settings": dict(args.setting),
+            },
+            "scenarios": asyncio.run(
+                run_scenarios(
+                    database_url,
+                    args.rows,
+                    args.requests,
+                    args.concurrency,
+                    args.only,
+                    **dict(args.setting),
+                )
+            ),
+        }
+        if not args.only or "startup" in args.only:
+            results["scenarios"]["startup"] = measure_startup(
+                database_url, args.startup_runs, **dict(args.setting)
+            )
+        _, scans = check_query_plans(database_url)
+        results["full_scans"] = scans
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output)
+    print(output)
+    report_full_scans(scans)
+    if args.baseline:
+        report_regressions(args.baseline, results, args.threshold)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the scenarios and report the metrics.")
+    run_parser.add_argument("--rows", type=int, default=10_000)
+    run_parser.add_argument("--requests", type=int, default=1_000)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument(
+        "--database", help="SQLite file to reuse, seeded with --rows parts if it is new."
+    )
+    run_parser.add_argument(
+        "--only", nargs="+", choices=[s.name for s in scenarios()] + ["startup"]
+    )
+    run_parser.add_argument(
+        "--startup-runs", type=int, default=3, help="Fresh interpreters timed for startup."
+    )
+    run_parser.add_argument(
+        "--setting",
+        type=parse_setting,
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="App setting override, e.g. --setting async_db=true.",
+    )
+    run_parser.add_argument("--output", help="Also write the JSON results to this file.")
+    run_parser.add_argument("--baseline", help="Fail if a metric regressed against this file.")
+    run_parser.add_argument("--threshold", type=float, default=0.2)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two results files.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args)
+    else:
+        with open(args.current) as current_file:
+            report_regressions(args.baseline, json.load(current_file), args.threshold)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()